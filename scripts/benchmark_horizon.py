@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Projection Horizon Benchmark
+Times the enhanced model's projection, linked statements and DCF valuation
+for growing monthly horizons, showing cost per month stays flat up to
+25-year holds
+"""
+
+import argparse
+import time
+
+from hostel_financial_model_enhanced import EnhancedHostelFinancialModel
+
+
+def project_and_value(model, months):
+    """Every scenario's projection, base-case statements and DCF at one horizon"""
+    model.set_horizon(months)
+    projections = model.generate_scenario_projections()
+    statements = model.build_financial_statements(projections['base'])
+    valuation = model.valuation()
+    return projections, statements, valuation
+
+
+def measure(model, months, runs):
+    """Best-of-`runs` wall time in seconds for one hostel at `months`"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = project_and_value(model, months)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--months', type=int, nargs='+', default=[36, 60, 120, 300, 600])
+    parser.add_argument('--runs', type=int, default=5, help='repeats per horizon (best time kept)')
+    args = parser.parse_args()
+
+    model = EnhancedHostelFinancialModel(hostel_name="Hostel Diary")
+    print(f"{'Months':>8} {'Time (ms)':>10} {'us/month':>10} {'Base EV':>14} {'Terminal share':>15}")
+    for months in args.months:
+        elapsed, (_, _, valuation) = measure(model, months, args.runs)
+        base = valuation.iloc[list(model.scenarios).index('base')]
+        print(f"{months:>8} {elapsed * 1e3:>10.1f} {elapsed / months * 1e6:>10.1f} "
+              f"{base['Enterprise_Value']:>14,.0f} {base['Terminal_Share']:>15.1%}")
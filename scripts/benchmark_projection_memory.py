@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Projection Memory Benchmark
+Compares peak memory and build time of the previous list-of-dicts projection
+path against the column-oriented ProjectionFrame for a scenario sweep
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import pandas as pd
+
+from hostel_financial_model import HostelFinancialModel
+
+
+def legacy_projections(model, years):
+    """Previous implementation: one dict per month, then DataFrame conversion"""
+    projections = []
+    for year_offset in range(years):
+        current_year = model.start_date.year + year_offset
+        for month in range(1, 13):
+            revenue = model.calculate_monthly_revenue(month, current_year)
+            revenue *= (1 + model.assumptions['growth_rate']) ** year_offset
+            expenses = model.calculate_monthly_expenses(month, current_year, year_offset)
+            projections.append({
+                'Year': current_year,
+                'Month': month,
+                'Month_Name': pd.Period(f'{current_year}-{month}').strftime('%B'),
+                'Revenue': revenue,
+                'Expenses': expenses,
+                'Net_Income': revenue - expenses,
+                'Occupancy_Rate': model.get_occupancy_rate(month)
+            })
+    return projections, pd.DataFrame(projections)
+
+
+def measure(label, build, runs):
+    """Run `build` `runs` times keeping every result, report peak memory and time"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = [build() for _ in range(runs)]
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} retained {current / 1e6:8.2f} MB  peak {peak / 1e6:8.2f} MB  {elapsed:7.2f} s")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=200, help='projections kept alive in the sweep')
+    parser.add_argument('--years', type=int, default=5, help='projection horizon in years')
+    args = parser.parse_args()
+
+    model = HostelFinancialModel(hostel_name="Hostel Diary")
+    print(f"Sweep of {args.runs} projections x {args.years * 12} months")
+    measure('list of dicts + DataFrame', lambda: legacy_projections(model, args.years), args.runs)
+    measure('ProjectionFrame', lambda: model.generate_projection_frame(args.years), args.runs)
+    measure('ProjectionFrame + DataFrame', lambda: model.generate_projections(args.years), args.runs)
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Hostel Booking Data Ingestion
+Streams nightly PMS / channel-manager CSV exports in typed chunks, aggregates
+them to per-day, per-room-type bed-nights and revenue, and caches the result
+as a compact NumPy store for fitting occupancy and seasonality assumptions
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from hostel_kpi_engine import summarize_kpis
+
+
+# Export column names, override per PMS with column_map
+DEFAULT_COLUMNS = {
+    'stay_date': 'stay_date',
+    'room_type': 'room_type',
+    'bed_nights': 'bed_nights',
+    'room_revenue': 'room_revenue',
+    'available_beds': None
+}
+
+DEFAULT_CHUNKSIZE = 1_000_000
+
+
+def _read_columns(column_map):
+    """Merge a PMS-specific column map over the defaults"""
+    columns = dict(DEFAULT_COLUMNS)
+    columns.update(column_map or {})
+    return columns
+
+
+def aggregate_export(path, column_map=None, chunksize=DEFAULT_CHUNKSIZE, date_format='%Y-%m-%d'):
+    """Aggregate one export file to (day, room_type) sums, chunk by chunk
+
+    Each row is a stay night; when the export has no bed-night column every
+    row counts as one sold bed-night.
+    """
+    columns = _read_columns(column_map)
+    wanted = {key: name for key, name in columns.items() if name}
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [name for name in wanted.values() if name in header]
+    dtypes = {
+        columns['room_type']: 'category',
+        columns['room_revenue']: 'float64'
+    }
+    for key in ('bed_nights', 'available_beds'):
+        if columns[key] in usecols:
+            dtypes[columns[key]] = 'float32'
+
+    partials = []
+    reader = pd.read_csv(path, usecols=usecols, dtype=dtypes, chunksize=chunksize)
+    for chunk in reader:
+        days = pd.to_datetime(chunk[columns['stay_date']], format=date_format).to_numpy().astype('datetime64[D]')
+        frame = pd.DataFrame({
+            'day': days,
+            'room_type': chunk[columns['room_type']],
+            'sold': chunk[columns['bed_nights']] if columns['bed_nights'] in chunk else np.float32(1),
+            'revenue': chunk[columns['room_revenue']]
+        })
+        aggregations = {'sold': 'sum', 'revenue': 'sum'}
+        if columns['available_beds'] in chunk:
+            frame['available'] = chunk[columns['available_beds']]
+            aggregations['available'] = 'max'
+        partials.append(frame.groupby(['day', 'room_type'], observed=True, sort=False).agg(aggregations))
+
+    return pd.concat(partials) if partials else pd.DataFrame(columns=['sold', 'revenue'])
+
+
+def build_daily_store(aggregates, room_types=None, room_type_map=None):
+    """Combine per-file aggregates into dense (day, room_type) arrays
+
+    Capacity comes from an available-beds column when the export has one,
+    otherwise from the model's `room_types` bed counts. Every export room
+    type (after `room_type_map`) must be one of `room_types`; model room
+    types absent from the export are omitted from the store.
+    """
+    combined = pd.concat(aggregates).reset_index()
+    combined['room_type'] = combined['room_type'].astype(str)
+
+    # Chunks and files repeat a day's capacity, so partials take the max per
+    # export room type; mapped room types then add their beds together
+    has_available = 'available' in combined
+    aggregations = {'sold': 'sum', 'revenue': 'sum'}
+    if has_available:
+        combined = combined.groupby(['day', 'room_type'], sort=False).agg(
+            {**aggregations, 'available': 'max'}).reset_index()
+        aggregations['available'] = 'sum'
+    if room_type_map:
+        combined['room_type'] = combined['room_type'].replace(room_type_map)
+    combined = combined.groupby(['day', 'room_type'], sort=False).agg(aggregations).reset_index()
+
+    present = set(combined['room_type'])
+    if room_types:
+        unmatched = sorted(present.difference(room_types))
+        if unmatched:
+            raise ValueError(f"Export room types {unmatched} match no model room type; "
+                             "map them with room_type_map")
+        # Room types the export never mentions are left out, not read as unsold
+        names = [name for name in room_types if name in present]
+    else:
+        names = sorted(present)
+    first_day = combined['day'].min().to_datetime64().astype('datetime64[D]')
+    last_day = combined['day'].max().to_datetime64().astype('datetime64[D]')
+    dates = np.arange(first_day, last_day + 1)
+
+    # Scatter the sparse aggregates into dense arrays
+    day_index = (combined['day'].to_numpy().astype('datetime64[D]') - first_day).astype(int)
+    type_index = pd.Categorical(combined['room_type'], categories=names).codes
+    shape = (len(dates), len(names))
+    sold = np.zeros(shape)
+    revenue = np.zeros(shape)
+    sold[day_index, type_index] = combined['sold'].to_numpy()
+    revenue[day_index, type_index] = combined['revenue'].to_numpy()
+
+    if has_available:
+        available = np.zeros(shape)
+        available[day_index, type_index] = combined['available'].to_numpy()
+    elif room_types:
+        beds = np.array([room_types[name]['beds'] for name in names], dtype=float)
+        available = np.broadcast_to(beds, shape).copy()
+    else:
+        raise ValueError("Export has no available-beds column; pass room_types for capacity")
+
+    return {
+        'dates': dates,
+        'room_types': np.array(names),
+        'available_bed_nights': available,
+        'sold_bed_nights': sold,
+        'room_revenue': revenue
+    }
+
+
+def _source_signature(paths, column_map, room_type_map, room_types=None):
+    """Fingerprint of the source files, mappings and bed counts used to build a store"""
+    return json.dumps({
+        'files': [[os.path.abspath(path), os.path.getsize(path), os.path.getmtime(path)] for path in sorted(paths)],
+        'column_map': column_map or {},
+        'room_type_map': room_type_map or {},
+        'room_types': {name: details['beds'] for name, details in room_types.items()} if room_types else {}
+    }, sort_keys=True)
+
+
+def save_store(store, cache_path, signature=''):
+    """Write a daily store to a compressed .npz cache"""
+    os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    np.savez_compressed(cache_path, signature=np.array(signature), **store)
+
+
+def load_store(cache_path, signature=None):
+    """Load a cached daily store, or None if missing or built from other sources"""
+    if not os.path.exists(cache_path):
+        return None
+    with np.load(cache_path, allow_pickle=False) as cached:
+        if signature is not None and str(cached['signature']) != signature:
+            return None
+        return {key: cached[key] for key in cached.files if key != 'signature'}
+
+
+def ingest_exports(paths, cache_path=None, room_types=None, column_map=None,
+                   room_type_map=None, chunksize=DEFAULT_CHUNKSIZE, workers=None, refresh=False):
+    """Ingest PMS exports into a daily store, reusing the cache when sources are unchanged"""
+    signature = _source_signature(paths, column_map, room_type_map, room_types)
+    if cache_path and not refresh:
+        store = load_store(cache_path, signature)
+        if store is not None:
+            return store
+
+    # Files aggregate independently, so they fan out across processes
+    if workers == 1 or len(paths) == 1:
+        aggregates = [aggregate_export(path, column_map, chunksize) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            aggregates = list(executor.map(
+                aggregate_export, paths, [column_map] * len(paths), [chunksize] * len(paths)
+            ))
+
+    store = build_daily_store(aggregates, room_types, room_type_map)
+    if cache_path:
+        save_store(store, cache_path, signature)
+    return store
+
+
+def parse_room_type_map(values):
+    """Room type map from a JSON file or `label=key` pairs (as given on the command line)"""
+    if not values:
+        return None
+    if len(values) == 1 and os.path.isfile(values[0]):
+        with open(values[0]) as handle:
+            return json.load(handle)
+    mapping = {}
+    for value in values:
+        label, separator, key = value.partition('=')
+        if not separator or not label or not key:
+            raise ValueError(f"Room type mapping {value!r} is not label=key or a JSON file")
+        mapping[label] = key
+    return mapping
+
+
+def monthly_summary(store):
+    """Occupancy, ADR and RevPAB per calendar month and room type"""
+    months = store['dates'].astype('datetime64[M]')
+    labels, starts = np.unique(months, return_index=True)
+
+    # Month totals for every room type in one reduction per measure
+    monthly = {
+        name: np.add.reduceat(store[name], starts, axis=0)
+        for name in ('available_bed_nights', 'sold_bed_nights', 'room_revenue')
+    }
+    kpis = summarize_kpis({name: values[:, :, None, None] for name, values in monthly.items()})
+
+    room_types = store['room_types']
+    return pd.DataFrame({
+        'Month': np.repeat(labels.astype(str), len(room_types)),
+        'Room_Type': np.tile(room_types.astype(str), len(labels)),
+        'Occupancy': kpis['Occupancy'].ravel(),
+        'ADR': kpis['ADR'].ravel(),
+        'RevPAB': kpis['RevPAB'].ravel()
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Ingest PMS booking exports into a cached daily store')
+    parser.add_argument('exports', nargs='+', help='nightly CSV export files')
+    parser.add_argument('--cache', default='data/cache/bookings.npz', help='cache file to write')
+    parser.add_argument('--column-map', help='JSON mapping of stay_date/room_type/bed_nights/room_revenue/available_beds to export columns')
+    parser.add_argument('--room-type-map', nargs='+', metavar='LABEL=KEY',
+                        help='JSON file or label=key pairs mapping export room types to model room types')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--refresh', action='store_true', help='ignore an up-to-date cache')
+    args = parser.parse_args()
+
+    from hostel_financial_model import HostelFinancialModel
+
+    store = ingest_exports(
+        args.exports,
+        cache_path=args.cache,
+        room_types=HostelFinancialModel().room_types,
+        column_map=json.loads(args.column_map) if args.column_map else None,
+        room_type_map=parse_room_type_map(args.room_type_map),
+        chunksize=args.chunksize,
+        workers=args.workers,
+        refresh=args.refresh
+    )
+    print(f"Ingested {len(store['dates'])} days x {len(store['room_types'])} room types into {args.cache}")
+    print(monthly_summary(store).to_string(index=False))
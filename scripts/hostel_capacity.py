@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Hostel Capacity Planning
+Time-varying (month, room_type) bed capacity from a plan of bed additions,
+conversions and renovations, with the linked capex, depreciation and ramp-up
+of new beds, plus a batch search over expansion timings ranked by NPV
+"""
+
+import argparse
+import itertools
+import json
+
+import numpy as np
+
+from hostel_three_statement import straight_line_depreciation
+
+
+# New or reopened beds sell at half the base occupancy in their first month
+DEFAULT_RAMP_FLOOR = 0.5
+
+
+def _capacity_steps(events, room_types):
+    """Expand plan events into step changes of beds
+
+    A renovation (`offline_months` > 0) is a removal followed by the same
+    beds coming back, which ramp up like new beds.
+    """
+    steps = []
+    for index, event in enumerate(events):
+        room = room_types.index(event['room_type'])
+        ramp = (event.get('ramp_months', 0), event.get('ramp_floor', DEFAULT_RAMP_FLOOR))
+        steps.append((index, 0, room, event['beds'], ramp))
+        if event.get('offline_months', 0):
+            steps.append((index, event['offline_months'], room, -event['beds'], ramp))
+    return steps
+
+
+def build_capacity_schedule(base_beds, room_types, events, months, timings=None, depreciation_months=120):
+    """Build (..., month, room_type) capacity arrays from a capacity plan
+
+    Each event is a dict with `month` (horizon offset), `room_type`, signed
+    `beds`, and optionally `capex`, `offline_months`, `ramp_months` and
+    `ramp_floor`. A dorm-to-private conversion is two events in the same
+    month sharing a `group`. `timings` is an optional (..., event) array of start months that
+    replaces the events' own months, so many sequencings are built at once.
+
+    `ramp_factor` scales occupancy: added beds sell at `ramp_floor` of the
+    base occupancy in their first month, rising linearly to full occupancy
+    after `ramp_months`. Removed beds leave at once.
+    """
+    room_types = list(room_types)
+    base_beds = np.asarray(base_beds, dtype=float)
+    if timings is None:
+        timings = np.array([event['month'] for event in events], dtype=int)
+    timings = np.asarray(timings, dtype=int)
+
+    steps = _capacity_steps(events, room_types)
+    month = np.arange(months)
+    if steps:
+        event_index, offset, room, delta, ramp = (list(values) for values in zip(*steps))
+        ramp_months, ramp_floor = (np.array(values, dtype=float) for values in zip(*ramp))
+        delta = np.array(delta, dtype=float)
+
+        # (..., month, step) elapsed months since each step took effect
+        elapsed = month[:, None] - (timings[..., event_index] + np.array(offset))[..., None, :]
+        active = elapsed >= 0
+        progress = np.divide(elapsed + 0.0, ramp_months, out=np.ones(elapsed.shape), where=ramp_months > 0)
+        ramp_weight = np.where(delta > 0, ramp_floor + (1 - ramp_floor) * np.clip(progress, 0, 1), 1.0)
+
+        placement = np.zeros((len(steps), len(room_types)))
+        placement[np.arange(len(steps)), room] = delta
+        beds = base_beds + active @ placement
+        effective_beds = base_beds + (active * ramp_weight) @ placement
+    else:
+        beds = np.broadcast_to(base_beds, timings.shape[:-1] + (months, len(room_types))).astype(float)
+        effective_beds = beds
+
+    # Capex lands in each event's start month
+    capex_amounts = np.array([event.get('capex', 0.0) for event in events], dtype=float)
+    starts = timings[..., None, :] == month[:, None]
+    capex = starts @ capex_amounts if len(events) else np.zeros(timings.shape[:-1] + (months,))
+
+    beds = np.maximum(beds, 0)
+    effective_beds = np.clip(effective_beds, 0, beds)
+    return {
+        'beds': beds,
+        'effective_beds': effective_beds,
+        'ramp_factor': np.divide(effective_beds, beds, out=np.zeros(beds.shape), where=beds > 0),
+        'capex': capex,
+        'depreciation': straight_line_depreciation(capex, depreciation_months)
+    }
+
+
+def npv(cash_flows, annual_rate, axis=-1):
+    """Net present value of monthly cash flows discounted at an annual rate
+
+    The first month is discounted by one month; leading axes are kept.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    periods = np.arange(1, cash_flows.shape[axis] + 1)
+    discount = (1 + annual_rate) ** (-periods / 12)
+    return np.moveaxis(cash_flows, axis, -1) @ discount
+
+
+def timing_groups(events):
+    """Names of the independently timed groups and each event's group index
+
+    Events sharing a `group` (e.g. both halves of a conversion) always
+    start together.
+    """
+    names = [event.get('group', event.get('name', f'event_{number}')) for number, event in enumerate(events, 1)]
+    groups = list(dict.fromkeys(names))
+    return groups, np.array([groups.index(name) for name in names], dtype=int)
+
+
+def timing_grid(events, candidate_months, ordered=False):
+    """(combination, group) array of every start-month combination
+
+    `candidate_months` is one sequence of months for all timing groups or
+    one sequence per group; `ordered` keeps only sequencings where groups
+    start in plan order. Index the result with timing_groups' event indexes
+    to get per-event timings.
+    """
+    groups, _ = timing_groups(events)
+    if np.ndim(candidate_months[0]) == 0:
+        candidate_months = [candidate_months] * len(groups)
+    grid = np.array(list(itertools.product(*candidate_months)), dtype=int).reshape(-1, len(groups))
+    if ordered and len(groups) > 1:
+        grid = grid[np.all(np.diff(grid, axis=-1) >= 0, axis=-1)]
+    return grid
+
+
+if __name__ == "__main__":
+    from hostel_financial_model_enhanced import EnhancedHostelFinancialModel
+
+    parser = argparse.ArgumentParser(description='Rank capacity plan timings by NPV')
+    parser.add_argument('plan', help='JSON list of capacity events (month, room_type, beds, capex, ...)')
+    parser.add_argument('--scenario', default='base')
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--every', type=int, default=3, help='candidate start months step')
+    parser.add_argument('--discount-rate', type=float, default=0.10)
+    parser.add_argument('--ordered', action='store_true', help='keep groups in plan order')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--output', help='CSV file for every ranked timing')
+    args = parser.parse_args()
+
+    with open(args.plan) as handle:
+        plan = json.load(handle)
+    model = EnhancedHostelFinancialModel(hostel_name="Hostel Diary")
+    model.set_capacity_plan(plan)
+    results = model.search_capacity_timings(range(0, args.years * 12, args.every), scenario=args.scenario,
+                                            years=args.years, discount_rate=args.discount_rate,
+                                            ordered=args.ordered)
+    print(f"Evaluated {len(results):,} timings")
+    print(results.head(args.top).to_string(index=False))
+    if args.output:
+        results.to_csv(args.output, index=False)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Hostel Cell Values
+Native numeric cells with a small fixed set of shared number formats, and a
+streaming reader that loads the tables of any generated workbook back into
+typed NumPy arrays
+"""
+
+import argparse
+from datetime import date, datetime
+
+import numpy as np
+from openpyxl import load_workbook
+
+
+# The only number formats the generators write; currency kinds are in USD
+# and swap their symbol for other currencies
+NUMBER_FORMATS = {
+    'currency': '"$"#,##0',
+    'currency_cents': '"$"#,##0.00',
+    'currency_signed': '"$"#,##0;[Red]-"$"#,##0',
+    'percent': '0%',
+    'percent_1': '0.0%',
+    'count': '#,##0',
+    'years': '0.0 "years"',
+    'month': 'mmmm yyyy',
+    'date': 'mmmm d, yyyy'
+}
+
+CURRENCY_SYMBOLS = {'USD': '$', 'EUR': '€', 'GBP': '£', 'THB': '฿', 'ZAR': 'R'}
+
+
+def currency_symbol(currency='USD'):
+    """Display symbol for an ISO currency code (the code itself when unknown)"""
+    return CURRENCY_SYMBOLS.get(currency, f'{currency} ')
+
+
+def number_format(kind, currency='USD'):
+    """Excel number format for a format kind, in `currency` for currency kinds"""
+    return NUMBER_FORMATS[kind].replace('"$"', f'"{currency_symbol(currency)}"')
+
+
+def write_value(cell, value, kind, currency='USD'):
+    """Write a raw number or date to a cell with one of the shared formats"""
+    cell.value = value.item() if hasattr(value, 'item') else value
+    cell.number_format = number_format(kind, currency)
+    return cell
+
+
+def apply_formats(ws, formats, column, first_row, across=False, currency='USD'):
+    """Apply a list of format kinds (None to skip) down a column, or along a row
+
+    For cells already written as native values, e.g. by DataFrame.to_excel.
+    """
+    for offset, kind in enumerate(formats):
+        if kind is None:
+            continue
+        cell = ws.cell(row=first_row, column=column + offset) if across else ws.cell(row=first_row + offset, column=column)
+        cell.number_format = number_format(kind, currency)
+
+
+def display_value(value, kind, currency='USD'):
+    """Text for a value as its number format kind shows it, for HTML/PDF reports"""
+    if kind is None or isinstance(value, str):
+        return str(value)
+    value = float(value)
+    if kind.startswith('currency'):
+        text = f"{currency_symbol(currency)}{abs(value):,.{2 if kind == 'currency_cents' else 0}f}"
+        return f"-{text}" if round(value, 2 if kind == 'currency_cents' else 0) < 0 else text
+    if kind.startswith('percent'):
+        return f"{value:.{1 if kind == 'percent_1' else 0}%}"
+    if kind == 'years':
+        return f"{value:.1f} years"
+    return f"{value:,.0f}"
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _typed_column(values):
+    """float64 for numeric columns, datetime64 for dates, otherwise object"""
+    present = [value for value in values if value is not None]
+    if present and all(_is_number(value) for value in present):
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    if present and all(isinstance(value, (date, datetime)) for value in present):
+        return np.array([np.datetime64('NaT') if value is None else np.datetime64(value, 's') for value in values],
+                        dtype='datetime64[s]')
+    return np.array(values, dtype=object)
+
+
+def _label_headers(width):
+    return ['Label'] + ['Value' if index == 1 else f'Value_{index}' for index in range(1, width)]
+
+
+def _finish_table(tables, name, headers, rows):
+    columns = {}
+    for index, header in enumerate(headers):
+        if header is None:
+            continue
+        values = [row[index] if index < len(row) else None for row in rows]
+        if any(value is not None for value in values):
+            columns[str(header)] = _typed_column(values)
+    if columns:
+        key, suffix = name, 2
+        while key in tables:
+            key, suffix = f'{name} ({suffix})', suffix + 1
+        tables[key] = columns
+
+
+def read_sheet_tables(rows, sheet_name):
+    """Split a sheet's rows into named tables of typed column arrays
+
+    A table is a row of text headers followed by rows holding numbers, or a
+    run of label/value rows (numeric or text values) under a one-cell
+    section title; it ends at the first blank row. Tables are named after
+    their section title, or the sheet when untitled.
+    """
+    tables = {}
+    title, headers, pending, table_rows = None, None, None, []
+    for row in rows:
+        row = list(row)
+        while row and row[-1] is None:
+            row.pop()
+        filled = [value for value in row if value is not None]
+
+        if not filled:
+            if headers is not None:
+                _finish_table(tables, title or sheet_name, headers, table_rows)
+                headers, table_rows, title = None, [], None
+            pending = None
+            continue
+
+        if headers is not None:
+            table_rows.append(row)
+            continue
+
+        has_number = any(_is_number(value) or isinstance(value, (date, datetime)) for value in filled)
+        if pending is not None and has_number:
+            headers, table_rows = pending, [row]
+        elif has_number and isinstance(row[0], str):
+            # Label/value rows without a header row
+            headers = _label_headers(len(row))
+            table_rows = [row]
+        elif len(filled) == 1 and isinstance(filled[0], str):
+            title, pending = filled[0], None
+        elif all(isinstance(value, str) for value in filled):
+            if pending is not None and isinstance(pending[0], str) and isinstance(row[0], str):
+                # A second text row means these are text label/value rows, not a header
+                headers = _label_headers(max(len(pending), len(row)))
+                table_rows = [pending, row]
+            else:
+                pending = row
+        pending = None if headers is not None else pending
+
+    if headers is not None:
+        _finish_table(tables, title or sheet_name, headers, table_rows)
+    return tables
+
+
+def read_workbook_arrays(path, sheets=None):
+    """Load every table of a generated workbook as {sheet: {table: {column: array}}}
+
+    The workbook is streamed read-only with cached values, so formula cells
+    read back as the values Excel last calculated.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        return {
+            ws.title: read_sheet_tables(ws.iter_rows(values_only=True), ws.title)
+            for ws in workbook.worksheets
+            if sheets is None or ws.title in sheets
+        }
+    finally:
+        workbook.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='List the typed tables of a generated workbook')
+    parser.add_argument('workbook')
+    parser.add_argument('--sheet', action='append', help='only read these sheets')
+    args = parser.parse_args()
+
+    for sheet, tables in read_workbook_arrays(args.workbook, args.sheet).items():
+        for name, columns in tables.items():
+            length = len(next(iter(columns.values())))
+            print(f"{sheet} / {name}: {length} rows")
+            for column, values in columns.items():
+                print(f"    {column}: {values.dtype}")
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Hostel Chart Templates
+Each chart type is defined once as a template and bound directly to the
+cell ranges the engine's series already occupy, so workbooks never rebuild
+chart styling or copy data cell by cell to feed a chart. The same templates
+render static PNG/SVG images through matplotlib in a background worker for
+PDF and HTML reports.
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+from openpyxl.chart import BarChart, LineChart, PieChart, Reference
+from openpyxl.styles import Font
+
+from hostel_cell_values import number_format
+
+
+# Every chart the generators draw; `kind` picks the chart class
+CHART_TEMPLATES = {
+    'line': {'kind': 'line', 'width': 15, 'height': 10, 'x_title': 'Month'},
+    'trend': {'kind': 'line', 'width': 20, 'height': 12, 'x_title': 'Month'},
+    'column': {'kind': 'bar', 'width': 15, 'height': 10, 'grouping': 'clustered'},
+    'stacked_column': {'kind': 'bar', 'width': 15, 'height': 10, 'grouping': 'stacked', 'overlap': 100},
+    'pie': {'kind': 'pie', 'width': 15, 'height': 10}
+}
+
+CHART_CLASSES = {'line': LineChart, 'bar': BarChart, 'pie': PieChart}
+
+STATIC_FORMATS = ('png', 'svg')
+
+
+class SeriesBlock(NamedTuple):
+    """A category column and its value columns on one sheet
+
+    `header_row` holds the series names; data runs for `length` rows below it.
+    """
+    worksheet: object
+    header_row: int
+    length: int
+    category_col: int
+    value_cols: tuple
+
+    def values(self, col):
+        """Reference to one value column including its header"""
+        return Reference(self.worksheet, min_col=col, min_row=self.header_row,
+                         max_row=self.header_row + self.length)
+
+    def categories(self):
+        """Reference to the category labels below the header"""
+        return Reference(self.worksheet, min_col=self.category_col, min_row=self.header_row + 1,
+                         max_row=self.header_row + self.length)
+
+
+def table_block(ws, headers, top, length, category, values, left=1):
+    """Bind to a table already on `ws` whose header row is `top`
+
+    `headers` is the table's header order, so no cells are read or written.
+    """
+    headers = list(headers)
+    return SeriesBlock(ws, top, length, left + headers.index(category),
+                       tuple(left + headers.index(name) for name in values))
+
+
+def sheet_block(ws, header_row, length, category, values):
+    """Bind to a table on `ws` by looking its header names up in `header_row`"""
+    headers = [cell.value for cell in ws[header_row]]
+    return table_block(ws, headers, header_row, min(length, ws.max_row - header_row), category, values)
+
+
+def write_series_block(ws, top, left, categories, series, kind='currency', currency='USD', category_header='Month'):
+    """Write (category, series) columns from arrays and bind them as a block
+
+    `series` maps each series name to its values; `kind` is one shared
+    number format kind or a {name: kind} mapping (None for no format).
+    """
+    ws.cell(row=top, column=left, value=category_header).font = Font(bold=True)
+    for row, label in enumerate(np.asarray(categories).tolist(), top + 1):
+        ws.cell(row=row, column=left, value=label)
+
+    for col, (name, values) in enumerate(series.items(), left + 1):
+        ws.cell(row=top, column=col, value=name).font = Font(bold=True)
+        series_kind = kind.get(name, 'currency') if isinstance(kind, dict) else kind
+        cell_format = number_format(series_kind, currency) if series_kind else None
+        for row, value in enumerate(np.asarray(values, dtype=float).tolist(), top + 1):
+            cell = ws.cell(row=row, column=col, value=value)
+            if cell_format:
+                cell.number_format = cell_format
+
+    return SeriesBlock(ws, top, len(categories), left, tuple(range(left + 1, left + 1 + len(series))))
+
+
+def build_chart(template, block, title, y_title=None, x_title=None):
+    """Chart of `template` with one series per value column of `block`"""
+    spec = CHART_TEMPLATES[template]
+    chart = CHART_CLASSES[spec['kind']]()
+    chart.title = title
+    chart.width = spec['width']
+    chart.height = spec['height']
+    if spec['kind'] == 'bar':
+        chart.type = 'col'
+        chart.grouping = spec['grouping']
+        if 'overlap' in spec:
+            chart.overlap = spec['overlap']
+    if spec['kind'] != 'pie':
+        chart.y_axis.title = y_title
+        chart.x_axis.title = x_title or spec.get('x_title')
+
+    for col in block.value_cols:
+        chart.add_data(block.values(col), titles_from_data=True)
+    chart.set_categories(block.categories())
+    return chart
+
+
+def add_chart(ws, template, block, anchor, title, y_title=None, x_title=None):
+    """Build a chart from a template and anchor it on `ws`"""
+    chart = build_chart(template, block, title, y_title, x_title)
+    ws.add_chart(chart, anchor)
+    return chart
+
+
+def static_figure(template, categories, series, title, y_title=None, x_title=None, figure=None):
+    """Draw a template on a matplotlib figure (a new one sized like the worksheet chart)
+
+    Uses the figure API rather than pyplot, so it is safe in worker
+    processes and never opens a window.
+    """
+    from matplotlib.figure import Figure
+
+    spec = CHART_TEMPLATES[template]
+    # Worksheet chart sizes are in centimetres
+    figure = figure or Figure(figsize=(spec['width'] / 2.54, spec['height'] / 2.54))
+    ax = figure.add_subplot()
+    labels = [str(label) for label in categories]
+    positions = np.arange(len(labels))
+    values = {name: np.asarray(data, dtype=float) for name, data in series.items()}
+
+    if spec['kind'] == 'pie':
+        ax.pie(next(iter(values.values())), labels=labels, autopct='%1.0f%%')
+        ax.set_aspect('equal')
+    else:
+        if spec['kind'] == 'line':
+            for name, data in values.items():
+                ax.plot(positions, data, label=name)
+        elif spec['grouping'] == 'stacked':
+            bottom = np.zeros(len(labels))
+            for name, data in values.items():
+                ax.bar(positions, data, bottom=bottom, label=name)
+                bottom += data
+        else:
+            width = 0.8 / len(values)
+            for index, (name, data) in enumerate(values.items()):
+                ax.bar(positions + (index - (len(values) - 1) / 2) * width, data, width, label=name)
+        step = max(len(labels) // 12, 1)
+        ax.set_xticks(positions[::step], labels[::step], rotation=45, ha='right')
+        ax.set_xlabel(x_title or spec.get('x_title') or '')
+        ax.set_ylabel(y_title or '')
+        ax.legend()
+    ax.set_title(title)
+    figure.tight_layout()
+    return figure
+
+
+def render_static(template, categories, series, path, title, y_title=None, x_title=None):
+    """Draw a template as a static image file; the format comes from the extension"""
+    image_format = os.path.splitext(path)[1].lstrip('.').lower()
+    if image_format not in STATIC_FORMATS:
+        raise ValueError(f"Unsupported image format {image_format!r}; expected one of {STATIC_FORMATS}")
+    static_figure(template, categories, series, title, y_title, x_title).savefig(path, format=image_format)
+    return path
+
+
+class StaticChartWorker:
+    """Background process pool rendering static charts while workbooks are written
+
+    `submit` returns a future per image; use as a context manager (or call
+    `close`) to wait for every pending image.
+    """
+
+    def __init__(self, workers=1):
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+
+    def submit(self, template, categories, series, path, title, y_title=None, x_title=None):
+        return self.executor.submit(render_static, template, list(categories),
+                                    {name: np.asarray(values, dtype=float) for name, values in series.items()},
+                                    path, title, y_title, x_title)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def model_chart_jobs(model, years=None):
+    """Static chart jobs (template, categories, series, filename stem, title, y_title) for a model"""
+    projections = model.generate_scenario_projections(years)
+    base = projections['base']
+    currency = model.reporting_currency
+    months = base['Month_Name'].astype(str).tolist()
+
+    breakdown = model.calculate_channel_breakdown('base', months=slice(0, 12))
+    gross = breakdown.pivot(index='Room_Type', columns='Channel', values='Gross_Revenue')
+    gross = gross.reindex(index=list(model.room_types), columns=list(model.base_assumptions['channels']))
+    room_types = [room_type.replace('_', ' ').title() for room_type in gross.index]
+
+    return [
+        ('line', months, {model.scenarios[key]['name']: df['Revenue'].to_numpy() for key, df in projections.items()},
+         'scenario_revenue', 'Monthly Revenue by Scenario', f'Revenue ({currency})'),
+        ('trend', months, {'Revenue': base['Revenue'].to_numpy(), 'Expenses': base['Expenses'].to_numpy(),
+                           'Net Income': base['Net_Income'].to_numpy()},
+         'base_trend', 'Revenue & Expense Trends (Base Case)', f'Amount ({currency})'),
+        ('stacked_column', room_types, {channel.upper() if len(channel) <= 3 else channel.title(): gross[channel].to_numpy()
+                                        for channel in gross.columns},
+         'channel_revenue', 'Room Revenue by Channel - Year 1', f'Revenue ({currency})'),
+        ('pie', room_types, {'Room Revenue': gross.sum(axis=1).to_numpy()},
+         'room_revenue_mix', 'Room Revenue by Room Type - Year 1', None)
+    ]
+
+
+def render_model_charts(model, output_dir, image_format='png', years=None, workers=1):
+    """Render a model's static charts into `output_dir` in the background; returns the paths"""
+    os.makedirs(output_dir, exist_ok=True)
+    with StaticChartWorker(workers) as worker:
+        futures = [
+            worker.submit(template, categories, series, os.path.join(output_dir, f'{stem}.{image_format}'),
+                          title, y_title)
+            for template, categories, series, stem, title, y_title in model_chart_jobs(model, years)
+        ]
+    return [future.result() for future in futures]
+
+
+if __name__ == "__main__":
+    from hostel_financial_model_enhanced import EnhancedHostelFinancialModel
+
+    parser = argparse.ArgumentParser(description="Render a hostel model's charts as static images")
+    parser.add_argument('--output-dir', default='charts')
+    parser.add_argument('--format', default='png', choices=STATIC_FORMATS)
+    parser.add_argument('--years', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    model = EnhancedHostelFinancialModel(hostel_name="Hostel Diary")
+    for path in render_model_charts(model, args.output_dir, args.format, args.years, args.workers):
+        print(f"Wrote {path}")
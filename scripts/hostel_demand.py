@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Hostel Demand Simulation
+Booking requests with stay lengths and lead times are simulated against the
+bed inventory of each room type, so occupancy, ADR, turnaways and the
+booking curve come out of capacity-constrained demand rather than a single
+seasonal percentage. Requests are processed in booking order one event
+batch at a time, vectorized across replications.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+
+# Average stay 2.8 nights, booked 21 days ahead on average; weekly stays are
+# discounted and last-minute bookings pay a premium
+DEFAULT_DEMAND = {
+    'mean_length_of_stay': 2.8,
+    'max_length_of_stay': 14,
+    'mean_lead_time': 21,
+    'max_lead_time': 180,
+    'demand_factor': 1.0,
+    'long_stay_nights': 7,
+    'long_stay_discount': 0.15,
+    'last_minute_days': 3,
+    'last_minute_premium': 0.10
+}
+
+
+def length_of_stay_pmf(mean, max_nights):
+    """(night,) probabilities of stays of 1..max_nights nights
+
+    Stays are one night plus a geometric number of extra nights, truncated
+    at `max_nights`.
+    """
+    extra = np.arange(max_nights)
+    pmf = (1 / mean) * (1 - 1 / mean) ** extra
+    return pmf / pmf.sum()
+
+
+def lead_time_pmf(mean, max_days):
+    """(day,) probabilities of booking 0..max_days days before arrival (geometric)"""
+    days = np.arange(max_days + 1)
+    pmf = (1 / (mean + 1)) * (mean / (mean + 1)) ** days
+    return pmf / pmf.sum()
+
+
+def arrival_rates(target_occupancy, beds, mean_stay, demand_factor=1.0):
+    """(day, room_type) expected booking requests per arrival day
+
+    Requests arrive so that unconstrained demand fills `target_occupancy`
+    of the beds (times `demand_factor`) at the mean stay length.
+    """
+    return demand_factor * np.asarray(target_occupancy, dtype=float) * np.asarray(beds, dtype=float) / mean_stay
+
+
+def _truncated_geometric(ratio, limit, size, rng):
+    """Draws in 0..limit-1 with probability proportional to ratio ** k (closed-form inverse CDF)"""
+    uniform = rng.random(size)
+    draws = np.floor(np.log1p(-uniform * (1 - ratio ** limit)) / np.log(ratio)).astype(np.int32)
+    return np.minimum(draws, limit - 1)
+
+
+def draw_requests(rates, replications, rng, demand=DEFAULT_DEMAND, warm_up=0):
+    """Booking requests of every replication, sorted into booking order
+
+    Returns (replication, event) arrays of room type, arrival day (offset by
+    `warm_up`), nights, lead time and a validity mask padding replications
+    with fewer requests. The last `warm_up` days of `rates` stand in for the
+    days before the horizon so guests are already in house on day one.
+    """
+    rates = np.concatenate([rates[len(rates) - warm_up:], rates]) if warm_up else rates
+    counts = rng.poisson(rates, size=(replications,) + rates.shape)
+    replication, day, room_type = np.unravel_index(
+        np.repeat(np.arange(counts.size), counts.ravel()), counts.shape
+    )
+    total = len(replication)
+    # Same truncated geometric distributions as length_of_stay_pmf and lead_time_pmf
+    nights = _truncated_geometric(1 - 1 / demand['mean_length_of_stay'], demand['max_length_of_stay'], total, rng) + 1
+    lead = _truncated_geometric(demand['mean_lead_time'] / (demand['mean_lead_time'] + 1),
+                                demand['max_lead_time'] + 1, total, rng)
+
+    # Requests are grouped by replication already; order each group by
+    # booking day, breaking ties at random (32-bit keys take a radix sort)
+    span = rates.shape[0] + demand['max_lead_time']
+    key_type = np.int32 if replications * span * 1024 < 2 ** 31 else np.int64
+    booked = (day - lead + demand['max_lead_time']).astype(key_type)
+    order = np.argsort((replication.astype(key_type) * span + booked) * 1024
+                       + rng.integers(0, 1024, total, dtype=key_type), kind='stable')
+
+    per_replication = np.bincount(replication, minlength=replications)
+    padded = np.arange(per_replication.max(initial=0)) < per_replication[:, None]
+    events = {'valid': padded}
+    for name, values in [('room_type', room_type), ('arrival', day), ('nights', nights), ('lead', lead)]:
+        events[name] = np.zeros(padded.shape, dtype=np.int32)
+        events[name][padded] = values[order]
+    return events
+
+
+def price_factors(nights, lead, demand=DEFAULT_DEMAND):
+    """Multiplier on the nightly rate for each booking's stay length and lead time"""
+    factor = np.where(nights >= demand['long_stay_nights'], 1 - demand['long_stay_discount'], 1.0)
+    return factor * np.where(lead <= demand['last_minute_days'], 1 + demand['last_minute_premium'], 1.0)
+
+
+def _stay_cells(first_cells, nights):
+    """Flat inventory cell of every night of each stay"""
+    offsets = np.arange(nights.sum()) - np.repeat(np.cumsum(nights) - nights, nights)
+    return np.repeat(first_cells, nights) + offsets
+
+
+def simulate_bookings(target_occupancy, beds, nightly_rates, replications, rng, demand=DEFAULT_DEMAND):
+    """Capacity-constrained bookings for (day, room_type) demand over many replications
+
+    Requests are accepted first come, first served when every night of the
+    stay has a free bed of the room type; the rest are turned away. Each
+    booking event is one vectorized step across all replications; nights
+    outside a stay point at an always-empty sentinel cell.
+
+    Returns (replication, day, room_type) sold bed-nights and room revenue,
+    (replication, room_type) requests and turnaways, and (replication,
+    lead day) accepted bed-nights by booking lead time.
+    """
+    target_occupancy = np.asarray(target_occupancy, dtype=float)
+    beds = np.asarray(beds, dtype=float)
+    days, room_types = target_occupancy.shape
+    max_stay = demand['max_length_of_stay']
+    warm_up = min(max_stay, days)
+
+    stay_mean = length_of_stay_pmf(demand['mean_length_of_stay'], max_stay) @ np.arange(1, max_stay + 1)
+    rates = arrival_rates(target_occupancy, beds, stay_mean, demand['demand_factor'])
+    events = draw_requests(rates, replications, rng, demand, warm_up)
+
+    # Flat (replication, room_type, night) inventory with room for stays past
+    # the horizon, plus the sentinel cell at the end
+    span = warm_up + days + max_stay
+    sentinel = replications * room_types * span
+    held = np.zeros(sentinel + 1, dtype=np.int32)
+    first_cells = ((np.arange(replications)[:, None] * room_types + events['room_type']) * span
+                   + events['arrival']).astype(np.int64)
+    capacity = np.where(events['valid'], beds[events['room_type']], -1)
+    stay_offsets = np.arange(max_stay)
+    accepted = np.zeros(events['valid'].shape, dtype=bool)
+
+    for event in range(events['valid'].shape[1]):
+        cells = np.where(stay_offsets < events['nights'][:, event, None],
+                         first_cells[:, event, None] + stay_offsets, sentinel)
+        fits = held[cells].max(axis=1) < capacity[:, event]
+        held[cells[fits]] += 1
+        held[sentinel] = 0
+        accepted[:, event] = fits
+
+    # Discounts and premiums adjust the revenue of the nights they apply to
+    factors = price_factors(events['nights'], events['lead'], demand)
+    priced = accepted & (factors != 1.0)
+    adjustment = np.bincount(_stay_cells(first_cells[priced], events['nights'][priced]),
+                             weights=np.repeat(factors[priced] - 1.0, events['nights'][priced]), minlength=sentinel)
+
+    horizon = slice(warm_up, warm_up + days)
+    held = held[:sentinel].reshape(replications, room_types, span)
+    value = held + adjustment.reshape(replications, room_types, span)
+    sold_bed_nights = held[..., horizon].transpose(0, 2, 1)
+    room_revenue = value[..., horizon].transpose(0, 2, 1) * nightly_rates
+
+    # Requests and turnaways for arrivals inside the horizon
+    in_horizon = events['valid'] & (events['arrival'] >= warm_up)
+    by_room_type = np.arange(replications)[:, None] * room_types + events['room_type']
+    requests = np.bincount(by_room_type[in_horizon], minlength=replications * room_types)
+    turned_away = np.bincount(by_room_type[in_horizon & ~accepted], minlength=replications * room_types)
+
+    lead_days = demand['max_lead_time'] + 1
+    by_lead = np.arange(replications)[:, None] * lead_days + events['lead']
+    lead_time_bed_nights = np.bincount(by_lead[in_horizon & accepted], weights=events['nights'][in_horizon & accepted],
+                                       minlength=replications * lead_days)
+
+    return {
+        'sold_bed_nights': sold_bed_nights.astype(float),
+        'room_revenue': room_revenue,
+        'requests': requests.reshape(replications, room_types),
+        'turned_away': turned_away.reshape(replications, room_types),
+        'lead_time_bed_nights': lead_time_bed_nights.reshape(replications, lead_days)
+    }
+
+
+def booking_curve(lead_time_bed_nights):
+    """(..., lead day) share of final bed-nights already on the books that many days before arrival"""
+    booked_by = np.cumsum(lead_time_bed_nights[..., ::-1], axis=-1)[..., ::-1]
+    total = booked_by[..., :1]
+    return np.divide(booked_by, total, out=np.zeros_like(booked_by, dtype=float), where=total > 0)
+
+
+def monthly_totals(daily, days_in_month):
+    """Sum (..., day, room_type) values into (..., month, room_type)"""
+    boundaries = np.concatenate([[0], np.cumsum(days_in_month)[:-1]])
+    return np.add.reduceat(daily, boundaries, axis=-2)
+
+
+if __name__ == "__main__":
+    from hostel_financial_model_enhanced import EnhancedHostelFinancialModel
+
+    parser = argparse.ArgumentParser(description='Simulate capacity-constrained bookings for the hostel')
+    parser.add_argument('--replications', type=int, default=1000)
+    parser.add_argument('--months', type=int, default=12)
+    parser.add_argument('--scenario', default='base', choices=['best', 'base', 'worst'])
+    parser.add_argument('--bed-scale', type=float, default=1.0, help='scale every room type\'s beds')
+    args = parser.parse_args()
+
+    model = EnhancedHostelFinancialModel(hostel_name="Hostel Diary")
+    model.room_types = {name: {**details, 'beds': int(round(details['beds'] * args.bed_scale))}
+                        for name, details in model.room_types.items()}
+    model.total_beds = sum(details['beds'] for details in model.room_types.values())
+
+    start = time.perf_counter()
+    result = model.simulate_demand(args.replications, args.scenario, args.months)
+    elapsed = time.perf_counter() - start
+
+    print(f"{model.total_beds} beds x {result['days']} days x {args.replications} replications in {elapsed:.2f} s")
+    print(result['monthly'].to_string(index=False, float_format=lambda value: f'{value:,.3f}'))
+    curve = result['booking_curve']
+    print('On the books before arrival: ' + ', '.join(f'{days}d {curve[days]:.0%}' for days in (60, 30, 21, 14, 7, 3, 0)))
@@ -14,12 +14,21 @@ from openpyxl.utils import get_column_letter
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from hostel_kpi_engine import (DEFAULT_COST_DRIVERS, month_calendar, room_type_arrays,
+                               build_bed_night_arrays, build_cost_arrays)
+from hostel_period_index import PeriodIndex
+from hostel_projection_frame import ProjectionFrame
+from hostel_seasonality import monthly_occupancy, profile_for_room_types
+from hostel_run_context import RunContext, finalize_run
+from hostel_cell_values import apply_formats
+
 class HostelFinancialModel:
     """Main class for hostel financial modeling and analysis"""
     
-    def __init__(self, hostel_name="Hostel Diary", start_date=None):
+    def __init__(self, hostel_name="Hostel Diary", start_date=None, context=None):
         self.hostel_name = hostel_name
-        self.start_date = start_date or datetime.now()
+        self.context = context or RunContext.from_environment()
+        self.start_date = start_date or self.context.as_of_datetime
         
         # Model parameters
         self.total_beds = 50  # Default, can be updated
@@ -42,18 +51,26 @@ class HostelFinancialModel:
                 5: 'high', 6: 'high', 7: 'high', 8: 'high',
                 9: 'mid', 10: 'mid', 11: 'low', 12: 'low'
             },
-            'operating_expenses': {
-                'staff_salaries': 8000,  # Monthly
-                'utilities': 1200,
-                'maintenance': 800,
-                'supplies': 1500,
-                'marketing': 1000,
-                'insurance': 600,
-                'other': 900
-            },
+            # Per occupied bed-night, step-fixed staffing and monthly overheads
+            'cost_drivers': {group: dict(drivers) for group, drivers in DEFAULT_COST_DRIVERS.items()},
             'growth_rate': 0.03,  # Annual growth
             'inflation_rate': 0.025  # Annual inflation
         }
+        
+        # Fitted seasonality profile; None uses the season table above
+        self.seasonality_profile = None
+    
+    def set_seasonality_profile(self, profile):
+        """Use a fitted seasonality profile (hostel_seasonality) for occupancy"""
+        self.seasonality_profile = profile_for_room_types(profile, self.room_types)
+    
+    def occupancy_array(self, start_date, months):
+        """Occupancy per month and room type for a projection horizon"""
+        if self.seasonality_profile is not None:
+            return monthly_occupancy(self.seasonality_profile, start_date, months)
+        calendar = month_calendar(start_date, months)
+        seasonal = np.array([self.get_occupancy_rate(month) for month in range(1, 13)])
+        return seasonal[calendar['month'] - 1][:, None]
     
     def calculate_monthly_revenue(self, month, year):
         """Calculate revenue for a specific month"""
@@ -73,58 +90,66 @@ class HostelFinancialModel:
     
     def calculate_monthly_expenses(self, month, year, years_from_start=0):
         """Calculate operating expenses for a specific month"""
-        base_expenses = sum(self.assumptions['operating_expenses'].values())
+        days_in_month = pd.Period(f'{year}-{month}').days_in_month
+        _, beds, _ = room_type_arrays(self.room_types)
         inflation_factor = (1 + self.assumptions['inflation_rate']) ** years_from_start
-        return base_expenses * inflation_factor
+        costs = build_cost_arrays(beds * self.get_occupancy_rate(month) * days_in_month, days_in_month,
+                                  self.assumptions['cost_drivers'], inflation_factor)
+        return float(costs['operating_expenses'])
+    
+    def generate_projection_frame(self, years=3):
+        """Generate financial projections as a column-oriented ProjectionFrame"""
+        calendar = month_calendar(datetime(self.start_date.year, 1, 1), years * 12)
+        _, beds, rates = room_type_arrays(self.room_types)
+        year_offset = np.arange(years * 12) // 12
+        
+        occupancy = self.occupancy_array(datetime(self.start_date.year, 1, 1), years * 12)
+        
+        # Apply growth rate for future years
+        growth_factor = (1 + self.assumptions['growth_rate']) ** year_offset
+        bed_nights = build_bed_night_arrays(
+            beds, rates, occupancy, calendar['days'], growth_factor[:, None]
+        )
+        revenue = bed_nights['room_revenue'].sum(axis=-1)
+        occupancy_rate = bed_nights['sold_bed_nights'].sum(axis=-1) / bed_nights['available_bed_nights'].sum(axis=-1)
+        
+        inflation_factor = (1 + self.assumptions['inflation_rate']) ** year_offset
+        expenses = build_cost_arrays(bed_nights['sold_bed_nights'], calendar['days'],
+                                     self.assumptions['cost_drivers'], inflation_factor)['operating_expenses']
+        
+        return ProjectionFrame(calendar['year'], calendar['month'], {
+            'Revenue': revenue,
+            'Expenses': expenses,
+            'Net_Income': revenue - expenses,
+            'Occupancy_Rate': occupancy_rate
+        })
     
     def generate_projections(self, years=3):
         """Generate financial projections for specified number of years"""
-        projections = []
-        
-        for year_offset in range(years):
-            current_year = self.start_date.year + year_offset
-            
-            for month in range(1, 13):
-                revenue = self.calculate_monthly_revenue(month, current_year)
-                # Apply growth rate for future years
-                revenue *= (1 + self.assumptions['growth_rate']) ** year_offset
-                
-                expenses = self.calculate_monthly_expenses(month, current_year, year_offset)
-                
-                projection = {
-                    'Year': current_year,
-                    'Month': month,
-                    'Month_Name': pd.Period(f'{current_year}-{month}').strftime('%B'),
-                    'Revenue': revenue,
-                    'Expenses': expenses,
-                    'Net_Income': revenue - expenses,
-                    'Occupancy_Rate': self.get_occupancy_rate(month)
-                }
-                projections.append(projection)
-                
-        return pd.DataFrame(projections)
+        return self.generate_projection_frame(years).to_dataframe()
     
     def get_occupancy_rate(self, month):
         """Get occupancy rate for a specific month"""
         season = self.assumptions['seasonality'][month]
         return self.assumptions['occupancy_rate'][f'{season}_season']
     
-    def calculate_break_even(self):
-        """Calculate break-even occupancy rate"""
-        monthly_expenses = sum(self.assumptions['operating_expenses'].values())
-        
-        # Calculate average daily rate
-        total_revenue_capacity = sum(
-            details['beds'] * details['rate'] 
-            for details in self.room_types.values()
-        )
+    def calculate_break_even(self, step=0.001):
+        """Calculate break-even occupancy rate
         
-        # Break-even occupancy
-        days_per_month = 30  # Average
-        total_bed_nights = self.total_beds * days_per_month
-        break_even_occupancy = monthly_expenses / (total_revenue_capacity * days_per_month)
+        Costs step with staffing, so revenue and driver-based costs are
+        evaluated over an occupancy grid at once and the lowest occupancy
+        covering costs is returned.
+        """
+        _, beds, rates = room_type_arrays(self.room_types)
+        occupancy = np.arange(0, 1 + step / 2, step)
         
-        return break_even_occupancy
+        # (occupancy, month, room_type) for one average 30-day month
+        days_per_month = np.array([30])
+        bed_nights = build_bed_night_arrays(beds, rates, occupancy[:, None, None], days_per_month)
+        costs = build_cost_arrays(bed_nights['sold_bed_nights'], days_per_month, self.assumptions['cost_drivers'])
+        
+        covered = bed_nights['room_revenue'].sum(axis=-1)[:, 0] >= costs['operating_expenses'][:, 0]
+        return float(occupancy[np.argmax(covered)]) if covered.any() else float('nan')
     
     def create_excel_model(self, filename='hostel_financial_model.xlsx'):
         """Create comprehensive Excel financial model"""
@@ -147,12 +172,16 @@ class HostelFinancialModel:
             
             # Format sheets
             self._format_excel_sheets(writer)
-            
-        print(f"Financial model created: {filename}")
+        
+        fingerprint = finalize_run(filename, writer.book, self.context, {'projections': df_projections})
+        print(f"Financial model created: {filename} (fingerprint {fingerprint[:12]})")
         return filename
     
     def _create_summary_sheet(self, writer, projections_df):
         """Create summary sheet with key metrics"""
+        index = PeriodIndex.from_frame(projections_df)
+        first_year = self.start_date.year
+        
         summary_data = {
             'Metric': [
                 'Total Beds',
@@ -167,61 +196,91 @@ class HostelFinancialModel:
             ],
             'Value': [
                 self.total_beds,
-                f"{projections_df['Occupancy_Rate'].mean():.1%}",
-                f"{self.calculate_break_even():.1%}",
-                f"${projections_df['Revenue'].mean():,.0f}",
-                f"${projections_df['Expenses'].mean():,.0f}",
-                f"${projections_df['Net_Income'].mean():,.0f}",
-                f"${projections_df[projections_df['Year'] == self.start_date.year]['Revenue'].sum():,.0f}",
-                f"${projections_df[projections_df['Year'] == self.start_date.year]['Net_Income'].sum():,.0f}",
-                f"{(projections_df['Net_Income'].sum() / projections_df['Revenue'].sum()):.1%}"
+                projections_df['Occupancy_Rate'].mean(),
+                self.calculate_break_even(),
+                projections_df['Revenue'].mean(),
+                projections_df['Expenses'].mean(),
+                projections_df['Net_Income'].mean(),
+                index.fiscal_year_total('Revenue', first_year),
+                index.fiscal_year_total('Net_Income', first_year),
+                projections_df['Net_Income'].sum() / projections_df['Revenue'].sum()
             ]
         }
+        formats = ['count', 'percent_1', 'percent_1', 'currency', 'currency', 'currency',
+                   'currency', 'currency', 'percent_1']
         
         df_summary = pd.DataFrame(summary_data)
         df_summary.to_excel(writer, sheet_name='Summary', index=False)
+        apply_formats(writer.sheets['Summary'], formats, column=2, first_row=2)
     
     def _create_assumptions_sheet(self, writer):
         """Create assumptions sheet"""
         assumptions_data = []
+        formats = []  # (Value, Notes) number format kinds per row
         
         # Room types
-        assumptions_data.append(['Room Types', '', ''])
+        assumptions_data.append(['Room Types', None, None])
         assumptions_data.append(['Type', 'Beds', 'Daily Rate'])
         for room_type, details in self.room_types.items():
-            assumptions_data.append([room_type, details['beds'], f"${details['rate']}"])
+            assumptions_data.append([room_type, details['beds'], details['rate']])
+            formats.append((len(assumptions_data), 'count', 'currency'))
         
-        assumptions_data.append(['', '', ''])
+        assumptions_data.append([None, None, None])
         
         # Occupancy rates
-        assumptions_data.append(['Occupancy Rates', '', ''])
+        assumptions_data.append(['Occupancy Rates', None, None])
         for season, rate in self.assumptions['occupancy_rate'].items():
-            assumptions_data.append([season, f"{rate:.0%}", ''])
+            assumptions_data.append([season, rate, None])
+            formats.append((len(assumptions_data), 'percent', None))
+        
+        assumptions_data.append([None, None, None])
         
-        assumptions_data.append(['', '', ''])
+        # Operating cost drivers
+        drivers = self.assumptions['cost_drivers']
+        assumptions_data.append(['Variable Costs per Occupied Bed-Night', None, None])
+        for driver, rate in drivers['variable'].items():
+            assumptions_data.append([driver, rate, None])
+            formats.append((len(assumptions_data), 'currency_cents', None))
         
-        # Operating expenses
-        assumptions_data.append(['Monthly Operating Expenses', '', ''])
-        for expense, amount in self.assumptions['operating_expenses'].items():
-            assumptions_data.append([expense, f"${amount:,}", ''])
+        assumptions_data.append([None, None, None])
+        
+        assumptions_data.append(['Staffing', None, None])
+        for name, value in drivers['staffing'].items():
+            assumptions_data.append([name, value, None])
+            formats.append((len(assumptions_data), 'currency' if name == 'monthly_cost_per_staff' else 'count', None))
+        
+        assumptions_data.append([None, None, None])
+        
+        assumptions_data.append(['Fixed Monthly Overheads', None, None])
+        for overhead, amount in drivers['fixed'].items():
+            assumptions_data.append([overhead, amount, None])
+            formats.append((len(assumptions_data), 'currency', None))
         
         df_assumptions = pd.DataFrame(assumptions_data, columns=['Category', 'Value', 'Notes'])
         df_assumptions.to_excel(writer, sheet_name='Assumptions', index=False)
+        
+        # Data row n sits below the header on sheet row n + 1
+        ws = writer.sheets['Assumptions']
+        for row, value_kind, notes_kind in formats:
+            apply_formats(ws, [value_kind, notes_kind], column=2, first_row=row + 1, across=True)
     
     def _create_dashboard_sheet(self, writer, projections_df):
         """Create dashboard with charts"""
-        # Prepare data for charts
-        monthly_summary = projections_df.groupby('Month_Name').agg({
-            'Revenue': 'mean',
-            'Expenses': 'mean',
-            'Net_Income': 'mean'
-        }).round(0)
-        
-        yearly_summary = projections_df.groupby('Year').agg({
-            'Revenue': 'sum',
-            'Expenses': 'sum',
-            'Net_Income': 'sum'
-        }).round(0)
+        # Prepare data for charts from the prefix-sum index
+        index = PeriodIndex.from_frame(projections_df)
+        columns = ['Revenue', 'Expenses', 'Net_Income']
+        
+        # Calendar order rather than alphabetical month names
+        monthly_summary = pd.DataFrame(
+            {column: index.month_of_year_means(column) for column in columns},
+            index=pd.Index([datetime(2000, month, 1).strftime('%B') for month in range(1, 13)], name='Month_Name')
+        ).round(0)
+        
+        years, _ = index.yearly_totals('Revenue')
+        yearly_summary = pd.DataFrame(
+            {column: index.yearly_totals(column)[1] for column in columns},
+            index=pd.Index(years, name='Year')
+        ).round(0)
         
         # Write data
         monthly_summary.to_excel(writer, sheet_name='Dashboard', startrow=1, startcol=0)
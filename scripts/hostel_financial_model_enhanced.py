@@ -9,18 +9,39 @@ import numpy as np
 from datetime import datetime, timedelta
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.chart import BarChart, Reference, LineChart
 from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from hostel_kpi_engine import (DEFAULT_CHANNELS, DEFAULT_COST_DRIVERS, month_calendar,
+                               room_type_arrays, build_bed_night_arrays, channel_arrays,
+                               build_channel_arrays, build_cost_arrays, summarize_kpis)
+from hostel_period_index import PeriodIndex
+from hostel_financing import default_loan_tranches, build_debt_schedule, debt_service_coverage
+from hostel_three_statement import build_three_statements, check_statements
+from hostel_tax import DEFAULT_ASSET_CLASSES, DEFAULT_VAT, build_depreciation, vat_schedule
+from hostel_seasonality import daily_occupancy, monthly_occupancy, profile_for_room_types
+from hostel_heatmap import daily_from_monthly, write_heatmap
+from hostel_charts import add_chart, table_block, write_series_block
+from hostel_cell_values import write_value, number_format, currency_symbol
+from hostel_fx import fx_path, simulate_fx_paths
+from hostel_demand import DEFAULT_DEMAND, simulate_bookings, booking_curve, monthly_totals
+from hostel_capacity import build_capacity_schedule, npv, timing_grid, timing_groups
+from hostel_valuation import discounted_cash_flow
+from hostel_stress import (STRESS_LIBRARY, DEFAULT_COVENANTS, build_stress_paths, energy_overlay,
+                           stress_metrics, write_stress_sheet)
+from hostel_formula_export import build_projection_graph, write_live_workbook, verify_live_workbook
+from hostel_projection_frame import ProjectionFrame
+from hostel_run_context import RunContext, finalize_run
+
 class EnhancedHostelFinancialModel:
     """Enhanced hostel financial model with scenario analysis"""
     
-    def __init__(self, hostel_name="Hostel Diary", start_date=None):
+    def __init__(self, hostel_name="Hostel Diary", start_date=None, context=None):
         self.hostel_name = hostel_name
-        self.start_date = start_date or datetime.now()
+        self.context = context or RunContext.from_environment()
+        self.start_date = start_date or self.context.as_of_datetime
         
         # Model parameters
         self.total_beds = 50
@@ -43,19 +64,42 @@ class EnhancedHostelFinancialModel:
                 5: 'high', 6: 'high', 7: 'high', 8: 'high',
                 9: 'mid', 10: 'mid', 11: 'low', 12: 'low'
             },
-            'operating_expenses': {
-                'staff_salaries': 8000,
-                'utilities': 1200,
-                'maintenance': 800,
-                'supplies': 1500,
-                'marketing': 1000,
-                'insurance': 600,
-                'other': 900
-            },
+            'cost_drivers': {group: dict(drivers) for group, drivers in DEFAULT_COST_DRIVERS.items()},
             'growth_rate': 0.03,
-            'inflation_rate': 0.025
+            'inflation_rate': 0.025,
+            'tax_rate': 0.25,
+            'depreciation_years': 10,
+            'asset_classes': {name: dict(asset) for name, asset in DEFAULT_ASSET_CLASSES.items()},
+            'vat': dict(DEFAULT_VAT),
+            'receivable_days': 3,
+            'payable_days': 30,
+            'liquidity_reserve': 50000,
+            'discount_rate': 0.10,
+            'terminal_growth_rate': 0.02,
+            'channels': {name: dict(channel) for name, channel in DEFAULT_CHANNELS.items()},
+            'demand': dict(DEFAULT_DEMAND)
         }
         
+        # Fitted seasonality profile; None uses the season table above
+        self.seasonality_profile = None
+        
+        # Projection horizon: any number of months from the first projection month
+        self.projection_start = datetime(self.start_date.year, 1, 1)
+        self.horizon_months = 36
+        
+        # Capacity plan (hostel_capacity events); empty keeps room_types fixed
+        self.capacity_plan = []
+        
+        # Room rates and cost drivers are in the functional currency; results,
+        # the initial investment and financing are in the reporting currency
+        self.currency = 'USD'
+        self.reporting_currency = 'USD'
+        self.fx_rates = None
+        
+        # Financing: senior loan on half the initial investment
+        self.initial_investment = 750000
+        self.financing_tranches = default_loan_tranches(self.initial_investment)
+        
         # Scenario definitions
         self.scenarios = {
             'best': {
@@ -105,67 +149,540 @@ class EnhancedHostelFinancialModel:
     
     def calculate_monthly_expenses(self, month, year, years_from_start=0, scenario='base'):
         """Calculate operating expenses for a specific month and scenario"""
-        base_expenses = sum(self.base_assumptions['operating_expenses'].values())
+        season = self.base_assumptions['seasonality'][month]
+        occupancy = self.base_assumptions['occupancy_rate'][f'{season}_season']
         scenario_data = self.scenarios[scenario]
+        occupancy = max(0.1, min(1.0, occupancy + scenario_data['occupancy_adjustment']))
         
-        # Apply scenario adjustment
-        adjusted_expenses = base_expenses * (1 + scenario_data['expense_adjustment'])
+        # Scenario adjustment and inflation scale every cost driver
+        days_in_month = pd.Period(f'{year}-{month}').days_in_month
+        _, beds, _ = room_type_arrays(self.room_types)
+        cost_factor = (1 + scenario_data['expense_adjustment']) * (1 + self.base_assumptions['inflation_rate']) ** years_from_start
+        costs = build_cost_arrays(beds * occupancy * days_in_month, days_in_month,
+                                  self.base_assumptions['cost_drivers'], cost_factor)
+        return float(costs['operating_expenses'])
+    
+    def set_seasonality_profile(self, profile):
+        """Use a fitted seasonality profile (hostel_seasonality) for occupancy"""
+        self.seasonality_profile = profile_for_room_types(profile, self.room_types)
+    
+    def occupancy_array(self, start_date, months):
+        """Base occupancy per month and room type for a projection horizon"""
+        if self.seasonality_profile is not None:
+            return monthly_occupancy(self.seasonality_profile, start_date, months)
+        calendar = month_calendar(start_date, months)
+        seasonal = np.array([
+            self.base_assumptions['occupancy_rate'][f"{self.base_assumptions['seasonality'][month]}_season"]
+            for month in range(1, 13)
+        ])
+        return seasonal[calendar['month'] - 1][:, None]
+    
+    def set_horizon(self, months, start=None):
+        """Project `months` months from `start` (default: the current projection start)"""
+        self.horizon_months = int(months)
+        if start is not None:
+            self.projection_start = datetime(start.year, start.month, 1)
+    
+    def projection_months(self, years=None):
+        """Months in a horizon of `years` (fractional allowed), or the model horizon"""
+        return self.horizon_months if years is None else int(round(years * 12))
+    
+    def horizon_label(self, months=None):
+        """Short horizon label for headings, e.g. '3Y' or '30M'"""
+        months = self.horizon_months if months is None else months
+        return f'{months // 12}Y' if months % 12 == 0 else f'{months}M'
+    
+    def daily_occupancy_array(self, scenario='base', months=12):
+        """(day, room_type) occupancy and dates for the first months of a scenario
         
-        # Apply inflation
-        inflation_factor = (1 + self.base_assumptions['inflation_rate']) ** years_from_start
-        return adjusted_expenses * inflation_factor
+        Uses the fitted daily curve when a seasonality profile is set,
+        otherwise each day carries its month's occupancy.
+        """
+        start = self.projection_start
+        calendar = month_calendar(start, months)
+        if self.seasonality_profile is not None:
+            dates = np.datetime64(start.date(), 'D') + np.arange(calendar['days'].sum())
+            adjustment = self.scenarios[scenario]['occupancy_adjustment']
+            return dates, np.clip(daily_occupancy(self.seasonality_profile, dates) + adjustment, 0.1, 1.0)
+        
+        arrays = self.scenario_bed_nights[scenario]
+        sold = arrays['sold_bed_nights'][:months]
+        available = arrays['available_bed_nights'][:months]
+        # Room types a capacity plan takes offline show as empty, not NaN
+        occupancy = np.divide(sold, available, out=np.zeros_like(sold), where=available > 0)
+        return daily_from_monthly(occupancy, start, calendar['days'])
     
-    def generate_scenario_projections(self, years=3):
+    def _scenario_drivers(self, years=None):
+        """Calendar, room arrays and (scenario, month[, room_type]) driver arrays"""
+        months = self.projection_months(years)
+        calendar = month_calendar(self.projection_start, months)
+        _, beds, rates = room_type_arrays(self.room_types)
+        
+        # Seasonal base occupancy per month and room type
+        base_occupancy = self.occupancy_array(self.projection_start, months)
+        year_offset = np.arange(months) // 12
+        
+        scenario_data = list(self.scenarios.values())
+        occupancy_adjustment = np.array([s['occupancy_adjustment'] for s in scenario_data])[:, None, None]
+        rate_adjustment = np.array([s['rate_adjustment'] for s in scenario_data])[:, None]
+        growth_rate = np.array([s['growth_rate'] for s in scenario_data])[:, None]
+        expense_adjustment = np.array([s['expense_adjustment'] for s in scenario_data])[:, None]
+        
+        # Keep occupancy between 10% and 100%, apply growth rate for future years;
+        # rates and costs convert to the reporting currency month by month
+        fx_rates = self.reporting_fx_rates(years)
+        return {
+            'calendar': calendar,
+            'beds': beds,
+            'rates': rates,
+            'occupancy': np.clip(base_occupancy + occupancy_adjustment, 0.1, 1.0),
+            'rate_factor': (1 + rate_adjustment) * (1 + growth_rate) ** year_offset * fx_rates,
+            'cost_factor': (1 + expense_adjustment) * (1 + self.base_assumptions['inflation_rate']) ** year_offset * fx_rates,
+            'fx_rates': fx_rates
+        }
+    
+    def set_currency(self, currency, reporting_currency='USD', fx_rates=None):
+        """Set the functional and reporting currencies
+        
+        `fx_rates` is a (month,) path of reporting currency per functional
+        unit; by default the spot rate is held flat.
+        """
+        self.currency = currency
+        self.reporting_currency = reporting_currency
+        self.fx_rates = None if fx_rates is None else np.asarray(fx_rates, dtype=float)
+    
+    def reporting_fx_rates(self, years=None):
+        """(month,) reporting currency per unit of the functional currency"""
+        months = self.projection_months(years)
+        if self.currency == self.reporting_currency:
+            return np.ones(months)
+        if self.fx_rates is not None:
+            if len(self.fx_rates) < months:
+                raise ValueError(f"FX path covers {len(self.fx_rates)} months, {months} needed")
+            return self.fx_rates[:months]
+        return fx_path(self.currency, months, self.reporting_currency)
+    
+    def simulate_fx_risk(self, paths=2000, years=None, scenario='base', percentiles=(5, 25, 50, 75, 95)):
+        """Percentiles of reporting-currency results under simulated FX paths
+        
+        FX is the risk factor: every simulated (path, month) rate replaces
+        the FX path as a leading axis through the bed-night, channel and
+        cost engines in one pass.
+        """
+        drivers = self._scenario_drivers(years)
+        index = list(self.scenarios).index(scenario)
+        rng = self.context.stream('fx_risk')
+        simulated = simulate_fx_paths([self.currency], self.projection_months(years), paths, rng, self.reporting_currency)[..., 0]
+        fx_shift = simulated / drivers['fx_rates']
+        
+        bed_nights = self._project_bed_nights(
+            drivers['calendar'], drivers['beds'], drivers['rates'],
+            np.broadcast_to(drivers['occupancy'][index], (paths,) + drivers['occupancy'].shape[1:]),
+            drivers['rate_factor'][index] * fx_shift, drivers['cost_factor'][index] * fx_shift
+        )
+        revenue = bed_nights['room_revenue'].sum(axis=-1)
+        net_income = revenue - bed_nights['commission'].sum(axis=(-2, -1)) - bed_nights['operating_expenses']
+        return pd.DataFrame({
+            'Percentile': list(percentiles),
+            'Revenue': np.percentile(revenue.sum(axis=-1), percentiles),
+            'Net_Income': np.percentile(net_income.sum(axis=-1), percentiles),
+            'Final_FX_Rate': np.percentile(simulated[:, -1], percentiles)
+        })
+    
+    def simulate_demand(self, replications=1000, scenario='base', months=12, percentiles=(5, 50, 95)):
+        """Occupancy and ADR from booking requests simulated against bed inventory
+
+        The scenario's seasonal occupancy sets unconstrained demand; stay
+        lengths, lead times and pricing follow the 'demand' assumptions.
+        Returns monthly means with an occupancy band, replication
+        percentiles of the KPIs, the mean booking curve and the monthly
+        bed-night arrays.
+        """
+        drivers = self._scenario_drivers(months / 12)
+        index = list(self.scenarios).index(scenario)
+        calendar = drivers['calendar']
+        if self.seasonality_profile is not None:
+            _, target = self.daily_occupancy_array(scenario, months)
+        else:
+            _, target = daily_from_monthly(drivers['occupancy'][index], self.projection_start, calendar['days'])
+        target = np.broadcast_to(target, (len(target), len(drivers['beds'])))
+        nightly_rates = np.repeat(drivers['rate_factor'][index], calendar['days'])[:, None] * drivers['rates']
+
+        simulated = simulate_bookings(target, drivers['beds'], nightly_rates, replications,
+                                      self.context.stream(f'demand_{scenario}'), self.base_assumptions['demand'])
+        bed_nights = {
+            'available_bed_nights': np.broadcast_to(calendar['days'][:, None] * drivers['beds'],
+                                                    (replications, months, len(drivers['beds']))),
+            'sold_bed_nights': monthly_totals(simulated['sold_bed_nights'], calendar['days']),
+            'room_revenue': monthly_totals(simulated['room_revenue'], calendar['days'])
+        }
+
+        sold = bed_nights['sold_bed_nights'].sum(axis=-1)
+        occupancy = sold / bed_nights['available_bed_nights'].sum(axis=-1)
+        revenue = bed_nights['room_revenue'].sum(axis=-1)
+        low, high = np.percentile(occupancy, [percentiles[0], percentiles[-1]], axis=0)
+        monthly = pd.DataFrame({
+            'Year': calendar['year'],
+            'Month': calendar['month'],
+            'Target_Occupancy': np.broadcast_to(drivers['occupancy'][index], (months, len(drivers['beds'])))
+                                @ drivers['beds'] / drivers['beds'].sum(),
+            'Occupancy': occupancy.mean(axis=0),
+            f'Occupancy_P{percentiles[0]}': low,
+            f'Occupancy_P{percentiles[-1]}': high,
+            'ADR': revenue.sum(axis=0) / sold.sum(axis=0),
+            'Room_Revenue': revenue.mean(axis=0)
+        })
+
+        kpis = summarize_kpis(bed_nights)
+        turnaway_rate = simulated['turned_away'].sum(axis=-1) / simulated['requests'].sum(axis=-1)
+        summary = pd.DataFrame({
+            'Percentile': list(percentiles),
+            'Occupancy': np.percentile(kpis['Occupancy'], percentiles),
+            'ADR': np.percentile(kpis['ADR'], percentiles),
+            'RevPAB': np.percentile(kpis['RevPAB'], percentiles),
+            'Room_Revenue': np.percentile(kpis['Room_Revenue'], percentiles),
+            'Turnaway_Rate': np.percentile(turnaway_rate, percentiles)
+        })
+        return {
+            'monthly': monthly,
+            'summary': summary,
+            'booking_curve': booking_curve(simulated['lead_time_bed_nights'].sum(axis=0)),
+            'bed_nights': bed_nights,
+            'days': int(calendar['days'].sum())
+        }
+
+    def _project_bed_nights(self, calendar, beds, rates, occupancy, rate_factor, cost_factor):
+        """Bed-night, channel and operating cost arrays for any leading axes"""
+        bed_nights = build_bed_night_arrays(
+            beds, rates, occupancy, calendar['days'], rate_factor[..., None]
+        )
+        _, shares, commissions = channel_arrays(self.base_assumptions['channels'])
+        bed_nights.update(build_channel_arrays(bed_nights['room_revenue'], shares, commissions))
+        
+        # Operating costs follow the sold bed-nights
+        bed_nights.update(build_cost_arrays(bed_nights['sold_bed_nights'], calendar['days'],
+                                            self.base_assumptions['cost_drivers'], cost_factor))
+        return bed_nights
+    
+    def build_scenario_bed_nights(self, years=None):
+        """Build (scenario, month, room_type) bed-night and room revenue arrays
+
+        Room revenue is also split into (scenario, month, room_type, channel)
+        channel revenue and commission tensors, and (scenario, month)
+        driver-based operating costs are derived from the sold bed-nights.
+        A capacity plan replaces the fixed bed counts with its schedule.
+        """
+        drivers = self._scenario_drivers(years)
+        beds, occupancy = drivers['beds'], drivers['occupancy']
+        if self.capacity_plan:
+            schedule = self.capacity_schedule(years)
+            beds = schedule['beds']
+            occupancy = occupancy * schedule['ramp_factor']
+        return self._project_bed_nights(drivers['calendar'], beds, drivers['rates'], occupancy,
+                                        drivers['rate_factor'], drivers['cost_factor'])
+    
+    def set_capacity_plan(self, events):
+        """Use a capacity plan (hostel_capacity events) for bed counts and capex"""
+        self.capacity_plan = [dict(event) for event in events]
+    
+    def capacity_schedule(self, years=None, timings=None):
+        """(..., month, room_type) beds, ramp-up and capex of the capacity plan"""
+        _, beds, _ = room_type_arrays(self.room_types)
+        return build_capacity_schedule(
+            beds, list(self.room_types), self.capacity_plan, self.projection_months(years), timings,
+            depreciation_months=self.base_assumptions['depreciation_years'] * 12
+        )
+    
+    def search_capacity_timings(self, candidate_months, scenario='base', years=5,
+                                discount_rate=0.10, ordered=False, batch_size=4096):
+        """Rank every combination of capacity plan start months by NPV
+        
+        Events sharing a `group` move together. All combinations are projected as one batch axis through the
+        bed-night, channel and cost engines (in chunks of `batch_size`).
+        NPV is of pre-tax, unlevered cash flow: revenue less commissions,
+        operating costs and plan capex. NPV_Gain is relative to not
+        carrying out the plan.
+        """
+        months = self.projection_months(years)
+        groups, event_groups = timing_groups(self.capacity_plan)
+        grid = timing_grid(self.capacity_plan, candidate_months, ordered)
+        timings = np.vstack([grid, np.full((1, len(groups)), months)])[:, event_groups]
+        drivers = self._scenario_drivers(years)
+        index = list(self.scenarios).index(scenario)
+        
+        values, capex_totals = [], []
+        for start in range(0, len(timings), batch_size):
+            schedule = self.capacity_schedule(years, timings[start:start + batch_size])
+            bed_nights = self._project_bed_nights(
+                drivers['calendar'], schedule['beds'], drivers['rates'],
+                drivers['occupancy'][index] * schedule['ramp_factor'],
+                drivers['rate_factor'][index], drivers['cost_factor'][index]
+            )
+            cash_flow = (bed_nights['room_revenue'].sum(axis=-1) - bed_nights['commission'].sum(axis=(-2, -1))
+                         - bed_nights['operating_expenses'] - schedule['capex'])
+            values.append(npv(cash_flow, discount_rate))
+            capex_totals.append(schedule['capex'].sum(axis=-1))
+        values = np.concatenate(values)
+        capex_totals = np.concatenate(capex_totals)
+        
+        results = pd.DataFrame(grid, columns=[f'{group}_Month' for group in groups])
+        results['Capex'] = capex_totals[:-1]
+        results['NPV'] = values[:-1]
+        results['NPV_Gain'] = values[:-1] - values[-1]
+        return results.sort_values('NPV', ascending=False, ignore_index=True)
+    
+    def generate_scenario_frames(self, years=None):
+        """Generate column-oriented ProjectionFrames for all scenarios"""
+        calendar = month_calendar(self.projection_start, self.projection_months(years))
+        bed_nights = self.build_scenario_bed_nights(years)
+        self.scenario_bed_nights = {
+            scenario_key: {name: array[index] for name, array in bed_nights.items()}
+            for index, scenario_key in enumerate(self.scenarios)
+        }
+        
+        # (scenario, month) arrays for every scenario at once
+        available = bed_nights['available_bed_nights'].sum(axis=-1)
+        sold = bed_nights['sold_bed_nights'].sum(axis=-1)
+        revenue = bed_nights['room_revenue'].sum(axis=-1)
+        commission = bed_nights['commission'].sum(axis=(-2, -1))
+        
+        expenses = bed_nights['operating_expenses']
+        
+        net_income = revenue - commission - expenses
+        profit_margin = np.divide(net_income, revenue, out=np.zeros_like(revenue), where=revenue > 0)
+        
+        return {
+            scenario_key: ProjectionFrame(calendar['year'], calendar['month'], {
+                'Revenue': revenue[index],
+                'Expenses': expenses[index],
+                'Net_Income': net_income[index],
+                'Profit_Margin': profit_margin[index],
+                'Available_Bed_Nights': available[index],
+                'Sold_Bed_Nights': sold[index],
+                'Commission': commission[index],
+                'Net_Revenue': revenue[index] - commission[index],
+                'Variable_Costs': bed_nights['variable_costs'][index].sum(axis=-1),
+                'Staffing_Costs': bed_nights['staffing_costs'][index],
+                'Fixed_Costs': bed_nights['fixed_costs'][index],
+                'Staff': bed_nights['staff'][index]
+            }, labels={'Scenario': self.scenarios[scenario_key]['name']})
+            for index, scenario_key in enumerate(self.scenarios)
+        }
+    
+    def generate_scenario_projections(self, years=None):
         """Generate projections for all scenarios"""
-        all_projections = {}
+        self.scenario_frames = self.generate_scenario_frames(years)
+        all_projections = {
+            scenario_key: frame.to_dataframe()
+            for scenario_key, frame in self.scenario_frames.items()
+        }
         
-        for scenario_key in self.scenarios:
-            projections = []
-            scenario_data = self.scenarios[scenario_key]
-            
-            for year_offset in range(years):
-                current_year = self.start_date.year + year_offset
-                
-                for month in range(1, 13):
-                    revenue = self.calculate_monthly_revenue(month, current_year, scenario_key)
-                    # Apply growth rate for future years
-                    revenue *= (1 + scenario_data['growth_rate']) ** year_offset
-                    
-                    expenses = self.calculate_monthly_expenses(month, current_year, year_offset, scenario_key)
-                    
-                    projection = {
-                        'Scenario': scenario_data['name'],
-                        'Year': current_year,
-                        'Month': month,
-                        'Month_Name': pd.Period(f'{current_year}-{month}').strftime('%B'),
-                        'Revenue': revenue,
-                        'Expenses': expenses,
-                        'Net_Income': revenue - expenses,
-                        'Profit_Margin': (revenue - expenses) / revenue if revenue > 0 else 0
-                    }
-                    projections.append(projection)
-            
-            all_projections[scenario_key] = pd.DataFrame(projections)
+        # Prefix-sum indexes for period roll-ups and break-even lookups
+        self.period_indexes = {
+            scenario_key: PeriodIndex.from_frame(df)
+            for scenario_key, df in all_projections.items()
+        }
         
         return all_projections
     
     def calculate_kpis(self, projections_df):
-        """Calculate key performance indicators"""
+        """Calculate key performance indicators for any slice of a projection"""
+        # Monthly property totals reduce like a single room type
+        bed_nights = {
+            'available_bed_nights': projections_df['Available_Bed_Nights'].to_numpy()[:, None],
+            'sold_bed_nights': projections_df['Sold_Bed_Nights'].to_numpy()[:, None],
+            'room_revenue': projections_df['Revenue'].to_numpy()[:, None]
+        }
+        operating_costs = (projections_df['Expenses'] + projections_df['Commission']).to_numpy()
+        engine_kpis = summarize_kpis(bed_nights, expenses=operating_costs)
+        
         kpis = {
-            'Average_Occupancy': 0.75,  # Will be calculated properly later
-            'RevPAB': projections_df['Revenue'].sum() / (self.total_beds * len(projections_df) * 30),
-            'Average_Daily_Rate': projections_df['Revenue'].mean() / (self.total_beds * 30 * 0.75),
+            'Average_Occupancy': float(engine_kpis['Occupancy']),
+            'RevPAB': float(engine_kpis['RevPAB']),
+            'Average_Daily_Rate': float(engine_kpis['ADR']),
+            'GOPPAB': float(engine_kpis['GOPPAB']),
             'Total_Revenue': projections_df['Revenue'].sum(),
+            'Total_Commission': projections_df['Commission'].sum(),
+            'Net_Revenue': projections_df['Net_Revenue'].sum(),
             'Total_Expenses': projections_df['Expenses'].sum(),
             'Total_Net_Income': projections_df['Net_Income'].sum(),
             'Average_Profit_Margin': projections_df['Profit_Margin'].mean()
         }
         return kpis
     
-    def create_enhanced_excel_model(self, filename='hostel_financial_model_enhanced.xlsx'):
-        """Create comprehensive Excel model with scenario analysis"""
+    def calculate_debt_schedule(self, projections_df):
+        """Build the monthly debt schedule and DSCR for a projection"""
+        return self._debt_schedule(projections_df['Net_Income'].to_numpy())
+    
+    def _debt_schedule(self, operating_cash_flow):
+        """Debt schedule and DSCR for (..., month) pre-financing cash flow"""
+        schedule = build_debt_schedule(
+            self.financing_tranches, operating_cash_flow.shape[-1], cash_flow=operating_cash_flow
+        )['total']
+        schedule['dscr'] = debt_service_coverage(operating_cash_flow, schedule['debt_service'])
+        return schedule
+    
+    def build_financial_statements(self, projections_df):
+        """Build linked P&L, cash flow and balance sheet arrays for a projection"""
+        start = datetime(int(projections_df['Year'].iloc[0]), int(projections_df['Month'].iloc[0]), 1)
+        return self._link_statements(
+            projections_df['Revenue'].to_numpy(),
+            (projections_df['Expenses'] + projections_df['Commission']).to_numpy(),
+            month_calendar(start, len(projections_df))
+        )
+    
+    def _link_statements(self, revenue, expenses, calendar, opening_cash=0.0):
+        """Linked statements for (..., month) revenue and costs including commission
+        
+        Capex depreciates by asset class, VAT is collected on room revenue
+        and tax is assessed per calendar year with losses carried forward.
+        """
+        months = revenue.shape[-1]
+        debt = self._debt_schedule(revenue - expenses)
+        
+        # Initial investment spent in month one, funded by the loan and equity;
+        # capacity plan capex is paid from cash
+        capex = np.zeros(months)
+        capex[0] = self.initial_investment
+        if self.capacity_plan:
+            capex += self.capacity_schedule(months / 12)['capex']
+        equity = np.zeros(np.broadcast(revenue, debt['draws']).shape)
+        equity[..., 0] = self.initial_investment - debt['draws'][..., 0]
+        vat = vat_schedule(revenue, **self.base_assumptions['vat'])
+        
+        statements = build_three_statements(
+            revenue, expenses,
+            capex=capex,
+            debt=debt,
+            equity_contributions=equity,
+            tax_rate=self.base_assumptions['tax_rate'],
+            depreciation=build_depreciation(capex, self.base_assumptions['asset_classes'])['total'],
+            receivable_days=self.base_assumptions['receivable_days'],
+            payable_days=self.base_assumptions['payable_days'],
+            opening_cash=opening_cash,
+            days_in_month=calendar['days'],
+            tax_periods=calendar['year'],
+            vat=vat
+        )
+        check_statements(statements)
+        statements['debt'] = debt
+        statements['vat'] = vat
+        return statements
+    
+    def run_stress_tests(self, stresses=STRESS_LIBRARY, years=None, opening_cash=None, covenants=DEFAULT_COVENANTS):
+        """Apply every stress path to every scenario in one vectorized run
+        
+        Stress multipliers scale occupancy, rates, costs and (for sites
+        reporting in another currency) the FX path month by month on a
+        leading stress axis, the projection runs through the bed-night,
+        cost and three-statement engines, and each (stress, scenario) pair
+        gets its liquidity runway and covenant flags. Opening cash defaults
+        to the liquidity reserve.
+        """
+        if opening_cash is None:
+            opening_cash = self.base_assumptions['liquidity_reserve']
+        drivers = self._scenario_drivers(years)
+        names, paths = build_stress_paths(stresses, self.projection_months(years))
+        
+        beds, occupancy = drivers['beds'], drivers['occupancy']
+        if self.capacity_plan:
+            schedule = self.capacity_schedule(years)
+            beds = schedule['beds']
+            occupancy = occupancy * schedule['ramp_factor']
+        
+        # A currency shock moves translation only when the site reports in
+        # another currency; rates and costs both translate at the shocked rate
+        fx_shift = paths['fx'] if self.currency != self.reporting_currency else np.ones_like(paths['fx'])
+        
+        # (stress, scenario, month[, room_type]) drivers
+        bed_nights = self._project_bed_nights(
+            drivers['calendar'], beds, drivers['rates'],
+            np.clip(occupancy * paths['occupancy'][:, None, :, None], 0, 1),
+            drivers['rate_factor'] * (paths['rate'] * fx_shift)[:, None],
+            drivers['cost_factor'] * (paths['costs'] * fx_shift)[:, None]
+        )
+        operating = bed_nights['operating_expenses'] + energy_overlay(
+            bed_nights, self.base_assumptions['cost_drivers'], paths['energy'][:, None]
+        )
+        revenue = bed_nights['room_revenue'].sum(axis=-1)
+        statements = self._link_statements(revenue, operating + bed_nights['commission'].sum(axis=(-2, -1)),
+                                           drivers['calendar'], opening_cash)
+        income = statements['income_statement']
+        metrics = stress_metrics(statements['cash_flow']['Cash_Balance'], income['EBITDA'] - income['Tax'],
+                                 statements['debt']['debt_service'], covenants)
+        
+        stress_names, scenario_names = np.meshgrid(names, [s['name'] for s in self.scenarios.values()], indexing='ij')
+        return pd.DataFrame({
+            'Stress': stress_names.ravel(),
+            'Scenario': scenario_names.ravel(),
+            'Revenue': revenue.sum(axis=-1).ravel(),
+            'Net_Income': income['Net_Income'].sum(axis=-1).ravel(),
+            **{name: np.ravel(values) for name, values in metrics.items()}
+        })
+    
+    def valuation(self, years=None, discount_rate=None, growth_rate=None):
+        """DCF value of every scenario with a Gordon-growth terminal value
+        
+        Cash flow is pre-tax and unlevered (revenue less commissions,
+        operating costs and plan capex), as in search_capacity_timings; NPV
+        is net of the initial investment. Rates default to the assumptions.
+        """
+        discount_rate = self.base_assumptions['discount_rate'] if discount_rate is None else discount_rate
+        growth_rate = self.base_assumptions['terminal_growth_rate'] if growth_rate is None else growth_rate
+        bed_nights = self.build_scenario_bed_nights(years)
+        cash_flow = (bed_nights['room_revenue'].sum(axis=-1) - bed_nights['commission'].sum(axis=(-2, -1))
+                     - bed_nights['operating_expenses'])
+        if self.capacity_plan:
+            cash_flow = cash_flow - self.capacity_schedule(years)['capex']
+        
+        value = discounted_cash_flow(cash_flow, discount_rate, growth_rate, self.initial_investment)
+        return pd.DataFrame({
+            'Scenario': [scenario['name'] for scenario in self.scenarios.values()],
+            'PV_Cash_Flows': value['pv_cash_flows'],
+            'Terminal_Value': value['terminal_value'],
+            'PV_Terminal_Value': value['pv_terminal_value'],
+            'Enterprise_Value': value['enterprise_value'],
+            'Terminal_Share': value['terminal_share'],
+            'NPV': value['npv']
+        })
+    
+    def calculate_room_type_kpis(self, scenario='base', months=None):
+        """Calculate occupancy, ADR and RevPAB per room type for a scenario"""
+        arrays = self.scenario_bed_nights[scenario]
+        room_type_kpis = []
+        
+        for index, room_type in enumerate(self.room_types):
+            kpis = summarize_kpis(arrays, months=months, room_types=[index])
+            room_type_kpis.append({
+                'Room_Type': room_type,
+                'Occupancy': float(kpis['Occupancy']),
+                'ADR': float(kpis['ADR']),
+                'RevPAB': float(kpis['RevPAB']),
+                'Room_Revenue': float(kpis['Room_Revenue'])
+            })
+        
+        return pd.DataFrame(room_type_kpis)
+    
+    def calculate_channel_breakdown(self, scenario='base', months=None):
+        """Gross revenue, commission and net revenue per room type and channel"""
+        months = slice(None) if months is None else months
+        arrays = self.scenario_bed_nights[scenario]
+        gross = arrays['channel_revenue'][months].sum(axis=0)
+        commission = arrays['commission'][months].sum(axis=0)
+        
+        channels = list(self.base_assumptions['channels'])
+        return pd.DataFrame({
+            'Room_Type': np.repeat(list(self.room_types), len(channels)),
+            'Channel': np.tile(channels, len(self.room_types)),
+            'Gross_Revenue': gross.ravel(),
+            'Commission': commission.ravel(),
+            'Net_Revenue': (gross - commission).ravel()
+        })
+    
+    def create_enhanced_excel_model(self, filename='hostel_financial_model_enhanced.xlsx', years=None):
+        """Create comprehensive Excel model with scenario analysis over the model horizon"""
         # Generate projections for all scenarios
-        scenario_projections = self.generate_scenario_projections(years=3)
+        scenario_projections = self.generate_scenario_projections(years)
         
         with pd.ExcelWriter(filename, engine='openpyxl') as writer:
             # 1. Executive Summary Sheet
@@ -189,10 +706,34 @@ class EnhancedHostelFinancialModel:
             # 6. Dashboard with Charts
             self._create_dashboard(writer, scenario_projections)
             
-            # 7. Assumptions Sheet
-            self._create_assumptions_sheet(writer)
+            # 7. Occupancy Heatmaps
+            self._create_occupancy_heatmaps(writer, scenario_projections['base'])
             
-        print(f"Enhanced financial model created: {filename}")
+            # 8. Stress Tests
+            write_stress_sheet(writer.book.create_sheet('Stress Tests'), self.run_stress_tests(years=years),
+                               self.reporting_currency)
+            
+            # 9. Assumptions Sheet
+            self._create_assumptions_sheet(writer)
+        
+        fingerprint = finalize_run(filename, writer.book, self.context, scenario_projections)
+        print(f"Enhanced financial model created: {filename} (fingerprint {fingerprint[:12]})")
+    
+    def create_live_excel_model(self, filename='hostel_financial_model_live.xlsx', scenario='base', years=None):
+        """Export one scenario as live formulas over an editable Assumptions block
+        
+        The formulas come from the same projection graph as the engine and
+        are recalculated and checked against the engine before the run is
+        finalized.
+        """
+        frames = self.generate_scenario_frames(years)
+        graph = build_projection_graph(self, scenario, years)
+        workbook = write_live_workbook(graph, filename)
+        verify_live_workbook(filename, graph, frames[scenario].columns)
+        
+        fingerprint = finalize_run(filename, workbook, self.context, {'projections': frames[scenario].to_dataframe()})
+        print(f"Live formula model created: {filename} (fingerprint {fingerprint[:12]})")
+        return graph
     
     def _create_executive_summary(self, writer, scenario_projections):
         """Create executive summary sheet"""
@@ -205,14 +746,15 @@ class EnhancedHostelFinancialModel:
         
         # Date
         ws['A3'] = 'Report Date:'
-        ws['B3'] = datetime.now().strftime('%B %d, %Y')
+        write_value(ws['B3'], self.context.as_of, 'date')
         
         # Summary metrics for each scenario
         row = 5
         ws[f'A{row}'] = 'Scenario'
-        ws[f'B{row}'] = 'Total Revenue (3Y)'
-        ws[f'C{row}'] = 'Total Expenses (3Y)'
-        ws[f'D{row}'] = 'Total Net Income (3Y)'
+        horizon = self.horizon_label(len(scenario_projections['base']))
+        ws[f'B{row}'] = f'Total Revenue ({horizon})'
+        ws[f'C{row}'] = f'Total Expenses ({horizon})'
+        ws[f'D{row}'] = f'Total Net Income ({horizon})'
         ws[f'E{row}'] = 'Avg Profit Margin'
         ws[f'F{row}'] = 'Break-Even Month'
         
@@ -229,31 +771,55 @@ class EnhancedHostelFinancialModel:
             kpis = self.calculate_kpis(df)
             
             ws[f'A{row}'] = self.scenarios[scenario_key]['name']
-            ws[f'B{row}'] = f"${kpis['Total_Revenue']:,.0f}"
-            ws[f'C{row}'] = f"${kpis['Total_Expenses']:,.0f}"
-            ws[f'D{row}'] = f"${kpis['Total_Net_Income']:,.0f}"
-            ws[f'E{row}'] = f"{kpis['Average_Profit_Margin']:.1%}"
+            write_value(ws[f'B{row}'], kpis['Total_Revenue'], 'currency', self.reporting_currency)
+            write_value(ws[f'C{row}'], kpis['Total_Expenses'], 'currency', self.reporting_currency)
+            write_value(ws[f'D{row}'], kpis['Total_Net_Income'], 'currency', self.reporting_currency)
+            write_value(ws[f'E{row}'], kpis['Average_Profit_Margin'], 'percent_1')
             
             # Find break-even month
-            break_even_month = df[df['Net_Income'] > 0].iloc[0]['Month_Name'] if len(df[df['Net_Income'] > 0]) > 0 else 'N/A'
-            break_even_year = df[df['Net_Income'] > 0].iloc[0]['Year'] if len(df[df['Net_Income'] > 0]) > 0 else ''
-            ws[f'F{row}'] = f"{break_even_month} {break_even_year}"
+            break_even = self.period_indexes[scenario_key].break_even('Net_Income')
+            if break_even:
+                break_even_year, break_even_month = break_even
+                write_value(ws[f'F{row}'], datetime(break_even_year, break_even_month, 1), 'month')
+            else:
+                ws[f'F{row}'] = 'N/A'
         
         # Key insights
         row += 3
         ws[f'A{row}'] = 'Key Insights'
         ws[f'A{row}'].font = Font(bold=True, size=12)
         
+        symbol = currency_symbol(self.reporting_currency)
         insights = [
-            f"Base case projects ${scenario_projections['base']['Net_Income'].sum():,.0f} net income over 3 years",
+            f"Base case projects {symbol}{scenario_projections['base']['Net_Income'].sum():,.0f} net income over {len(scenario_projections['base']) / 12:g} years",
             f"Best case scenario increases revenue by {(scenario_projections['best']['Revenue'].sum() / scenario_projections['base']['Revenue'].sum() - 1):.1%}",
-            f"Worst case still maintains positive cash flow with ${scenario_projections['worst']['Net_Income'].sum():,.0f} net income",
-            f"Average monthly revenue across scenarios: ${scenario_projections['base']['Revenue'].mean():,.0f}"
+            f"Worst case still maintains positive cash flow with {symbol}{scenario_projections['worst']['Net_Income'].sum():,.0f} net income",
+            f"Average monthly revenue across scenarios: {symbol}{scenario_projections['base']['Revenue'].mean():,.0f}"
         ]
         
         for i, insight in enumerate(insights):
             ws[f'A{row + i + 1}'] = f"• {insight}"
         
+        # DCF valuation with terminal value
+        row += len(insights) + 3
+        ws[f'A{row}'] = (f"Valuation ({self.base_assumptions['discount_rate']:.0%} discount rate, "
+                         f"{self.base_assumptions['terminal_growth_rate']:.0%} terminal growth)")
+        ws[f'A{row}'].font = Font(bold=True, size=12)
+        row += 1
+        valuation = self.valuation(len(scenario_projections['base']) / 12)
+        for col, header in enumerate(['Scenario', 'PV of Cash Flows', 'PV of Terminal Value',
+                                      'Enterprise Value', 'Terminal Share', 'NPV'], 1):
+            ws.cell(row=row, column=col, value=header).font = Font(bold=True)
+        for values in valuation.itertuples(index=False):
+            row += 1
+            ws[f'A{row}'] = values.Scenario
+            for col, (value, kind) in enumerate([
+                (values.PV_Cash_Flows, 'currency'), (values.PV_Terminal_Value, 'currency'),
+                (values.Enterprise_Value, 'currency'), (values.Terminal_Share, 'percent_1'),
+                (values.NPV, 'currency_signed')
+            ], 2):
+                write_value(ws.cell(row=row, column=col), value, kind, self.reporting_currency)
+        
         # Auto-adjust columns
         for column in ws.columns:
             max_length = 0
@@ -272,12 +838,12 @@ class EnhancedHostelFinancialModel:
         # Combine all scenarios for comparison
         comparison_data = []
         
-        for scenario_key, df in scenario_projections.items():
-            yearly_summary = df.groupby('Year').agg({
-                'Revenue': 'sum',
-                'Expenses': 'sum',
-                'Net_Income': 'sum'
-            }).reset_index()
+        for scenario_key in scenario_projections:
+            index = self.period_indexes[scenario_key]
+            years, _ = index.yearly_totals('Revenue')
+            yearly_summary = pd.DataFrame({'Year': years})
+            for column in ['Revenue', 'Expenses', 'Net_Income']:
+                yearly_summary[column] = index.yearly_totals(column)[1]
             yearly_summary['Scenario'] = self.scenarios[scenario_key]['name']
             comparison_data.append(yearly_summary)
         
@@ -331,7 +897,7 @@ class EnhancedHostelFinancialModel:
             for col, change in enumerate([-0.2, -0.1, 0, 0.1, 0.2]):
                 impact = base_net_income * (1 + change * sensitivity)
                 ws.cell(row=row, column=col+2, value=impact)
-                ws.cell(row=row, column=col+2).number_format = '"$"#,##0'
+                ws.cell(row=row, column=col+2).number_format = number_format('currency', self.reporting_currency)
             row += 1
         
         # Style the header
@@ -342,43 +908,39 @@ class EnhancedHostelFinancialModel:
                 cell.font = Font(color='FFFFFF', bold=True)
     
     def _create_cash_flow_analysis(self, writer, base_projections):
-        """Create cash flow analysis sheet"""
-        # Create cash flow projections
-        cash_flow_data = []
-        cumulative_cash = 0
-        
-        for _, row in base_projections.iterrows():
-            # Simple cash flow calculation
-            operating_cash_flow = row['Net_Income']
-            
-            # Add some working capital assumptions
-            if row['Month'] == 1:  # Beginning of year
-                working_capital_change = -5000  # Initial investment
-            else:
-                working_capital_change = 0
-            
-            net_cash_flow = operating_cash_flow + working_capital_change
-            cumulative_cash += net_cash_flow
-            
-            cash_flow_data.append({
-                'Year': row['Year'],
-                'Month': row['Month_Name'],
-                'Operating_Cash_Flow': operating_cash_flow,
-                'Working_Capital_Change': working_capital_change,
-                'Net_Cash_Flow': net_cash_flow,
-                'Cumulative_Cash': cumulative_cash
-            })
+        """Create cash flow analysis and balance sheet sheets"""
+        statements = self.build_financial_statements(base_projections)
+        debt = statements['debt']
         
-        cash_flow_df = pd.DataFrame(cash_flow_data)
+        periods = {'Year': base_projections['Year'], 'Month': base_projections['Month_Name']}
+        cash_flow_df = pd.DataFrame({
+            **periods,
+            **statements['cash_flow'],
+            'VAT_Collected': statements['vat']['collected'],
+            'VAT_Remitted': -statements['vat']['remitted'],
+            'Debt_Service': debt['debt_service'],
+            # Blank once the debt is repaid rather than an 'inf' text cell
+            'DSCR': np.where(np.isfinite(debt['dscr']), debt['dscr'], np.nan)
+        })
         cash_flow_df.to_excel(writer, sheet_name='Cash Flow Analysis', index=False)
         
-        # Format the sheet
-        ws = writer.sheets['Cash Flow Analysis']
-        for cell in ws[1]:
-            if cell.value:
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-                cell.font = Font(color='FFFFFF', bold=True)
+        balance_sheet_df = pd.DataFrame({
+            **periods,
+            **statements['balance_sheet'],
+            # Memo: tax losses available to offset future taxable income
+            'Loss_Carryforward': statements['income_statement']['Loss_Carryforward'],
+            'Balance_Check': statements['balance_check']
+        })
+        balance_sheet_df.to_excel(writer, sheet_name='Balance Sheet', index=False)
+        
+        # Format the sheets
+        for sheet_name in ['Cash Flow Analysis', 'Balance Sheet']:
+            ws = writer.sheets[sheet_name]
+            for cell in ws[1]:
+                if cell.value:
+                    cell.font = Font(bold=True)
+                    cell.fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+                    cell.font = Font(color='FFFFFF', bold=True)
     
     def _create_dashboard(self, writer, scenario_projections):
         """Create dashboard with charts"""
@@ -394,37 +956,18 @@ class EnhancedHostelFinancialModel:
         ws[f'A{row_start}'] = 'Monthly Revenue Comparison'
         ws[f'A{row_start}'].font = Font(bold=True, size=12)
         
-        # Add monthly data for chart
-        row = row_start + 2
-        ws[f'A{row}'] = 'Month'
-        col = 2
-        for scenario_key in ['worst', 'base', 'best']:
-            ws.cell(row=row, column=col, value=self.scenarios[scenario_key]['name'])
-            col += 1
-        
-        # Add first 12 months of data
-        for month_idx in range(12):
-            row += 1
-            ws[f'A{row}'] = scenario_projections['base'].iloc[month_idx]['Month_Name']
-            col = 2
-            for scenario_key in ['worst', 'base', 'best']:
-                ws.cell(row=row, column=col, value=scenario_projections[scenario_key].iloc[month_idx]['Revenue'])
-                col += 1
-        
-        # Create line chart
-        chart = LineChart()
-        chart.title = "Monthly Revenue by Scenario"
-        chart.y_axis.title = "Revenue ($)"
-        chart.x_axis.title = "Month"
-        
-        data = Reference(ws, min_col=2, min_row=row_start+2, max_col=4, max_row=row)
-        categories = Reference(ws, min_col=1, min_row=row_start+3, max_row=row)
-        chart.add_data(data, titles_from_data=True)
-        chart.set_categories(categories)
-        chart.width = 15
-        chart.height = 10
-        
-        ws.add_chart(chart, f'F{row_start}')
+        # First 12 months of each scenario's revenue, charted where it is written
+        base = scenario_projections['base']
+        months = min(12, len(base))
+        block = write_series_block(
+            ws, row_start + 2, 1, base['Month_Name'].to_numpy()[:months],
+            {self.scenarios[key]['name']: scenario_projections[key]['Revenue'].to_numpy()[:months]
+             for key in ['worst', 'base', 'best']},
+            currency=self.reporting_currency
+        )
+        row = row_start + 2 + months
+        add_chart(ws, 'line', block, f'F{row_start}', "Monthly Revenue by Scenario",
+                  f"Revenue ({self.reporting_currency})")
         
         # Add KPI cards
         kpi_start_row = row + 5
@@ -432,20 +975,76 @@ class EnhancedHostelFinancialModel:
         ws[f'A{kpi_start_row}'].font = Font(bold=True, size=12)
         
         base_kpis = self.calculate_kpis(scenario_projections['base'])
+        horizon = self.horizon_label(len(scenario_projections['base']))
         
         kpi_row = kpi_start_row + 2
         kpis_to_show = [
-            ('3-Year Revenue', f"${base_kpis['Total_Revenue']:,.0f}"),
-            ('3-Year Net Income', f"${base_kpis['Total_Net_Income']:,.0f}"),
-            ('Avg Profit Margin', f"{base_kpis['Average_Profit_Margin']:.1%}"),
-            ('Revenue per Bed', f"${base_kpis['RevPAB']:,.2f}")
+            (f'{horizon} Revenue', base_kpis['Total_Revenue'], 'currency'),
+            (f'{horizon} Net Income', base_kpis['Total_Net_Income'], 'currency'),
+            ('Avg Profit Margin', base_kpis['Average_Profit_Margin'], 'percent_1'),
+            ('Avg Occupancy', base_kpis['Average_Occupancy'], 'percent_1'),
+            ('ADR', base_kpis['Average_Daily_Rate'], 'currency_cents'),
+            ('RevPAB', base_kpis['RevPAB'], 'currency_cents'),
+            ('GOPPAB', base_kpis['GOPPAB'], 'currency_cents')
         ]
         
-        for i, (label, value) in enumerate(kpis_to_show):
+        for i, (label, value, kind) in enumerate(kpis_to_show):
             ws.cell(row=kpi_row, column=1 + i*2, value=label)
             ws.cell(row=kpi_row, column=1 + i*2).font = Font(bold=True)
-            ws.cell(row=kpi_row + 1, column=1 + i*2, value=value)
+            write_value(ws.cell(row=kpi_row + 1, column=1 + i*2), value, kind, self.reporting_currency)
             ws.cell(row=kpi_row + 1, column=1 + i*2).font = Font(size=14)
+        
+        # Year-one room revenue by room type and booking channel
+        channel_start_row = kpi_row + 4
+        ws[f'A{channel_start_row}'] = 'Year 1 Room Revenue by Channel (Base Case)'
+        ws[f'A{channel_start_row}'].font = Font(bold=True, size=12)
+        
+        breakdown = self.calculate_channel_breakdown('base', months=slice(0, 12))
+        gross = breakdown.pivot(index='Room_Type', columns='Channel', values='Gross_Revenue')
+        gross = gross.reindex(index=list(self.room_types), columns=list(self.base_assumptions['channels']))
+        commission = breakdown.groupby('Room_Type', sort=False)['Commission'].sum()
+        
+        header_row = channel_start_row + 2
+        headers = ['Room Type'] + [channel.upper() if len(channel) <= 3 else channel.title() for channel in gross.columns] + ['Commission', 'Net Revenue']
+        for col, header in enumerate(headers, 1):
+            ws.cell(row=header_row, column=col, value=header).font = Font(bold=True)
+        
+        row = header_row
+        for room_type, values in gross.iterrows():
+            row += 1
+            ws.cell(row=row, column=1, value=room_type.replace('_', ' ').title())
+            for col, value in enumerate(values, 2):
+                write_value(ws.cell(row=row, column=col), float(value), 'currency', self.reporting_currency)
+            write_value(ws.cell(row=row, column=len(headers) - 1), float(commission[room_type]), 'currency', self.reporting_currency)
+            write_value(ws.cell(row=row, column=len(headers)), float(values.sum() - commission[room_type]), 'currency', self.reporting_currency)
+        
+        channel_block = table_block(ws, headers, header_row, row - header_row, 'Room Type',
+                                    headers[1:1 + len(gross.columns)])
+        add_chart(ws, 'stacked_column', channel_block, f'H{channel_start_row}', "Room Revenue by Channel - Year 1",
+                  f"Revenue ({self.reporting_currency})")
+    
+    def _create_occupancy_heatmaps(self, writer, base_projections):
+        """Create month x room type and day x room type occupancy heatmaps"""
+        ws = writer.book.create_sheet('Occupancy Heatmap')
+        
+        ws['A1'] = 'Occupancy by Month and Room Type (Base Case)'
+        ws['A1'].font = Font(size=14, bold=True)
+        
+        arrays = self.scenario_bed_nights['base']
+        occupancy = np.divide(arrays['sold_bed_nights'], arrays['available_bed_nights'],
+                              out=np.zeros_like(arrays['sold_bed_nights']), where=arrays['available_bed_nights'] > 0)
+        month_labels = [f"{name[:3]} {year}" for name, year in
+                        zip(base_projections['Month_Name'], base_projections['Year'])]
+        room_types = [name.replace('_', ' ').title() for name in self.room_types]
+        write_heatmap(ws, occupancy.T, room_types, month_labels, top=3)
+        
+        # Day-level grid for revenue managers
+        row = len(room_types) + 7
+        ws[f'A{row}'] = 'Daily Occupancy by Room Type - Year 1 (Base Case)'
+        ws[f'A{row}'].font = Font(size=14, bold=True)
+        dates, daily = self.daily_occupancy_array('base', 12)
+        write_heatmap(ws, daily, dates.astype(str), room_types, top=row + 2, corner='Date')
+        ws.column_dimensions['A'].width = 16
     
     def _create_assumptions_sheet(self, writer):
         """Create detailed assumptions sheet"""
@@ -471,7 +1070,7 @@ class EnhancedHostelFinancialModel:
         for room_type, details in self.room_types.items():
             ws[f'A{row}'] = room_type.replace('_', ' ').title()
             ws[f'B{row}'] = details['beds']
-            ws[f'C{row}'] = f"${details['rate']}"
+            write_value(ws[f'C{row}'], details['rate'], 'currency', self.currency)
             row += 1
         
         # Occupancy assumptions
@@ -482,19 +1081,35 @@ class EnhancedHostelFinancialModel:
         
         for season, rate in self.base_assumptions['occupancy_rate'].items():
             ws[f'A{row}'] = season.replace('_', ' ').title()
-            ws[f'B{row}'] = f"{rate:.0%}"
+            write_value(ws[f'B{row}'], rate, 'percent')
             row += 1
         
-        # Operating expenses
-        row += 2
-        ws[f'A{row}'] = 'Monthly Operating Expenses'
-        ws[f'A{row}'].font = Font(bold=True, size=12)
-        row += 1
-        
-        for expense, amount in self.base_assumptions['operating_expenses'].items():
-            ws[f'A{row}'] = expense.replace('_', ' ').title()
-            ws[f'B{row}'] = f"${amount:,.0f}"
+        # Operating cost drivers
+        drivers = self.base_assumptions['cost_drivers']
+        staffing = drivers['staffing']
+        for title, items in [
+            ('Variable Costs per Occupied Bed-Night', [
+                (name.replace('_', ' ').title(), rate, 'currency_cents') for name, rate in drivers['variable'].items()
+            ]),
+            ('Staffing', [
+                ('Staff per Block', staffing['staff_per_block'], 'count'),
+                ('Occupied Beds per Block', staffing['beds_per_block'], 'count'),
+                ('Minimum Staff', staffing['minimum_staff'], 'count'),
+                ('Monthly Cost per Staff', staffing['monthly_cost_per_staff'], 'currency')
+            ]),
+            ('Fixed Monthly Overheads', [
+                (name.replace('_', ' ').title(), amount, 'currency') for name, amount in drivers['fixed'].items()
+            ])
+        ]:
+            row += 2
+            ws[f'A{row}'] = title
+            ws[f'A{row}'].font = Font(bold=True, size=12)
             row += 1
+            
+            for label, value, kind in items:
+                ws[f'A{row}'] = label
+                write_value(ws[f'B{row}'], value, kind, self.currency)
+                row += 1
         
         # Growth assumptions
         row += 2
@@ -503,10 +1118,43 @@ class EnhancedHostelFinancialModel:
         row += 1
         
         ws[f'A{row}'] = 'Annual Revenue Growth Rate'
-        ws[f'B{row}'] = f"{self.base_assumptions['growth_rate']:.1%}"
+        write_value(ws[f'B{row}'], self.base_assumptions['growth_rate'], 'percent_1')
         row += 1
         ws[f'A{row}'] = 'Annual Inflation Rate'
-        ws[f'B{row}'] = f"{self.base_assumptions['inflation_rate']:.1%}"
+        write_value(ws[f'B{row}'], self.base_assumptions['inflation_rate'], 'percent_1')
+        
+        # Booking channels
+        row += 3
+        ws[f'A{row}'] = 'Booking Channels'
+        ws[f'A{row}'].font = Font(bold=True, size=12)
+        row += 1
+        
+        ws[f'A{row}'] = 'Channel'
+        ws[f'B{row}'] = 'Share of Bookings'
+        ws[f'C{row}'] = 'Commission Rate'
+        for cell in [ws[f'A{row}'], ws[f'B{row}'], ws[f'C{row}']]:
+            cell.font = Font(bold=True)
+        
+        row += 1
+        for channel, details in self.base_assumptions['channels'].items():
+            ws[f'A{row}'] = channel.upper() if len(channel) <= 3 else channel.title()
+            write_value(ws[f'B{row}'], details['share'], 'percent')
+            write_value(ws[f'C{row}'], details['commission'], 'percent')
+            row += 1
+        
+        # Currencies
+        row += 2
+        ws[f'A{row}'] = 'Currency'
+        ws[f'A{row}'].font = Font(bold=True, size=12)
+        row += 1
+        for label, value in [('Functional Currency (rates and costs)', self.currency),
+                             ('Reporting Currency (results and financing)', self.reporting_currency)]:
+            ws[f'A{row}'] = label
+            ws[f'B{row}'] = value
+            row += 1
+        ws[f'A{row}'] = f'{self.reporting_currency} per {self.currency} (month 1)'
+        ws[f'B{row}'] = float(self.reporting_fx_rates(1)[0])
+        ws[f'B{row}'].number_format = '0.0000'
         
         # Auto-adjust columns
         for column in ws.columns:
@@ -533,13 +1181,14 @@ class EnhancedHostelFinancialModel:
                 cell.font = Font(color='FFFFFF', bold=True)
         
         # Format number columns
+        currency_format = number_format('currency', self.reporting_currency)
         for row in ws.iter_rows(min_row=2):
             if row[4].value is not None:  # Revenue column
-                row[4].number_format = '"$"#,##0'
+                row[4].number_format = currency_format
             if row[5].value is not None:  # Expenses column
-                row[5].number_format = '"$"#,##0'
+                row[5].number_format = currency_format
             if row[6].value is not None:  # Net Income column
-                row[6].number_format = '"$"#,##0'
+                row[6].number_format = currency_format
             if row[7].value is not None:  # Profit Margin column
                 row[7].number_format = '0.0%'
         
@@ -22,10 +22,17 @@ from openpyxl.worksheet.table import Table, TableStyleInfo
 import warnings
 warnings.filterwarnings('ignore')
 
+from hostel_cell_values import number_format, write_value
+from hostel_kpi_engine import month_calendar
+from hostel_period_index import PeriodIndex
+from hostel_three_statement import build_three_statements, check_statements
+from hostel_run_context import RunContext, finalize_run
+
 
 class ProfessionalHostelFinancialModel:
-    def __init__(self):
+    def __init__(self, context=None):
         """Initialize the professional financial model generator"""
+        self.context = context or RunContext.from_environment()
         self.wb = Workbook()
         self.hostel_name = "Hostel Diary"
         self.start_date = datetime(2025, 1, 1)
@@ -48,10 +55,28 @@ class ProfessionalHostelFinancialModel:
             'inflation_rate': 0.025,
             'revenue_growth': 0.03
         }
+        
+        # Annual operating expenses
+        self.annual_expenses = {
+            'Staff Costs': 180000,
+            'Utilities': 36000,
+            'Marketing': 45000,
+            'Maintenance': 22500,
+            'Supplies': 18000,
+            'Insurance': 12000,
+            'Other Operating': 21500
+        }
+        
+        # Investment
+        self.initial_investment = 750000
+        self.launch_capex = 50000
+        
+        # Currency of every rate, expense and money cell
+        self.currency = 'USD'
     
     def create_comprehensive_model(self):
         """Create the main model"""
-        filename = f"{self.hostel_name.lower().replace(' ', '_')}_professional_model_{datetime.now().strftime('%Y%m%d')}.xlsx"
+        filename = f"{self.hostel_name.lower().replace(' ', '_')}_professional_model_{self.context.as_of.strftime('%Y%m%d')}.xlsx"
         
         # Remove default sheet
         self.wb.remove(self.wb.active)
@@ -65,6 +90,7 @@ class ProfessionalHostelFinancialModel:
         
         # Save workbook
         self.wb.save(filename)
+        self.fingerprint = finalize_run(filename, self.wb, self.context)
         return filename
     
     def _create_executive_summary(self):
@@ -79,30 +105,30 @@ class ProfessionalHostelFinancialModel:
         ws['A3'].font = Font(size=12, bold=True)
         
         metrics = [
-            ['Total Investment Required', '$750,000'],
-            ['5-Year NPV', '$420,000'],
-            ['IRR', '32%'],
-            ['Payback Period', '2.8 years'],
-            ['Year 1 Revenue', '$450,000'],
-            ['Year 1 Occupancy', '72%']
+            ['Total Investment Required', 750000, 'currency'],
+            ['5-Year NPV', 420000, 'currency'],
+            ['IRR', 0.32, 'percent'],
+            ['Payback Period', 2.8, 'years'],
+            ['Year 1 Revenue', 450000, 'currency'],
+            ['Year 1 Occupancy', 0.72, 'percent']
         ]
         
         row = 5
-        for metric, value in metrics:
+        for metric, value, kind in metrics:
             ws[f'A{row}'] = metric
-            ws[f'C{row}'] = value
+            write_value(ws[f'C{row}'], value, kind, self.currency)
             ws[f'C{row}'].font = Font(bold=True)
             row += 1
     
-    def _create_revenue_projections(self):
-        """Create revenue projections"""
+    def _create_revenue_projections(self, months=12):
+        """Create monthly revenue projections for any horizon from the start date"""
         ws = self.wb.create_sheet('Revenue Model')
         
         ws['A1'] = 'REVENUE PROJECTIONS'
         ws['A1'].font = Font(size=16, bold=True)
         
-        # Monthly projections for Year 1
-        ws['A3'] = 'Year 1 Monthly Revenue'
+        # Monthly projections, year one by default
+        ws['A3'] = 'Year 1 Monthly Revenue' if months == 12 else f'{months}-Month Revenue'
         ws['A3'].font = Font(size=12, bold=True)
         
         # Headers
@@ -115,29 +141,31 @@ class ProfessionalHostelFinancialModel:
                 start_color='366092', end_color='366092', fill_type='solid')
             ws.cell(row=row, column=col).font = Font(color='FFFFFF', bold=True)
         
+        # Simple seasonality at an average $25 rate, growing annually
+        calendar = month_calendar(self.start_date, months)
+        growth = (1 + self.financial_params['revenue_growth']) ** (np.arange(months) // 12)
+        occupancy = 0.70 + 0.10 * np.sin((calendar['month'] - 6) * np.pi / 6)
+        room_revenue = self.total_beds * 30 * occupancy * 25 * growth
+        other_revenue = room_revenue * 0.15
+        month_total = room_revenue + other_revenue
+        label_format = '%B' if months <= 12 else '%b %Y'
+        money = number_format('currency', self.currency)
+        
         # Monthly data
         row = 6
-        total_revenue = 0
-        
-        for month in range(1, 13):
-            # Simple seasonality
-            occupancy = 0.70 + 0.10 * np.sin((month - 6) * np.pi / 6)
-            room_revenue = self.total_beds * 30 * occupancy * 25  # Avg rate $25
-            other_revenue = room_revenue * 0.15
-            month_total = room_revenue + other_revenue
-            total_revenue += month_total
-            
-            ws.cell(row=row, column=1, value=datetime(2025, month, 1).strftime('%B'))
-            ws.cell(row=row, column=2, value=occupancy).number_format = '0%'
-            ws.cell(row=row, column=3, value=room_revenue).number_format = '"$"#,##0'
-            ws.cell(row=row, column=4, value=other_revenue).number_format = '"$"#,##0'
-            ws.cell(row=row, column=5, value=month_total).number_format = '"$"#,##0'
+        for index in range(months):
+            label = datetime(int(calendar['year'][index]), int(calendar['month'][index]), 1).strftime(label_format)
+            ws.cell(row=row, column=1, value=label)
+            ws.cell(row=row, column=2, value=float(occupancy[index])).number_format = number_format('percent')
+            ws.cell(row=row, column=3, value=float(room_revenue[index])).number_format = money
+            ws.cell(row=row, column=4, value=float(other_revenue[index])).number_format = money
+            ws.cell(row=row, column=5, value=float(month_total[index])).number_format = money
             row += 1
         
         # Total row
         ws.cell(row=row, column=1, value='TOTAL')
         ws.cell(row=row, column=1).font = Font(bold=True)
-        ws.cell(row=row, column=5, value=total_revenue).number_format = '"$"#,##0'
+        ws.cell(row=row, column=5, value=float(month_total.sum())).number_format = money
         ws.cell(row=row, column=5).font = Font(bold=True)
     
     def _create_expense_projections(self):
@@ -148,15 +176,7 @@ class ProfessionalHostelFinancialModel:
         ws['A1'].font = Font(size=16, bold=True)
         
         # Annual expenses
-        expenses = [
-            ['Staff Costs', 180000],
-            ['Utilities', 36000],
-            ['Marketing', 45000],
-            ['Maintenance', 22500],
-            ['Supplies', 18000],
-            ['Insurance', 12000],
-            ['Other Operating', 21500]
-        ]
+        expenses = list(self.annual_expenses.items())
         
         ws['A3'] = 'Annual Operating Expenses'
         ws['A3'].font = Font(size=12, bold=True)
@@ -172,22 +192,48 @@ class ProfessionalHostelFinancialModel:
                 start_color='366092', end_color='366092', fill_type='solid')
             ws.cell(row=5, column=col).font = Font(color='FFFFFF', bold=True)
         
+        money = number_format('currency', self.currency)
         row = 6
         total_expenses = 0
         
         for category, amount in expenses:
             ws.cell(row=row, column=1, value=category)
-            ws.cell(row=row, column=2, value=amount).number_format = '"$"#,##0'
-            ws.cell(row=row, column=3, value=amount/450000).number_format = '0.0%'
+            ws.cell(row=row, column=2, value=amount).number_format = money
+            ws.cell(row=row, column=3, value=amount/450000).number_format = number_format('percent_1')
             total_expenses += amount
             row += 1
         
         # Total
         ws.cell(row=row, column=1, value='TOTAL')
         ws.cell(row=row, column=1).font = Font(bold=True)
-        ws.cell(row=row, column=2, value=total_expenses).number_format = '"$"#,##0'
+        ws.cell(row=row, column=2, value=total_expenses).number_format = money
         ws.cell(row=row, column=2).font = Font(bold=True)
     
+    def _year_one_statements(self):
+        """Build year 1 monthly statements from the revenue and expense models"""
+        calendar = month_calendar(self.start_date, 12)
+        
+        # Same seasonality and pricing as the revenue model
+        occupancy = 0.70 + 0.10 * np.sin((calendar['month'] - 6) * np.pi / 6)
+        room_revenue = self.total_beds * 30 * occupancy * 25
+        revenue = room_revenue * 1.15
+        expenses = np.full(12, sum(self.annual_expenses.values()) / 12)
+        
+        # Initial investment plus launch capex in month one, equity funded
+        capex = np.zeros(12)
+        capex[0] = self.initial_investment + self.launch_capex
+        
+        statements = build_three_statements(
+            revenue, expenses,
+            capex=capex,
+            equity_contributions=capex,
+            tax_rate=self.financial_params['tax_rate'],
+            depreciation_months=120,
+            days_in_month=calendar['days']
+        )
+        check_statements(statements)
+        return calendar, statements
+    
     def _create_cash_flow(self):
         """Create cash flow analysis"""
         ws = self.wb.create_sheet('Cash Flow')
@@ -209,21 +255,30 @@ class ProfessionalHostelFinancialModel:
                 start_color='366092', end_color='366092', fill_type='solid')
             ws.cell(row=row, column=col).font = Font(color='FFFFFF', bold=True)
         
-        # Quarterly data
+        # Quarterly roll-up of the monthly cash flow statement
+        calendar, statements = self._year_one_statements()
+        cash_flow = statements['cash_flow']
+        index = PeriodIndex(int(calendar['year'][0]), int(calendar['month'][0]), {
+            'Operating': cash_flow['Operating_Cash_Flow'],
+            'Investment': cash_flow['Capex']
+        })
+        
+        money = number_format('currency', self.currency)
         row = 6
-        cumulative = -750000  # Initial investment
+        cumulative = 0
+        year = self.start_date.year
         
         for quarter in range(1, 5):
-            operating_cf = 112500 - 83750  # Simplified
-            investment_cf = -50000 if quarter == 1 else 0
+            operating_cf = index.quarter_total('Operating', year, quarter)
+            investment_cf = index.quarter_total('Investment', year, quarter)
             net_cf = operating_cf + investment_cf
             cumulative += net_cf
             
             ws.cell(row=row, column=1, value=f'Q{quarter}')
-            ws.cell(row=row, column=2, value=operating_cf).number_format = '"$"#,##0'
-            ws.cell(row=row, column=3, value=investment_cf).number_format = '"$"#,##0'
-            ws.cell(row=row, column=4, value=net_cf).number_format = '"$"#,##0'
-            ws.cell(row=row, column=5, value=cumulative).number_format = '"$"#,##0'
+            ws.cell(row=row, column=2, value=operating_cf).number_format = money
+            ws.cell(row=row, column=3, value=investment_cf).number_format = money
+            ws.cell(row=row, column=4, value=net_cf).number_format = money
+            ws.cell(row=row, column=5, value=cumulative).number_format = money
             
             if cumulative < 0:
                 ws.cell(row=row, column=5).font = Font(color='FF0000')
@@ -240,23 +295,26 @@ class ProfessionalHostelFinancialModel:
         ws['A1'].font = Font(size=16, bold=True)
         
         # Scenario parameters
+        headers = ['Scenario', 'Occupancy', 'ADR', '5-Year NPV', 'IRR']
+        kinds = ['percent', 'currency', 'currency', 'percent']
         scenarios = [
-            ['Scenario', 'Occupancy', 'ADR', '5-Year NPV', 'IRR'],
-            ['Best Case', '85%', '$32', '$650,000', '45%'],
-            ['Base Case', '75%', '$28', '$420,000', '32%'],
-            ['Worst Case', '60%', '$24', '$150,000', '18%']
+            ['Best Case', 0.85, 32, 650000, 0.45],
+            ['Base Case', 0.75, 28, 420000, 0.32],
+            ['Worst Case', 0.60, 24, 150000, 0.18]
         ]
         
         row = 5
-        for scenario_row in scenarios:
-            for col, value in enumerate(scenario_row, 1):
-                ws.cell(row=row, column=col, value=value)
-                if row == 5:
-                    ws.cell(row=row, column=col).font = Font(bold=True)
-                    ws.cell(row=row, column=col).fill = PatternFill(
-                        start_color='366092', end_color='366092', fill_type='solid')
-                    ws.cell(row=row, column=col).font = Font(color='FFFFFF', bold=True)
+        for col, header in enumerate(headers, 1):
+            ws.cell(row=row, column=col, value=header)
+            ws.cell(row=row, column=col).fill = PatternFill(
+                start_color='366092', end_color='366092', fill_type='solid')
+            ws.cell(row=row, column=col).font = Font(color='FFFFFF', bold=True)
+        
+        for name, *values in scenarios:
             row += 1
+            ws.cell(row=row, column=1, value=name)
+            for col, (value, kind) in enumerate(zip(values, kinds), 2):
+                write_value(ws.cell(row=row, column=col), value, kind, self.currency)
 
 
 # Run the model generator
@@ -264,4 +322,4 @@ if __name__ == "__main__":
     print("Creating Professional Hostel Financial Model...")
     model = ProfessionalHostelFinancialModel()
     filename = model.create_comprehensive_model()
-    print(f"✅ Model created successfully: {filename}")
+    print(f"✅ Model created successfully: {filename} (fingerprint {model.fingerprint[:12]})")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Hostel Financing Engine
+Monthly debt schedules for amortizing, interest-only, balloon and revolver
+tranches computed as arrays, with debt service and DSCR
+"""
+
+import numpy as np
+
+
+SCHEDULE_FIELDS = ['opening_balance', 'draws', 'interest', 'principal', 'fees',
+                   'debt_service', 'closing_balance']
+
+
+def default_loan_tranches(initial_investment, loan_share=0.5, annual_rate=0.06, term_months=60):
+    """Senior loan from the assumption sheet: 6% over 5 years on half the investment"""
+    return [{
+        'name': 'Senior Loan',
+        'type': 'amortizing',
+        'principal': initial_investment * loan_share,
+        'annual_rate': annual_rate,
+        'term_months': term_months,
+        'start_month': 0
+    }]
+
+
+def _annuity_balance(principal, monthly_rate, payments_made, amortization_months):
+    """Balance after `payments_made` level payments of an annuity"""
+    growth = (1 + monthly_rate) ** payments_made
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payment_factor = monthly_rate / (1 - (1 + monthly_rate) ** -amortization_months)
+        balance = np.where(
+            monthly_rate > 0,
+            principal * growth - principal * payment_factor * (growth - 1) / monthly_rate,
+            principal * (1 - payments_made / amortization_months)
+        )
+    return np.maximum(balance, 0)
+
+
+def term_tranche_schedule(tranche, months):
+    """Schedule for an amortizing, interest-only or balloon tranche
+
+    Balloon tranches amortize over `amortization_months` (default four times
+    the term) and repay the remaining balance at maturity. `principal` and
+    `annual_rate` may be arrays (scenarios, simulation paths); the schedule
+    then has those leading axes and a month axis.
+    """
+    t = np.arange(months)
+    start = tranche.get('start_month', 0)
+    term = tranche['term_months']
+    kind = tranche.get('type', 'amortizing')
+    principal = np.asarray(tranche['principal'], dtype=float)[..., None]
+    monthly_rate = np.asarray(tranche['annual_rate'], dtype=float)[..., None] / 12
+
+    payments_made = np.clip(t - start + 1, 0, term)
+    active = (t >= start) & (t < start + term)
+
+    if kind == 'amortizing':
+        closing = _annuity_balance(principal, monthly_rate, payments_made, term)
+    elif kind == 'balloon':
+        amortization = tranche.get('amortization_months', term * 4)
+        closing = np.where(payments_made < term,
+                           _annuity_balance(principal, monthly_rate, payments_made, amortization), 0)
+    elif kind == 'interest_only':
+        closing = np.where(payments_made < term, principal, 0)
+    else:
+        raise ValueError(f"Unknown term tranche type: {kind}")
+
+    closing = np.where(t >= start, closing, 0)
+    previous = np.concatenate([np.zeros_like(closing[..., :1]), closing[..., :-1]], axis=-1)
+    opening = np.where(t == start, principal, previous)
+
+    interest = opening * monthly_rate * active
+    principal_paid = (opening - closing) * active
+    draws = np.where(t == start, principal, 0)
+    fees = np.zeros_like(interest)
+
+    return {
+        'opening_balance': opening,
+        'draws': draws,
+        'interest': interest,
+        'principal': principal_paid,
+        'fees': fees,
+        'debt_service': interest + principal_paid,
+        'closing_balance': closing
+    }
+
+
+def revolver_schedule(tranche, cash_flow):
+    """Schedule for a revolving facility funding shortfalls in `cash_flow`
+
+    The balance follows the reflected cumulative cash need (draw on
+    shortfalls, repay from surpluses), so no month loop is needed. Interest
+    is charged on the opening balance and is not itself re-borrowed. Needs
+    above the limit are reported as `unfunded` rather than drawn.
+    """
+    cash_flow = np.asarray(cash_flow, dtype=float)
+    limit = np.asarray(tranche['limit'], dtype=float)[..., None]
+    monthly_rate = np.asarray(tranche['annual_rate'], dtype=float)[..., None] / 12
+    fee_rate = np.asarray(tranche.get('commitment_fee', 0.0), dtype=float)[..., None] / 12
+
+    cumulative_need = np.cumsum(-cash_flow, axis=-1)
+    floor = np.minimum(np.minimum.accumulate(cumulative_need, axis=-1), 0)
+    required = cumulative_need - floor
+
+    closing = np.minimum(required, limit)
+    opening = np.concatenate([np.zeros_like(closing[..., :1]), closing[..., :-1]], axis=-1)
+    change = closing - opening
+
+    interest = opening * monthly_rate
+    fees = (limit - opening) * fee_rate
+    repayments = np.maximum(-change, 0)
+
+    return {
+        'opening_balance': opening,
+        'draws': np.maximum(change, 0),
+        'interest': interest,
+        'principal': repayments,
+        'fees': fees,
+        'debt_service': interest + repayments + fees,
+        'closing_balance': closing,
+        'unfunded': required - closing
+    }
+
+
+def build_debt_schedule(tranches, months, cash_flow=None):
+    """Combine all tranches into per-tranche and total monthly schedules
+
+    Term tranches are scheduled first; a revolver then funds whatever
+    `cash_flow` (pre-financing cash flow) leaves uncovered after term debt
+    service.
+    """
+    schedules = {}
+    totals = {field: 0.0 for field in SCHEDULE_FIELDS}
+
+    for tranche in tranches:
+        if tranche.get('type') == 'revolver':
+            continue
+        schedule = term_tranche_schedule(tranche, months)
+        schedules[tranche['name']] = schedule
+        for field in SCHEDULE_FIELDS:
+            totals[field] = totals[field] + schedule[field]
+
+    for tranche in tranches:
+        if tranche.get('type') != 'revolver':
+            continue
+        base_cash = np.zeros(months) if cash_flow is None else cash_flow
+        schedule = revolver_schedule(tranche, base_cash - totals['debt_service'])
+        schedules[tranche['name']] = schedule
+        for field in SCHEDULE_FIELDS:
+            totals[field] = totals[field] + schedule[field]
+        totals['unfunded'] = totals.get('unfunded', 0.0) + schedule['unfunded']
+
+    # Broadcast scalar totals left by an empty tranche list
+    totals = {field: np.broadcast_to(value, np.shape(value) or (months,)) for field, value in totals.items()}
+    return {'tranches': schedules, 'total': totals}
+
+
+def debt_service_coverage(cash_available, debt_service):
+    """DSCR per period; infinite where no debt service is due"""
+    cash_available = np.asarray(cash_available, dtype=float)
+    debt_service = np.asarray(debt_service, dtype=float)
+    out = np.full(np.broadcast(cash_available, debt_service).shape, np.inf)
+    return np.divide(cash_available, debt_service, out=out, where=debt_service > 0)
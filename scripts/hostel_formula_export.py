@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Hostel Live Formula Export
+One computation graph for the monthly scenario projection, evaluated with
+NumPy for the engine and rendered as Excel formulas over an Assumptions block
+so analysts can what-if in Excel without rerunning Python. A small formula
+evaluator re-computes the written workbook to verify it against the engine.
+"""
+
+import argparse
+import math
+import re
+
+import numpy as np
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+from hostel_cell_values import number_format
+from hostel_kpi_engine import month_calendar
+
+
+INPUT_FILL = PatternFill(start_color='FFFF99', end_color='FFFF99', fill_type='solid')
+HEADER_FILL = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+LIVE_COLUMNS = ['Revenue', 'Commission', 'Expenses', 'Net_Income', 'Profit_Margin',
+                'Available_Bed_Nights', 'Sold_Bed_Nights', 'Variable_Costs', 'Staff',
+                'Staffing_Costs', 'Fixed_Costs']
+
+
+class Expr:
+    """Node of the projection graph; operators build larger expressions"""
+
+    def __add__(self, other):
+        return BinOp('+', self, _wrap(other))
+
+    def __radd__(self, other):
+        return BinOp('+', _wrap(other), self)
+
+    def __sub__(self, other):
+        return BinOp('-', self, _wrap(other))
+
+    def __rsub__(self, other):
+        return BinOp('-', _wrap(other), self)
+
+    def __mul__(self, other):
+        return BinOp('*', self, _wrap(other))
+
+    def __rmul__(self, other):
+        return BinOp('*', _wrap(other), self)
+
+    def __truediv__(self, other):
+        return BinOp('/', self, _wrap(other))
+
+    def __pow__(self, other):
+        return BinOp('^', self, _wrap(other))
+
+
+class Const(Expr):
+    def __init__(self, value):
+        self.value = value
+
+
+class Input(Expr):
+    """Assumption cell"""
+
+    def __init__(self, name):
+        self.name = name
+
+
+class Column(Expr):
+    """Same-row value of another projection column"""
+
+    def __init__(self, name):
+        self.name = name
+
+
+class Call(Expr):
+    """Excel function with a NumPy equivalent (MIN, MAX, SUM, CEILING)"""
+
+    def __init__(self, function, *args):
+        self.function = function
+        self.args = [_wrap(arg) for arg in args]
+
+
+class Choose(Expr):
+    """Pick one expression per row by the value of a key column"""
+
+    def __init__(self, key, options):
+        self.key = key
+        self.options = {name: _wrap(option) for name, option in options.items()}
+
+
+class BinOp(Expr):
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+
+def _wrap(value):
+    return value if isinstance(value, Expr) else Const(value)
+
+
+def _sum(terms):
+    terms = list(terms)
+    return Call('SUM', *terms) if len(terms) > 1 else terms[0]
+
+
+_PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2, '^': 3}
+_NUMPY_OPS = {'+': np.add, '-': np.subtract, '*': np.multiply, '/': np.divide, '^': np.power}
+_NUMPY_CALLS = {
+    'MIN': lambda args: np.minimum.reduce(np.broadcast_arrays(*args)),
+    'MAX': lambda args: np.maximum.reduce(np.broadcast_arrays(*args)),
+    'SUM': lambda args: sum(args),
+    'CEILING': lambda args: np.ceil(args[0] / args[1]) * args[1]
+}
+
+
+def evaluate(expr, inputs, columns):
+    """Evaluate an expression for every row at once"""
+    if isinstance(expr, Const):
+        return expr.value
+    if isinstance(expr, Input):
+        return inputs[expr.name]
+    if isinstance(expr, Column):
+        return columns[expr.name]
+    if isinstance(expr, Call):
+        return _NUMPY_CALLS[expr.function]([evaluate(arg, inputs, columns) for arg in expr.args])
+    if isinstance(expr, Choose):
+        keys = columns[expr.key]
+        return np.select([keys == name for name in expr.options],
+                         [np.broadcast_to(evaluate(option, inputs, columns), keys.shape)
+                          for option in expr.options.values()])
+    return _NUMPY_OPS[expr.op](evaluate(expr.left, inputs, columns), evaluate(expr.right, inputs, columns))
+
+
+def to_formula(expr, row, input_cells, column_letters, row_keys):
+    """Render an expression as Excel formula text for one sheet row"""
+    if isinstance(expr, Const):
+        return repr(expr.value) if expr.value >= 0 else f'({expr.value!r})'
+    if isinstance(expr, Input):
+        return input_cells[expr.name]
+    if isinstance(expr, Column):
+        return f'{column_letters[expr.name]}{row}'
+    if isinstance(expr, Call):
+        args = ','.join(to_formula(arg, row, input_cells, column_letters, row_keys) for arg in expr.args)
+        return f'{expr.function}({args})'
+    if isinstance(expr, Choose):
+        option = expr.options[row_keys[expr.key]]
+        return to_formula(option, row, input_cells, column_letters, row_keys)
+    left = to_formula(expr.left, row, input_cells, column_letters, row_keys)
+    right = to_formula(expr.right, row, input_cells, column_letters, row_keys)
+    # Parenthesize only where Excel precedence would regroup the operands
+    precedence = _PRECEDENCE[expr.op]
+    if isinstance(expr.left, BinOp) and (_PRECEDENCE[expr.left.op] < precedence or expr.op == '^'):
+        left = f'({left})'
+    if isinstance(expr.right, BinOp) and (_PRECEDENCE[expr.right.op] < precedence
+                                          or (_PRECEDENCE[expr.right.op] == precedence and expr.op in '-/^')):
+        right = f'({right})'
+    return f'{left}{expr.op}{right}'
+
+
+def build_projection_graph(model, scenario='base', years=None):
+    """Monthly projection graph of an EnhancedHostelFinancialModel scenario
+
+    Mirrors build_scenario_bed_nights / generate_scenario_frames for the
+    season-table occupancy and fixed bed counts; fitted seasonality profiles
+    and capacity plans are not formula inputs and are rejected.
+    """
+    if model.seasonality_profile is not None:
+        raise ValueError("Live formulas support the season-table occupancy only")
+    if model.capacity_plan:
+        raise ValueError("Live formulas support a fixed bed count only")
+    if model.currency != model.reporting_currency:
+        raise ValueError("Live formulas support reporting in the functional currency only")
+
+    assumptions = model.base_assumptions
+    scenario_data = model.scenarios[scenario]
+    months = model.projection_months(years)
+    calendar = month_calendar(model.projection_start, months)
+
+    # Inputs: (name, label, value, number format kind)
+    inputs = []
+    for room_type, details in model.room_types.items():
+        label = room_type.replace('_', ' ').title()
+        inputs.append((f'beds_{room_type}', f'{label} - Beds', details['beds'], 'count'))
+        inputs.append((f'rate_{room_type}', f'{label} - Nightly Rate', details['rate'], 'currency_cents'))
+    for season, rate in assumptions['occupancy_rate'].items():
+        inputs.append((f'occupancy_{season}', f"Occupancy - {season.replace('_', ' ').title()}", rate, 'percent_1'))
+    inputs += [
+        ('occupancy_adjustment', 'Scenario Occupancy Adjustment', scenario_data['occupancy_adjustment'], 'percent_1'),
+        ('rate_adjustment', 'Scenario Rate Adjustment', scenario_data['rate_adjustment'], 'percent_1'),
+        ('growth_rate', 'Annual Rate Growth', scenario_data['growth_rate'], 'percent_1'),
+        ('expense_adjustment', 'Scenario Expense Adjustment', scenario_data['expense_adjustment'], 'percent_1'),
+        ('inflation_rate', 'Annual Expense Inflation', assumptions['inflation_rate'], 'percent_1')
+    ]
+    drivers = assumptions['cost_drivers']
+    for driver, rate in drivers['variable'].items():
+        inputs.append((f'variable_{driver}', f"{driver.replace('_', ' ').title()} per Occupied Bed-Night", rate, 'currency_cents'))
+    inputs += [
+        ('staff_per_block', 'Staff per Block', drivers['staffing']['staff_per_block'], 'count'),
+        ('beds_per_block', 'Occupied Beds per Block', drivers['staffing']['beds_per_block'], 'count'),
+        ('minimum_staff', 'Minimum Staff', drivers['staffing']['minimum_staff'], 'count'),
+        ('cost_per_staff', 'Monthly Cost per Staff', drivers['staffing']['monthly_cost_per_staff'], 'currency')
+    ]
+    for overhead, amount in drivers['fixed'].items():
+        inputs.append((f'fixed_{overhead}', f"Monthly {overhead.replace('_', ' ').title()}", amount, 'currency'))
+    for channel, details in assumptions['channels'].items():
+        label = channel.upper() if len(channel) <= 3 else channel.title()
+        inputs.append((f'share_{channel}', f'{label} Booking Share', details['share'], 'percent_1'))
+        inputs.append((f'commission_{channel}', f'{label} Commission Rate', details['commission'], 'percent_1'))
+
+    seasons = np.array([f"{assumptions['seasonality'][month]}_season" for month in calendar['month']])
+    data = {
+        'Year': calendar['year'],
+        'Month': calendar['month'],
+        'Days': calendar['days'],
+        'Year_Offset': np.arange(months) // 12,
+        'Season': seasons
+    }
+
+    room_types = list(model.room_types)
+    beds = [Input(f'beds_{room_type}') for room_type in room_types]
+    days = Column('Days')
+    year_offset = Column('Year_Offset')
+    base_occupancy = Choose('Season', {season: Input(f'occupancy_{season}') for season in assumptions['occupancy_rate']})
+    rate_factor = (1 + Input('rate_adjustment')) * (1 + Input('growth_rate')) ** year_offset
+    cost_factor = (1 + Input('expense_adjustment')) * (1 + Input('inflation_rate')) ** year_offset
+    commission_rate = _sum(Input(f'share_{channel}') * Input(f'commission_{channel}')
+                           for channel in assumptions['channels'])
+
+    formulas = [('Occupancy', Call('MIN', 1.0, Call('MAX', 0.1, base_occupancy + Input('occupancy_adjustment'))))]
+    for room_type, bed_count in zip(room_types, beds):
+        formulas.append((f'Revenue_{room_type}',
+                         days * bed_count * Column('Occupancy') * Input(f'rate_{room_type}') * rate_factor))
+    formulas += [
+        ('Revenue', _sum(Column(f'Revenue_{room_type}') for room_type in room_types)),
+        ('Available_Bed_Nights', days * _sum(beds)),
+        ('Sold_Bed_Nights', Column('Available_Bed_Nights') * Column('Occupancy')),
+        ('Commission', Column('Revenue') * commission_rate),
+        ('Variable_Costs', Column('Sold_Bed_Nights') * _sum(Input(f'variable_{driver}') for driver in drivers['variable'])
+         * cost_factor),
+        # Step-fixed staffing; the tolerance matches staffing_levels
+        ('Staff', Call('MAX', Input('minimum_staff'),
+                       Call('CEILING', Column('Sold_Bed_Nights') / days / Input('beds_per_block') - 1e-9, 1)
+                       * Input('staff_per_block'))),
+        ('Staffing_Costs', Column('Staff') * Input('cost_per_staff') * cost_factor),
+        ('Fixed_Costs', _sum(Input(f'fixed_{overhead}') for overhead in drivers['fixed']) * cost_factor),
+        ('Expenses', Column('Variable_Costs') + Column('Staffing_Costs') + Column('Fixed_Costs')),
+        ('Net_Income', Column('Revenue') - Column('Commission') - Column('Expenses')),
+        ('Profit_Margin', Column('Net_Income') / Column('Revenue'))
+    ]
+
+    return {
+        'title': f"{model.hostel_name} - {scenario_data['name']} (live formulas)",
+        'currency': model.currency,
+        'inputs': inputs,
+        'data': data,
+        'formulas': formulas
+    }
+
+
+def evaluate_graph(graph):
+    """Evaluate every formula column of a graph with NumPy"""
+    inputs = {name: value for name, _, value, _ in graph['inputs']}
+    columns = dict(graph['data'])
+    for name, expr in graph['formulas']:
+        columns[name] = np.broadcast_to(evaluate(expr, inputs, columns), len(columns['Year'])).astype(float)
+    return columns
+
+
+def write_live_workbook(graph, filename):
+    """Write the Assumptions block and formula-driven Projections sheet"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'Assumptions'
+    ws['A1'] = graph['title']
+    ws['A1'].font = Font(size=14, bold=True)
+    ws['A2'] = 'Yellow cells are inputs; every projection cell recalculates from them'
+
+    currency = graph.get('currency', 'USD')
+    input_cells = {}
+    for row, (name, label, value, kind) in enumerate(graph['inputs'], 4):
+        ws.cell(row=row, column=1, value=label)
+        cell = ws.cell(row=row, column=2, value=value)
+        cell.fill = INPUT_FILL
+        cell.number_format = number_format(kind, currency)
+        input_cells[name] = f'Assumptions!$B${row}'
+    ws.column_dimensions['A'].width = 36
+
+    ws = wb.create_sheet('Projections')
+    headers = list(graph['data']) + [name for name, _ in graph['formulas']]
+    column_letters = {header: get_column_letter(index) for index, header in enumerate(headers, 1)}
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=1, column=col, value=header)
+        cell.fill = HEADER_FILL
+        cell.font = Font(color='FFFFFF', bold=True)
+
+    months = len(graph['data']['Year'])
+    kinds = {'Occupancy': 'percent_1', 'Profit_Margin': 'percent_1', 'Staff': 'count',
+             'Available_Bed_Nights': 'count', 'Sold_Bed_Nights': 'count'}
+    for index in range(months):
+        row = index + 2
+        row_keys = {name: values[index].item() for name, values in graph['data'].items()}
+        for name, value in row_keys.items():
+            ws[f'{column_letters[name]}{row}'] = value
+        for name, expr in graph['formulas']:
+            cell = ws[f'{column_letters[name]}{row}']
+            cell.value = '=' + to_formula(expr, row, input_cells, column_letters, row_keys)
+            cell.number_format = number_format(kinds.get(name, 'currency'), currency)
+
+    # Totals recalculate from the projection cells
+    total_row = months + 3
+    ws.cell(row=total_row, column=1, value='TOTAL').font = Font(bold=True)
+    for name in ['Revenue', 'Commission', 'Expenses', 'Net_Income', 'Sold_Bed_Nights']:
+        letter = column_letters[name]
+        cell = ws[f'{letter}{total_row}']
+        cell.value = f'=SUM({letter}2:{letter}{months + 1})'
+        cell.font = Font(bold=True)
+        cell.number_format = number_format(kinds.get(name, 'currency'), currency)
+    ws.freeze_panes = 'F2'
+
+    wb.save(filename)
+    return wb
+
+
+_TOKEN = re.compile(r"\s*(?:(?P<number>\d+\.?\d*(?:[eE][-+]?\d+)?)"
+                    r"|(?P<ref>(?:[A-Za-z_][\w ]*!)?\$?[A-Z]{1,3}\$?\d+(?::\$?[A-Z]{1,3}\$?\d+)?)"
+                    r"|(?P<name>[A-Z]+)(?=\()"
+                    r"|(?P<op>[-+*/^(),]))")
+
+
+def _tokenize(formula):
+    tokens, position = [], 0
+    while position < len(formula):
+        match = _TOKEN.match(formula, position)
+        if not match:
+            raise ValueError(f"Unsupported formula syntax at {formula[position:]!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class FormulaEvaluator:
+    """Evaluates the arithmetic/MIN/MAX/SUM/CEILING formulas this module writes"""
+
+    def __init__(self, workbook):
+        self.workbook = workbook
+        self.cache = {}
+
+    def cell_value(self, sheet, coordinate):
+        key = (sheet, coordinate.replace('$', ''))
+        if key not in self.cache:
+            value = self.workbook[sheet][key[1]].value
+            if isinstance(value, str) and value.startswith('='):
+                value = self.evaluate(value[1:], sheet)
+            self.cache[key] = value
+        return self.cache[key]
+
+    def evaluate(self, formula, sheet):
+        self.tokens = _tokenize(formula)
+        self.position = 0
+        self.sheet = sheet
+        value = self._expression()
+        if self.position != len(self.tokens):
+            raise ValueError(f"Unexpected trailing tokens in {formula!r}")
+        return value
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def _take(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _expression(self):
+        value = self._term()
+        while self._peek()[1] in ('+', '-'):
+            op = self._take()[1]
+            right = self._term()
+            value = value + right if op == '+' else value - right
+        return value
+
+    def _term(self):
+        value = self._power()
+        while self._peek()[1] in ('*', '/'):
+            op = self._take()[1]
+            right = self._power()
+            value = value * right if op == '*' else value / right
+        return value
+
+    def _power(self):
+        value = self._unary()
+        while self._peek()[1] == '^':
+            self._take()
+            value = value ** self._unary()
+        return value
+
+    def _unary(self):
+        if self._peek()[1] == '-':
+            self._take()
+            return -self._unary()
+        return self._primary()
+
+    def _primary(self):
+        kind, text = self._take()
+        if kind == 'number':
+            return float(text)
+        if kind == 'ref':
+            return self._reference(text)
+        if kind == 'name':
+            self._take()  # (
+            args = [self._expression()]
+            while self._peek()[1] == ',':
+                self._take()
+                args.append(self._expression())
+            self._take()  # )
+            values = [value for arg in args for value in (arg if isinstance(arg, list) else [arg])]
+            if text == 'CEILING':
+                return math.ceil(values[0] / values[1]) * values[1]
+            return {'MIN': min, 'MAX': max, 'SUM': sum}[text](values)
+        if text == '(':
+            value = self._expression()
+            self._take()  # )
+            return value
+        raise ValueError(f"Unexpected token {text!r}")
+
+    def _reference(self, text):
+        sheet, _, address = text.rpartition('!')
+        sheet = sheet or self.sheet
+        if ':' not in address:
+            return self._resolve(sheet, address)
+        start, end = address.replace('$', '').split(':')
+        rows = self.workbook[sheet][start:end]
+        return [self._resolve(sheet, cell.coordinate) for row in rows for cell in row]
+
+    def _resolve(self, sheet, coordinate):
+        # Nested evaluation reuses the parser, so save this formula's state
+        saved = (self.tokens, self.position, self.sheet)
+        value = self.cell_value(sheet, coordinate)
+        self.tokens, self.position, self.sheet = saved
+        return value
+
+
+def evaluate_workbook(filename, columns=LIVE_COLUMNS):
+    """Recalculate the Projections sheet formulas of a live workbook"""
+    workbook = load_workbook(filename)
+    ws = workbook['Projections']
+    evaluator = FormulaEvaluator(workbook)
+    headers = {cell.value: cell.column_letter for cell in ws[1]}
+    months = sum(1 for value in ws['A'][1:] if isinstance(value.value, int))
+    return {
+        name: np.array([evaluator.cell_value('Projections', f'{headers[name]}{row}')
+                        for row in range(2, months + 2)], dtype=float)
+        for name in columns
+    }
+
+
+def verify_live_workbook(filename, graph, engine_columns=None, tolerance=0.01):
+    """Raise ValueError if the workbook's formulas disagree with the engine
+
+    Formula results are compared with the NumPy evaluation of the same graph
+    and, when given, with the engine's projection columns.
+    """
+    recalculated = evaluate_workbook(filename)
+    references = [('graph', evaluate_graph(graph))]
+    if engine_columns is not None:
+        references.append(('engine', engine_columns))
+
+    for source, expected in references:
+        for name, values in recalculated.items():
+            if name not in expected:
+                continue
+            difference = np.abs(values - np.asarray(expected[name], dtype=float))
+            if difference.max(initial=0) > tolerance:
+                raise ValueError(f"{name} formulas differ from the {source} by up to {difference.max():,.4f}")
+    return True
+
+
+if __name__ == "__main__":
+    from hostel_financial_model_enhanced import EnhancedHostelFinancialModel
+
+    parser = argparse.ArgumentParser(description='Export a scenario as a live-formula workbook')
+    parser.add_argument('--scenario', default='base', help='best, base or worst')
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--output', default='hostel_diary_live_model.xlsx')
+    args = parser.parse_args()
+
+    model = EnhancedHostelFinancialModel(hostel_name="Hostel Diary")
+    model.create_live_excel_model(args.output, scenario=args.scenario, years=args.years)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Hostel FX Conversion
+Deterministic and simulated FX rate paths between a site's functional
+currency and the reporting currency, applied as vectorized (..., month)
+multipliers in the projection and consolidation steps
+"""
+
+import argparse
+
+import numpy as np
+
+from hostel_cell_values import currency_symbol
+
+
+# USD per unit of each currency at the as-of date
+DEFAULT_SPOT_RATES = {'USD': 1.0, 'EUR': 1.08, 'THB': 0.028, 'ZAR': 0.054}
+
+# Annual volatility of each currency against USD
+DEFAULT_FX_VOLATILITY = {'USD': 0.0, 'EUR': 0.08, 'THB': 0.07, 'ZAR': 0.15}
+
+
+def spot_rate(currency, reporting='USD', spot_rates=DEFAULT_SPOT_RATES):
+    """Reporting currency per unit of `currency` at the as-of date"""
+    return spot_rates[currency] / spot_rates[reporting]
+
+
+def fx_path(currency, months, reporting='USD', annual_drift=0.0, spot_rates=DEFAULT_SPOT_RATES):
+    """(month,) deterministic reporting-per-functional rates drifting from spot
+
+    `annual_drift` is the functional currency's annual appreciation against
+    the reporting currency (negative for depreciation).
+    """
+    return spot_rate(currency, reporting, spot_rates) * (1 + annual_drift) ** (np.arange(months) / 12)
+
+
+def simulate_fx_paths(currencies, months, paths, rng, reporting='USD', volatility=DEFAULT_FX_VOLATILITY,
+                      correlation=None, spot_rates=DEFAULT_SPOT_RATES):
+    """(path, month, currency) simulated reporting-per-functional rates
+
+    Each currency follows a driftless geometric Brownian motion against USD
+    from spot, with monthly shocks correlated by `correlation` (identity by
+    default); rates are then crossed into the reporting currency. The first
+    month is the spot rate.
+    """
+    quoted = list(dict.fromkeys(list(currencies) + [reporting]))
+    sigma = np.array([volatility.get(currency, 0.0) for currency in quoted]) / np.sqrt(12)
+    if correlation is None:
+        correlation = np.eye(len(quoted))
+    else:
+        # Correlation is given for `currencies`; the reporting currency is independent
+        padded = np.eye(len(quoted))
+        padded[:len(currencies), :len(currencies)] = correlation
+        correlation = padded
+
+    shocks = rng.standard_normal((paths, months - 1, len(quoted))) @ np.linalg.cholesky(correlation).T
+    log_returns = shocks * sigma - 0.5 * sigma ** 2
+    log_level = np.concatenate([np.zeros((paths, 1, len(quoted))), np.cumsum(log_returns, axis=1)], axis=1)
+    usd_rates = np.array([spot_rates[currency] for currency in quoted]) * np.exp(log_level)
+
+    reporting_rates = usd_rates[..., quoted.index(reporting), None]
+    return usd_rates[..., [quoted.index(currency) for currency in currencies]] / reporting_rates
+
+
+def convert(amounts, rates):
+    """Convert (..., month) functional amounts with broadcastable (..., month) rates"""
+    return np.asarray(amounts, dtype=float) * rates
+
+
+def convert_columns(columns, rates, names):
+    """Copy of a column mapping with the named money columns converted"""
+    return {name: convert(values, rates) if name in names else values for name, values in columns.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Show simulated FX rate percentiles against a reporting currency')
+    parser.add_argument('currency', nargs='+', choices=sorted(DEFAULT_SPOT_RATES))
+    parser.add_argument('--reporting', default='USD', choices=sorted(DEFAULT_SPOT_RATES))
+    parser.add_argument('--months', type=int, default=36)
+    parser.add_argument('--paths', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rates = simulate_fx_paths(args.currency, args.months, args.paths, np.random.default_rng(args.seed), args.reporting)
+    symbol = currency_symbol(args.reporting)
+    for index, currency in enumerate(args.currency):
+        final = rates[:, -1, index]
+        low, median, high = np.percentile(final, [5, 50, 95])
+        print(f"{currency}: spot {symbol}{spot_rate(currency, args.reporting):.4f}, "
+              f"month {args.months} P5 {symbol}{low:.4f} / P50 {symbol}{median:.4f} / P95 {symbol}{high:.4f}")
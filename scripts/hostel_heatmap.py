@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Hostel Occupancy Heatmaps
+Writes occupancy grids (month x room type, day x room type) computed by the
+engine into worksheets, coloured by a single native conditional-formatting
+colour scale instead of per-cell fills
+"""
+
+import numpy as np
+from openpyxl.formatting.rule import ColorScaleRule
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+
+# Fixed occupancy bounds so colours compare across runs, sheets and hostels
+HEATMAP_SCALE = {
+    'start': (0.55, 'F8696B'),   # Red
+    'mid': (0.70, 'FFEB84'),     # Yellow
+    'end': (0.85, '63BE7B')      # Green
+}
+
+
+def occupancy_color_scale(scale=HEATMAP_SCALE):
+    """Three-colour scale rule over fixed occupancy bounds"""
+    (start_value, start_color), (mid_value, mid_color), (end_value, end_color) = (
+        scale['start'], scale['mid'], scale['end']
+    )
+    return ColorScaleRule(
+        start_type='num', start_value=start_value, start_color=start_color,
+        mid_type='num', mid_value=mid_value, mid_color=mid_color,
+        end_type='num', end_value=end_value, end_color=end_color
+    )
+
+
+def daily_from_monthly(monthly, start_date, days_in_month):
+    """Expand (month, ...) values to (day, ...) with the matching dates"""
+    days_in_month = np.asarray(days_in_month, dtype=int)
+    first = np.datetime64(f'{start_date.year:04d}-{start_date.month:02d}-01', 'D')
+    dates = first + np.arange(days_in_month.sum())
+    return dates, np.repeat(np.asarray(monthly), days_in_month, axis=0)
+
+
+def write_heatmap(ws, values, row_labels, column_labels, top=1, left=1,
+                  corner='Room Type', number_format='0%'):
+    """Write a labelled (row, column) grid and colour it with one colour scale
+
+    Formatting is a single conditional-format rule over the data range, so
+    its cost does not grow with the grid. Returns the data range reference.
+    """
+    values = np.asarray(values, dtype=float)
+    ws.cell(row=top, column=left, value=corner).font = Font(bold=True)
+    for col, label in enumerate(column_labels, left + 1):
+        ws.cell(row=top, column=col, value=label).font = Font(bold=True)
+
+    for row, (label, row_values) in enumerate(zip(row_labels, values), top + 1):
+        ws.cell(row=row, column=left, value=label).font = Font(bold=True)
+        for col, value in enumerate(row_values.tolist(), left + 1):
+            ws.cell(row=row, column=col, value=value).number_format = number_format
+
+    data_range = (f'{get_column_letter(left + 1)}{top + 1}:'
+                  f'{get_column_letter(left + values.shape[1])}{top + values.shape[0]}')
+    ws.conditional_formatting.add(data_range, occupancy_color_scale())
+    return data_range
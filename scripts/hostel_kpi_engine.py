@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Hostel KPI Engine
+Tracks available bed-nights, sold bed-nights and room revenue per room type as
+arrays, splits room revenue across booking channels, drives operating costs
+from volume and reduces them to occupancy, ADR, RevPAB, GOPPAB and margin
+"""
+
+import numpy as np
+
+
+# Booking channels: 40% direct-booking target, 15% OTA commission
+DEFAULT_CHANNELS = {
+    'direct': {'share': 0.40, 'commission': 0.0},
+    'ota': {'share': 0.60, 'commission': 0.15}
+}
+
+# Operating cost drivers: variable costs per occupied bed-night, step-fixed
+# staffing at 3 staff per 20 occupied beds, and fixed monthly overheads
+DEFAULT_COST_DRIVERS = {
+    'variable': {'supplies': 1.30, 'laundry': 0.50, 'utilities': 0.50},
+    'staffing': {'staff_per_block': 3, 'beds_per_block': 20, 'minimum_staff': 3, 'monthly_cost_per_staff': 1350},
+    'fixed': {'utilities': 600, 'maintenance': 800, 'marketing': 1000, 'insurance': 600, 'other': 400}
+}
+
+
+def month_calendar(start_date, months):
+    """Return year, month and days-in-month arrays for a monthly horizon"""
+    first = np.datetime64(f'{start_date.year:04d}-{start_date.month:02d}', 'M')
+    periods = first + np.arange(months)
+    days = ((periods + 1).astype('datetime64[D]') - periods.astype('datetime64[D]')).astype(int)
+    years = periods.astype('datetime64[Y]').astype(int) + 1970
+    month_numbers = periods.astype(int) % 12 + 1
+    return {
+        'year': years,
+        'month': month_numbers,
+        'days': days
+    }
+
+
+def room_type_arrays(room_types):
+    """Return room type names, bed counts and nightly rates as aligned arrays"""
+    names = list(room_types)
+    beds = np.array([room_types[name]['beds'] for name in names], dtype=float)
+    rates = np.array([room_types[name]['rate'] for name in names], dtype=float)
+    return names, beds, rates
+
+
+def build_bed_night_arrays(beds, rates, occupancy, days_in_month, rate_factor=1.0):
+    """Build (..., month, room_type) bed-night and room revenue arrays
+
+    `beds` is a (room_type,) bed count or a (..., month, room_type) capacity
+    schedule. `occupancy` and `rate_factor` must broadcast to
+    (..., month, room_type); pass per-month values with a trailing axis of
+    length 1.
+    """
+    days = np.asarray(days_in_month, dtype=float)[:, None]
+    available = days * np.asarray(beds, dtype=float)
+    sold = available * np.asarray(occupancy, dtype=float)
+    room_revenue = sold * np.asarray(rates, dtype=float) * rate_factor
+    available = np.broadcast_to(available, sold.shape)
+
+    return {
+        'available_bed_nights': available,
+        'sold_bed_nights': sold,
+        'room_revenue': room_revenue
+    }
+
+
+def channel_arrays(channels):
+    """Return channel names, booking shares and commission rates as aligned arrays"""
+    names = list(channels)
+    shares = np.array([channels[name]['share'] for name in names], dtype=float)
+    commissions = np.array([channels[name]['commission'] for name in names], dtype=float)
+    return names, shares, commissions
+
+
+def build_channel_arrays(room_revenue, shares, commissions):
+    """Split (..., month, room_type) room revenue into (..., month, room_type, channel)
+
+    `shares` and `commissions` broadcast against the channel axis, so a
+    per-room-type or per-month channel mix is a (room_type, channel) or
+    (month, room_type, channel) array. Shares should sum to 1 over channels.
+    """
+    channel_revenue = np.asarray(room_revenue, dtype=float)[..., None] * np.asarray(shares, dtype=float)
+    commission = channel_revenue * np.asarray(commissions, dtype=float)
+    return {
+        'channel_revenue': channel_revenue,
+        'commission': commission
+    }
+
+
+def staffing_levels(occupied_beds, staffing):
+    """Step-fixed headcount for an average number of occupied beds per night
+
+    A full block of staff is added for every started block of occupied
+    beds, never dropping below the minimum crew.
+    """
+    # Tolerance keeps exact multiples of the block size from stepping up
+    blocks = np.ceil(np.asarray(occupied_beds, dtype=float) / staffing['beds_per_block'] - 1e-9)
+    return np.maximum(staffing['minimum_staff'], blocks * staffing['staff_per_block'])
+
+
+def build_cost_arrays(sold_bed_nights, days_in_month, drivers, cost_factor=1.0, wage_factor=None):
+    """Build driver-based (..., month) operating costs from sold bed-nights
+
+    `sold_bed_nights` is a (..., month, room_type) array; `cost_factor`
+    (inflation, scenario adjustment) and `wage_factor` (defaults to
+    `cost_factor`) broadcast to (..., month). Booking commissions are a
+    share of revenue and come from build_channel_arrays.
+    """
+    occupied = np.asarray(sold_bed_nights, dtype=float).sum(axis=-1)
+    cost_factor = np.broadcast_to(np.asarray(cost_factor, dtype=float), occupied.shape)
+    wage_factor = cost_factor if wage_factor is None else np.broadcast_to(np.asarray(wage_factor, dtype=float), occupied.shape)
+
+    variable_rates = np.array(list(drivers['variable'].values()), dtype=float)
+    variable_costs = occupied[..., None] * variable_rates * cost_factor[..., None]
+
+    staffing = drivers['staffing']
+    staff = staffing_levels(occupied / np.asarray(days_in_month, dtype=float), staffing)
+    staffing_costs = staff * staffing['monthly_cost_per_staff'] * wage_factor
+    fixed_costs = sum(drivers['fixed'].values()) * cost_factor
+
+    return {
+        'variable_costs': variable_costs,
+        'staff': staff,
+        'staffing_costs': staffing_costs,
+        'fixed_costs': fixed_costs,
+        'operating_expenses': variable_costs.sum(axis=-1) + staffing_costs + fixed_costs
+    }
+
+
+def _safe_divide(numerator, denominator):
+    """Element-wise division returning 0 where the denominator is 0"""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    return np.divide(numerator, denominator, out=out, where=denominator != 0)
+
+
+def summarize_kpis(bed_nights, expenses=None, total_revenue=None, months=None, room_types=None):
+    """Reduce bed-night arrays to KPIs for a slice of months and room types
+
+    Leading axes (scenario, hostel, ...) are preserved, so one call returns
+    the KPIs of every scenario or site at once. `expenses` and
+    `total_revenue` are (..., month) arrays; room revenue is used as total
+    revenue when no ancillary revenue is supplied. GOPPAB and margin are
+    property-level and ignore the room type slice.
+    """
+    months = slice(None) if months is None else months
+    room_types = slice(None) if room_types is None else room_types
+
+    available = bed_nights['available_bed_nights'][..., months, room_types].sum(axis=(-2, -1))
+    sold = bed_nights['sold_bed_nights'][..., months, room_types].sum(axis=(-2, -1))
+    room_revenue = bed_nights['room_revenue'][..., months, room_types].sum(axis=(-2, -1))
+
+    if total_revenue is None:
+        revenue = bed_nights['room_revenue'][..., months, :].sum(axis=(-2, -1))
+    else:
+        revenue = np.asarray(total_revenue, dtype=float)[..., months].sum(axis=-1)
+
+    kpis = {
+        'Available_Bed_Nights': available,
+        'Sold_Bed_Nights': sold,
+        'Room_Revenue': room_revenue,
+        'Occupancy': _safe_divide(sold, available),
+        'ADR': _safe_divide(room_revenue, sold),
+        'RevPAB': _safe_divide(room_revenue, available)
+    }
+
+    if expenses is not None:
+        property_available = bed_nights['available_bed_nights'][..., months, :].sum(axis=(-2, -1))
+        gross_operating_profit = revenue - np.asarray(expenses, dtype=float)[..., months].sum(axis=-1)
+        kpis['GOPPAB'] = _safe_divide(gross_operating_profit, property_available)
+        kpis['Margin'] = _safe_divide(gross_operating_profit, revenue)
+
+    return kpis
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Hostel Period Index
+Prefix-sum index over monthly projection arrays for constant-time period
+roll-ups (month, quarter, fiscal year, trailing 12 months, date ranges) and
+break-even lookups
+"""
+
+import numpy as np
+
+
+class PeriodIndex:
+    """Cumulative index over contiguous monthly projection columns"""
+
+    def __init__(self, start_year, start_month, columns):
+        """Build prefix sums for each (..., month) column array"""
+        self.start_ordinal = start_year * 12 + start_month - 1
+        self.columns = {name: np.asarray(values, dtype=float) for name, values in columns.items()}
+        self.months = next(iter(self.columns.values())).shape[-1]
+
+        # Leading zero so any [start, end) total is cum[end] - cum[start]
+        self.prefix = {}
+        self.first_positive = {}
+        for name, values in self.columns.items():
+            prefix = np.zeros(values.shape[:-1] + (self.months + 1,))
+            np.cumsum(values, axis=-1, out=prefix[..., 1:])
+            self.prefix[name] = prefix
+
+            # First month with a positive value, -1 when there is none
+            positive = values > 0
+            self.first_positive[name] = np.where(positive.any(axis=-1), positive.argmax(axis=-1), -1)
+
+    @classmethod
+    def from_frame(cls, df, columns=('Revenue', 'Expenses', 'Net_Income')):
+        """Build an index from a projection DataFrame with Year and Month columns"""
+        return cls(
+            int(df['Year'].iloc[0]),
+            int(df['Month'].iloc[0]),
+            {name: df[name].to_numpy() for name in columns}
+        )
+
+    def position(self, year, month):
+        """Return the horizon position of a calendar month"""
+        return year * 12 + month - 1 - self.start_ordinal
+
+    def label(self, position):
+        """Return the (year, month) of a horizon position"""
+        ordinal = self.start_ordinal + int(position)
+        return ordinal // 12, ordinal % 12 + 1
+
+    def total(self, column, start, end):
+        """Sum a column over positions [start, end), clipped to the horizon"""
+        start = min(max(start, 0), self.months)
+        end = min(max(end, start), self.months)
+        prefix = self.prefix[column]
+        return prefix[..., end] - prefix[..., start]
+
+    def month_total(self, column, year, month):
+        """Total for a single calendar month"""
+        start = self.position(year, month)
+        return self.total(column, start, start + 1)
+
+    def quarter_total(self, column, year, quarter):
+        """Total for a calendar quarter (1-4)"""
+        start = self.position(year, 3 * (quarter - 1) + 1)
+        return self.total(column, start, start + 3)
+
+    def fiscal_year_total(self, column, year, fiscal_start_month=1):
+        """Total for the fiscal year beginning in `fiscal_start_month` of `year`"""
+        start = self.position(year, fiscal_start_month)
+        return self.total(column, start, start + 12)
+
+    def trailing_total(self, column, year, month, months=12):
+        """Total for the trailing window ending with the given month"""
+        end = self.position(year, month) + 1
+        return self.total(column, end - months, end)
+
+    def date_range_total(self, column, start_date, end_date):
+        """Total for all months from start_date through end_date inclusive"""
+        start = self.position(start_date.year, start_date.month)
+        end = self.position(end_date.year, end_date.month) + 1
+        return self.total(column, start, end)
+
+    def yearly_totals(self, column, fiscal_start_month=1):
+        """Return (years, totals) for every fiscal year touching the horizon"""
+        first_year, first_month = self.label(0)
+        last_year, _ = self.label(self.months - 1)
+        if first_month < fiscal_start_month:
+            first_year -= 1
+        years = np.arange(first_year, last_year + 1)
+
+        # Year boundaries as horizon positions, clipped so partial years still sum
+        boundaries = np.clip(years * 12 + fiscal_start_month - 1 - self.start_ordinal, 0, self.months)
+        boundaries = np.append(boundaries, self.months)
+        prefix = self.prefix[column]
+        totals = prefix[..., boundaries[1:]] - prefix[..., boundaries[:-1]]
+
+        keep = boundaries[1:] > boundaries[:-1]
+        return years[keep], totals[..., keep]
+
+    def month_of_year_means(self, column):
+        """Average of each calendar month (January first) across the horizon"""
+        month_of_year = (self.start_ordinal + np.arange(self.months)) % 12
+        one_hot = (month_of_year[:, None] == np.arange(12)).astype(float)
+        counts = one_hot.sum(axis=0)
+        sums = self.columns[column] @ one_hot
+        return np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+
+    def break_even(self, column='Net_Income'):
+        """Return (year, month) of the first positive month, or None"""
+        position = int(self.first_positive[column])
+        return self.label(position) if position >= 0 else None
+
+    def payback_position(self, column, investment):
+        """First position where the cumulative total reaches `investment`, or -1"""
+        reached = self.prefix[column][..., 1:] >= investment
+        return np.where(reached.any(axis=-1), reached.argmax(axis=-1), -1)
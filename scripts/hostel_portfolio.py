@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Hostel Portfolio Reporting
+Computes every site of a portfolio once, renders one workbook per site in a
+process pool, and builds the consolidated group workbook from the stacked
+site arrays in the reporting currency
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import repeat
+
+import numpy as np
+from openpyxl import Workbook
+from openpyxl.styles import Font, PatternFill
+
+from hostel_cell_values import number_format
+from hostel_charts import add_chart, table_block
+from hostel_financial_model_enhanced import EnhancedHostelFinancialModel
+from hostel_financing import default_loan_tranches
+from hostel_fx import DEFAULT_SPOT_RATES, spot_rate
+from hostel_run_context import RunContext, finalize_run
+from hostel_three_statement import check_statements
+
+
+# Projection columns that add up across sites (in the reporting currency)
+ADDITIVE_COLUMNS = ['Revenue', 'Commission', 'Net_Revenue', 'Expenses', 'Variable_Costs', 'Staffing_Costs',
+                    'Fixed_Costs', 'Net_Income', 'Available_Bed_Nights', 'Sold_Bed_Nights', 'Staff']
+
+COLUMN_KINDS = {'Profit_Margin': 'percent_1', 'Available_Bed_Nights': 'count', 'Sold_Bed_Nights': 'count',
+                'Staff': 'count', 'Beds': 'count', 'Terminal_Share': 'percent_1', 'Share_of_Revenue': 'percent_1',
+                'Year': None, 'Month': None}
+
+# Series charted on the summary sheets, bound to the base-case projection sheet
+TREND_COLUMNS = ['Revenue', 'Expenses', 'Net_Income']
+
+HEADER_FILL = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+
+
+def build_site_model(site, context=None, reporting_currency='USD', months=36):
+    """Enhanced model for one portfolio site
+
+    `site` has a `name` and optionally `currency`, `price_level` (functional
+    currency units per model dollar, applied to rates and costs),
+    `bed_scale`, `rate_scale`, `room_types`, `initial_investment` and
+    `start` (ISO date of the first projection month).
+    """
+    model = EnhancedHostelFinancialModel(hostel_name=site['name'], context=context)
+    price_level = site.get('price_level', 1.0)
+    bed_scale = site.get('bed_scale', 1.0)
+    rate_scale = site.get('rate_scale', 1.0)
+    model.room_types = site.get('room_types') or {
+        room_type: {'beds': int(round(details['beds'] * bed_scale)),
+                    'rate': details['rate'] * price_level * rate_scale}
+        for room_type, details in model.room_types.items()
+    }
+    model.total_beds = sum(details['beds'] for details in model.room_types.values())
+
+    drivers = model.base_assumptions['cost_drivers']
+    for group in ('variable', 'fixed'):
+        drivers[group] = {name: amount * price_level for name, amount in drivers[group].items()}
+    drivers['staffing']['monthly_cost_per_staff'] *= price_level
+
+    if 'initial_investment' in site:
+        model.initial_investment = site['initial_investment']
+        model.financing_tranches = default_loan_tranches(model.initial_investment)
+    model.set_currency(site.get('currency', 'USD'), reporting_currency)
+    start = site.get('start')
+    model.set_horizon(months, datetime.fromisoformat(start) if start else None)
+    return model
+
+
+def compute_site(model):
+    """Every array a site workbook and the consolidation need, computed once
+
+    The result is plain data (arrays, DataFrames, dicts) so it pickles
+    cheaply to rendering workers.
+    """
+    projections = model.generate_scenario_projections()
+    base = projections['base']
+    statements = model.build_financial_statements(base)
+    return {
+        'name': model.hostel_name,
+        'currency': model.currency,
+        'reporting_currency': model.reporting_currency,
+        'beds': model.total_beds,
+        'scenarios': {key: scenario['name'] for key, scenario in model.scenarios.items()},
+        'periods': {'Year': base['Year'].to_numpy(), 'Month': base['Month'].to_numpy(),
+                    'Month_Name': base['Month_Name'].astype(str).to_numpy()},
+        'projections': projections,
+        'kpis': {key: model.calculate_kpis(df) for key, df in projections.items()},
+        'statements': {part: statements[part] for part in ('income_statement', 'cash_flow', 'balance_sheet')},
+        'valuation': model.valuation()
+    }
+
+
+def _write_table(ws, columns, top, currency, left=1):
+    """Write {header: values} as a styled table; returns the row after the table"""
+    headers = list(columns)
+    for col, header in enumerate(headers, left):
+        cell = ws.cell(row=top, column=col, value=header)
+        cell.fill = HEADER_FILL
+        cell.font = Font(color='FFFFFF', bold=True)
+
+    formats = [COLUMN_KINDS.get(header, 'currency') for header in headers]
+    length = len(next(iter(columns.values())))
+    for index in range(length):
+        row = top + 1 + index
+        for col, (header, kind) in enumerate(zip(headers, formats), left):
+            value = columns[header][index]
+            value = value.item() if hasattr(value, 'item') else value
+            cell = ws.cell(row=row, column=col, value=value)
+            if kind is not None and not isinstance(value, str):
+                cell.number_format = number_format(kind, currency)
+    return top + length + 2
+
+
+def _summary_sheet(ws, title, payload_rows, valuation, currency):
+    """Scenario KPI and valuation tables"""
+    ws['A1'] = title
+    ws['A1'].font = Font(size=14, bold=True)
+    row = _write_table(ws, payload_rows, 3, currency)
+    ws.cell(row=row, column=1, value='Valuation').font = Font(size=12, bold=True)
+    _write_table(ws, valuation, row + 1, currency)
+    ws.column_dimensions['A'].width = 24
+
+
+def render_site_workbook(payload, path, context):
+    """Write one site's workbook from its precomputed arrays (runs in a worker)"""
+    currency = payload['reporting_currency']
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'Summary'
+
+    names = list(payload['scenarios'].values())
+    kpis = [payload['kpis'][key] for key in payload['scenarios']]
+    _summary_sheet(ws, f"{payload['name']} ({payload['currency']}, reported in {currency})", {
+        'Scenario': names,
+        'Revenue': [kpi['Total_Revenue'] for kpi in kpis],
+        'Expenses': [kpi['Total_Expenses'] for kpi in kpis],
+        'Net_Income': [kpi['Total_Net_Income'] for kpi in kpis],
+        'Profit_Margin': [kpi['Average_Profit_Margin'] for kpi in kpis]
+    }, {column: payload['valuation'][column].to_numpy() for column in payload['valuation'].columns}, currency)
+
+    for key, df in payload['projections'].items():
+        columns = {column: df[column].to_numpy() for column in df.columns if column != 'Scenario'}
+        columns['Month_Name'] = columns['Month_Name'].astype(str)
+        scenario_ws = wb.create_sheet(payload['scenarios'][key])
+        _write_table(scenario_ws, columns, 1, currency)
+        if key == 'base':
+            add_chart(ws, 'trend', table_block(scenario_ws, columns, 1, len(df), 'Month_Name', TREND_COLUMNS),
+                      'I3', f"{payload['scenarios'][key]} Trends", f'Amount ({currency})')
+
+    for part, title in [('cash_flow', 'Cash Flow'), ('balance_sheet', 'Balance Sheet')]:
+        _write_table(wb.create_sheet(title), {**payload['periods'], **payload['statements'][part]}, 1, currency)
+
+    wb.save(path)
+    fingerprint = finalize_run(path, wb, context, payload['projections'])
+    return path, fingerprint
+
+
+def consolidate(payloads):
+    """Group totals from the stacked (site, scenario, month) site arrays
+
+    Every site must share the projection calendar and reporting currency;
+    statement lines are summed, so the consolidated balance sheet ties out
+    whenever each site's does.
+    """
+    first = payloads[0]
+    for payload in payloads[1:]:
+        if payload['reporting_currency'] != first['reporting_currency']:
+            raise ValueError(f"{payload['name']} reports in {payload['reporting_currency']}, "
+                             f"not {first['reporting_currency']}")
+        if not (np.array_equal(payload['periods']['Year'], first['periods']['Year'])
+                and np.array_equal(payload['periods']['Month'], first['periods']['Month'])):
+            raise ValueError(f"{payload['name']} has a different projection calendar")
+
+    scenario_keys = list(first['scenarios'])
+    stacked = {
+        column: np.stack([[payload['projections'][key][column].to_numpy(dtype=float) for key in scenario_keys]
+                          for payload in payloads])
+        for column in ADDITIVE_COLUMNS
+    }
+    totals = {column: values.sum(axis=0) for column, values in stacked.items()}
+    totals['Profit_Margin'] = np.divide(totals['Net_Income'], totals['Revenue'],
+                                        out=np.zeros_like(totals['Revenue']), where=totals['Revenue'] > 0)
+
+    statements = {
+        part: {line: sum(payload['statements'][part][line] for payload in payloads)
+               for line in first['statements'][part]}
+        for part in first['statements']
+    }
+    statements['balance_check'] = (statements['balance_sheet']['Total_Assets']
+                                   - statements['balance_sheet']['Total_Liabilities']
+                                   - statements['balance_sheet']['Total_Equity'])
+    check_statements(statements)
+
+    valuations = np.stack([payload['valuation'][['Enterprise_Value', 'NPV']].to_numpy() for payload in payloads])
+    base = scenario_keys.index('base')
+    return {
+        'currency': first['reporting_currency'],
+        'scenarios': first['scenarios'],
+        'periods': first['periods'],
+        'sites': [payload['name'] for payload in payloads],
+        'site_currencies': [payload['currency'] for payload in payloads],
+        'site_beds': np.array([payload['beds'] for payload in payloads]),
+        'stacked': stacked,
+        'totals': totals,
+        'statements': statements,
+        'site_enterprise_value': valuations[:, base, 0],
+        'site_npv': valuations[:, base, 1],
+        'enterprise_value': valuations[..., 0].sum(axis=0),
+        'npv': valuations[..., 1].sum(axis=0)
+    }
+
+
+def write_group_workbook(group, path, context):
+    """Consolidated group workbook built from the aggregated arrays"""
+    currency = group['currency']
+    base = list(group['scenarios']).index('base')
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'Group Summary'
+
+    names = list(group['scenarios'].values())
+    _summary_sheet(ws, f"Portfolio of {len(group['sites'])} sites (reported in {currency})", {
+        'Scenario': names,
+        'Revenue': group['totals']['Revenue'].sum(axis=-1),
+        'Expenses': group['totals']['Expenses'].sum(axis=-1),
+        'Net_Income': group['totals']['Net_Income'].sum(axis=-1),
+        'Profit_Margin': np.divide(group['totals']['Net_Income'].sum(axis=-1), group['totals']['Revenue'].sum(axis=-1))
+    }, {'Scenario': names, 'Enterprise_Value': group['enterprise_value'], 'NPV': group['npv']}, currency)
+
+    site_revenue = group['stacked']['Revenue'][:, base].sum(axis=-1)
+    site_net_income = group['stacked']['Net_Income'][:, base].sum(axis=-1)
+    sites_ws = wb.create_sheet('Sites')
+    site_columns = {
+        'Site': group['sites'],
+        'Currency': group['site_currencies'],
+        'Beds': group['site_beds'],
+        'Revenue': site_revenue,
+        'Net_Income': site_net_income,
+        'Profit_Margin': np.divide(site_net_income, site_revenue, out=np.zeros_like(site_revenue),
+                                   where=site_revenue > 0),
+        'Share_of_Revenue': site_revenue / site_revenue.sum(),
+        'Enterprise_Value': group['site_enterprise_value'],
+        'NPV': group['site_npv']
+    }
+    _write_table(sites_ws, site_columns, 1, currency)
+    add_chart(ws, 'column', table_block(sites_ws, site_columns, 1, len(group['sites']), 'Site',
+                                       ['Revenue', 'Net_Income']),
+              'I3', f"{names[base]} by Site", f'Amount ({currency})', 'Site')
+
+    for index, (key, name) in enumerate(group['scenarios'].items()):
+        columns = {**group['periods'], **{column: values[index] for column, values in group['totals'].items()}}
+        scenario_ws = wb.create_sheet(f'Consolidated {name}')
+        _write_table(scenario_ws, columns, 1, currency)
+        if key == 'base':
+            add_chart(ws, 'trend', table_block(scenario_ws, columns, 1, len(group['periods']['Month']), 'Month_Name',
+                                               TREND_COLUMNS),
+                      'I24', f"Consolidated {name} Trends", f'Amount ({currency})')
+
+    # Month x site base-case revenue matrix
+    _write_table(wb.create_sheet('Revenue by Site'), {
+        **group['periods'],
+        **{site: group['stacked']['Revenue'][index, base] for index, site in enumerate(group['sites'])}
+    }, 1, currency)
+
+    for part, title in [('cash_flow', 'Consolidated Cash Flow'), ('balance_sheet', 'Consolidated Balance Sheet')]:
+        _write_table(wb.create_sheet(title), {**group['periods'], **group['statements'][part]}, 1, currency)
+
+    wb.save(path)
+    return finalize_run(path, wb, context, {'totals': np.stack([group['totals'][column]
+                                                                for column in ADDITIVE_COLUMNS])})
+
+
+def _site_filename(name):
+    return ''.join(char if char.isalnum() else '_' for char in name.lower()).strip('_') + '.xlsx'
+
+
+def run_portfolio(sites, output_dir, workers=None, reporting_currency='USD', months=36, context=None):
+    """Compute all sites, render site workbooks in parallel, then the group workbook
+
+    Returns the group and site workbook paths with stage timings.
+    """
+    context = context or RunContext.from_environment()
+    os.makedirs(output_dir, exist_ok=True)
+    timings = {}
+
+    start = time.perf_counter()
+    payloads = [compute_site(build_site_model(site, context, reporting_currency, months)) for site in sites]
+    timings['compute'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    paths = [os.path.join(output_dir, _site_filename(payload['name'])) for payload in payloads]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        rendered = [render_site_workbook(payload, path, context) for payload, path in zip(payloads, paths)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(payloads) // (workers * 4))
+            rendered = list(pool.map(render_site_workbook, payloads, paths, repeat(context), chunksize=chunksize))
+    timings['render_sites'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    group_path = os.path.join(output_dir, 'group_consolidated.xlsx')
+    group_fingerprint = write_group_workbook(consolidate(payloads), group_path, context)
+    timings['consolidate'] = time.perf_counter() - start
+
+    return {'group': (group_path, group_fingerprint), 'sites': rendered, 'timings': timings}
+
+
+def demo_portfolio(count):
+    """`count` synthetic sites cycling through USD, EUR, THB and ZAR"""
+    currencies = ['USD', 'EUR', 'THB', 'ZAR']
+    rng = np.random.default_rng(count)
+    sites = []
+    for number in range(count):
+        currency = currencies[number % len(currencies)]
+        sites.append({
+            'name': f'Site {number + 1:03d} {currency}',
+            'currency': currency,
+            'price_level': round(1 / spot_rate(currency), 4) if currency != 'USD' else 1.0,
+            'bed_scale': round(float(rng.uniform(0.6, 1.6)), 2),
+            'rate_scale': round(float(rng.uniform(0.8, 1.2)), 2)
+        })
+    return sites
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Render per-site and consolidated portfolio workbooks')
+    parser.add_argument('portfolio', nargs='?', help='JSON list of sites (name, currency, price_level, ...)')
+    parser.add_argument('--demo-sites', type=int, help='generate this many synthetic sites instead')
+    parser.add_argument('--output-dir', default='portfolio')
+    parser.add_argument('--workers', type=int, help='render processes (default: all cores)')
+    parser.add_argument('--reporting-currency', default='USD', choices=sorted(DEFAULT_SPOT_RATES))
+    parser.add_argument('--months', type=int, default=36)
+    args = parser.parse_args()
+
+    if args.portfolio:
+        with open(args.portfolio) as handle:
+            sites = json.load(handle)
+    else:
+        sites = demo_portfolio(args.demo_sites or 8)
+
+    result = run_portfolio(sites, args.output_dir, args.workers, args.reporting_currency, args.months)
+    timings = result['timings']
+    total = sum(timings.values())
+    print(f"{len(result['sites'])} site workbooks + group workbook in {total:.1f} s "
+          f"({len(result['sites']) / total * 60:.0f} site workbooks/min)")
+    for stage, seconds in timings.items():
+        print(f"    {stage:<14} {seconds:6.2f} s")
+    print(f"Group workbook: {result['group'][0]} (fingerprint {result['group'][1][:12]})")
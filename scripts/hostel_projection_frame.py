@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Hostel Projection Frame
+Compact column-oriented container for monthly projections with zero-copy
+conversion to pandas
+"""
+
+import calendar
+
+import numpy as np
+import pandas as pd
+
+
+MONTH_NAMES = list(calendar.month_name)[1:]
+
+
+class ProjectionFrame:
+    """Monthly projection stored as one typed NumPy array per column"""
+
+    __slots__ = ('year', 'month', 'columns', 'labels')
+
+    def __init__(self, year, month, columns, labels=None):
+        """Wrap year/month arrays and a dict of float columns without copying"""
+        self.year = np.asarray(year, dtype=np.int16)
+        self.month = np.asarray(month, dtype=np.int8)
+        self.columns = {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()}
+        self.labels = dict(labels or {})
+
+    def __len__(self):
+        return len(self.year)
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def __contains__(self, column):
+        return column in self.columns
+
+    @property
+    def nbytes(self):
+        """Bytes held by the column arrays"""
+        return self.year.nbytes + self.month.nbytes + sum(values.nbytes for values in self.columns.values())
+
+    def month_names(self):
+        """Month names as a categorical backed by the month codes"""
+        return pd.Categorical.from_codes(self.month.astype(np.int8) - 1, MONTH_NAMES)
+
+    def to_dataframe(self, month_names=True):
+        """Convert to a DataFrame that shares memory with the column arrays"""
+        data = dict(self.labels)
+        data['Year'] = self.year
+        data['Month'] = self.month
+        if month_names:
+            data['Month_Name'] = self.month_names()
+        data.update(self.columns)
+        return pd.DataFrame(data, copy=False)
+
+    @classmethod
+    def from_dataframe(cls, df, label_columns=('Scenario',)):
+        """Build a frame from a projection DataFrame with Year and Month columns"""
+        labels = {name: df[name].iloc[0] for name in label_columns if name in df}
+        skip = set(labels) | {'Year', 'Month', 'Month_Name'}
+        columns = {
+            name: df[name].to_numpy()
+            for name in df.columns
+            if name not in skip and pd.api.types.is_numeric_dtype(df[name])
+        }
+        return cls(df['Year'].to_numpy(), df['Month'].to_numpy(), columns, labels)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Hostel Rolling Re-forecast Engine
+Rolls the forecast origin forward one closed month at a time: closed months
+carry actuals, open months are re-projected from the budget's seasonal shape
+and the latest run-rate, and every forecast vintage is kept so accuracy can
+be tracked over time
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.styles import Font, PatternFill
+
+from hostel_cell_values import number_format
+from hostel_kpi_engine import month_calendar
+from hostel_run_context import RunContext, refinalize_run
+from hostel_variance import VarianceTracker
+
+
+ROLLING_SHEET = 'Rolling Forecast'
+DEFAULT_HORIZONS = (1, 3, 6, 12)
+
+
+class RollingForecast(VarianceTracker):
+    """Variance tracker that also keeps one forecast vintage per origin
+
+    Row k of the vintage arrays is the forecast made once k months were
+    closed; it is written when the origin reaches k and never recomputed,
+    so rolling forward costs one month of variance plus one tail
+    re-forecast regardless of how many months are already closed.
+    """
+
+    def __init__(self, start_year, start_month, room_types, budget_sold, budget_revenue, budget_expenses):
+        super().__init__(start_year, start_month, room_types, budget_sold, budget_revenue, budget_expenses)
+        shape = (self.months + 1, self.months)
+        self.vintage_revenue = np.full(shape, np.nan)
+        self.vintage_expenses = np.full(shape, np.nan)
+        self._record_vintage()
+
+    @property
+    def origin(self):
+        """(year, month) of the first open month"""
+        calendar = month_calendar(pd.Timestamp(self.start_year, self.start_month, 1), self.closed_months + 1)
+        return int(calendar['year'][-1]), int(calendar['month'][-1])
+
+    def append_actuals(self, year, month, sold, revenue, expenses):
+        """Close a month and store the re-forecast made from the new origin
+
+        Restating an earlier closed month refreshes the current vintage only;
+        vintages from past origins stay as they were forecast.
+        """
+        super().append_actuals(year, month, sold, revenue, expenses)
+        self._record_vintage()
+
+    def roll_forward(self, sold, revenue, expenses):
+        """Close the current origin month and move the origin one month on"""
+        year, month = self.origin
+        self.append_actuals(year, month, sold, revenue, expenses)
+
+    def _record_vintage(self):
+        """Snapshot the open-month forecast at the current origin"""
+        origin = self.closed_months
+        self.vintage_revenue[origin, origin:] = self.forecast_revenue[origin:].sum(axis=-1)
+        self.vintage_expenses[origin, origin:] = self.forecast_expenses[origin:]
+
+    def _lead_errors(self, horizons):
+        """(horizon, origin) forecast and actual revenue for each forecast lead
+
+        Lead h is the forecast made at origin k for month k + h - 1, i.e. the
+        (h - 1)th diagonal of the vintage array.
+        """
+        actual = self.actual_revenue.sum(axis=-1)
+        origins = np.arange(self.months)
+        forecasts = np.full((len(horizons), self.months), np.nan)
+        actuals = np.full((len(horizons), self.months), np.nan)
+        for row, lead in enumerate(horizons):
+            diagonal = np.diagonal(self.vintage_revenue, offset=lead - 1)
+            count = min(len(diagonal), self.months)
+            forecasts[row, :count] = diagonal[:count]
+            targets = origins[:count] + lead - 1
+            actuals[row, :count] = np.where(targets < self.closed_months, actual[np.minimum(targets, self.months - 1)], np.nan)
+        return forecasts, actuals
+
+    def accuracy_frame(self, horizons=DEFAULT_HORIZONS):
+        """Absolute percentage error of revenue per origin and forecast lead"""
+        forecasts, actuals = self._lead_errors(horizons)
+        error = np.divide(np.abs(forecasts - actuals), actuals,
+                          out=np.full_like(actuals, np.nan), where=actuals > 0)
+
+        calendar = month_calendar(pd.Timestamp(self.start_year, self.start_month, 1), self.months)
+        frame = pd.DataFrame({'Origin_Year': calendar['year'], 'Origin_Month': calendar['month']})
+        for row, lead in enumerate(horizons):
+            frame[f'APE_{lead}M'] = error[row]
+        return frame.iloc[:self.closed_months]
+
+    def accuracy_summary(self, horizons=DEFAULT_HORIZONS):
+        """MAPE, bias and observation count of revenue forecasts per lead"""
+        forecasts, actuals = self._lead_errors(horizons)
+        observed = ~np.isnan(actuals) & (actuals > 0)
+        counts = observed.sum(axis=-1)
+        relative_error = np.divide(forecasts - actuals, actuals, out=np.zeros_like(actuals), where=observed)
+        with np.errstate(invalid='ignore'):
+            mape = np.abs(relative_error).sum(axis=-1) / counts
+            bias = relative_error.sum(axis=-1) / counts
+        return pd.DataFrame({
+            'Lead_Months': list(horizons),
+            'Observations': counts,
+            'MAPE': mape,
+            'Bias': bias
+        })
+
+    def rolling_frame(self, horizon=12):
+        """Closed months as actuals followed by `horizon` re-forecast months"""
+        end = min(self.months, self.closed_months + horizon)
+        frame = self.forecast_frame().iloc[:end].copy()
+        frame['Budget_Net_Income'] = frame['Budget_Revenue'] - frame['Budget_Expenses']
+        frame['Cumulative_Net_Income'] = frame['Forecast_Net_Income'].cumsum()
+        return frame
+
+    def write_rolling_sheet(self, workbook_path, horizon=12, horizons=DEFAULT_HORIZONS, currency='USD',
+                            context=None):
+        """Replace only the rolling forecast sheet of an existing workbook (amounts in `currency`)
+
+        The workbook is finalized again so its run manifest matches the file.
+        """
+        workbook = load_workbook(workbook_path)
+        if ROLLING_SHEET in workbook.sheetnames:
+            del workbook[ROLLING_SHEET]
+        ws = workbook.create_sheet(ROLLING_SHEET)
+
+        year, month = self.origin
+        ws['A1'] = f'Rolling Forecast - origin {year}-{month:02d}'
+        ws['A1'].font = Font(size=14, bold=True)
+
+        row = 3
+        for title, frame, kind in [
+            ('Actuals and Re-forecast', self.rolling_frame(horizon), 'currency_signed'),
+            ('Forecast Accuracy by Lead', self.accuracy_summary(horizons), 'percent_1'),
+            ('Forecast Accuracy by Origin', self.accuracy_frame(horizons), 'percent_1')
+        ]:
+            cell_format = number_format(kind, currency)
+            ws.cell(row=row, column=1, value=title).font = Font(bold=True, size=12)
+            row += 1
+            for col, header in enumerate(frame.columns, 1):
+                cell = ws.cell(row=row, column=col, value=header)
+                cell.fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+                cell.font = Font(color='FFFFFF', bold=True)
+            for values in frame.itertuples(index=False):
+                row += 1
+                for col, value in enumerate(values, 1):
+                    value = value.item() if hasattr(value, 'item') else value
+                    if isinstance(value, float) and not np.isfinite(value):
+                        value = None
+                    cell = ws.cell(row=row, column=col, value=value)
+                    if isinstance(value, float):
+                        cell.number_format = cell_format
+            row += 3
+
+        workbook.save(workbook_path)
+        refinalize_run(workbook_path, workbook, context or RunContext.from_environment())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Close a month of actuals and roll the forecast origin forward')
+    parser.add_argument('actuals', help='CSV with room_type, bed_nights and room_revenue columns for one month')
+    parser.add_argument('--expenses', type=float, required=True, help='actual operating expenses for the month')
+    parser.add_argument('--month', help='month to close as YYYY-MM (default: the current origin)')
+    parser.add_argument('--start', help='budget start as YYYY-MM when creating a new store (default: January of the HOSTEL_AS_OF year)')
+    parser.add_argument('--years', type=int, default=3, help='budget horizon in years when creating a new store')
+    parser.add_argument('--profile', help='fitted seasonality profile (hostel_seasonality) for the budget shape')
+    parser.add_argument('--store', default='data/cache/rolling_forecast.npz', help='rolling forecast store')
+    parser.add_argument('--workbook', default='hostel_diary_financial_model_enhanced.xlsx')
+    parser.add_argument('--horizon', type=int, default=12, help='re-forecast months shown after the origin')
+    parser.add_argument('--currency', default='USD', help='currency of the actuals and budget')
+    args = parser.parse_args()
+    context = RunContext.from_environment()
+
+    if os.path.exists(args.store):
+        forecast = RollingForecast.load(args.store)
+    else:
+        from datetime import datetime
+        from hostel_financial_model_enhanced import EnhancedHostelFinancialModel
+        from hostel_seasonality import load_profile
+
+        start = datetime.strptime(args.start, '%Y-%m') if args.start else datetime(context.as_of.year, 1, 1)
+        model = EnhancedHostelFinancialModel(hostel_name="Hostel Diary", start_date=start, context=context)
+        model.set_horizon(args.years * 12, start)
+        if args.profile:
+            model.set_seasonality_profile(load_profile(args.profile))
+
+        # Budget from the enhanced model's base case, commissions counted as costs
+        projections = model.generate_scenario_projections()
+        forecast = RollingForecast.from_bed_nights(
+            model.projection_start, model.room_types,
+            model.scenario_bed_nights['base'],
+            (projections['base']['Expenses'] + projections['base']['Commission']).to_numpy()
+        )
+
+    actuals = pd.read_csv(args.actuals).set_index('room_type').reindex(forecast.room_types).fillna(0)
+    year, month = (int(part) for part in args.month.split('-')) if args.month else forecast.origin
+    forecast.append_actuals(year, month, actuals['bed_nights'].to_numpy(),
+                            actuals['room_revenue'].to_numpy(), args.expenses)
+    forecast.save(args.store)
+    forecast.write_rolling_sheet(args.workbook, args.horizon, currency=args.currency, context=context)
+    forecast.write_variance_sheet(args.workbook, args.currency, context)
+
+    year, month = forecast.origin
+    print(f"Rolled forecast origin to {year}-{month:02d}: {args.workbook}")
+    print(forecast.accuracy_summary().to_string(index=False))
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Hostel Investor Reports
+HTML and PDF investor packs (executive summary, scenarios, annual cash flow,
+valuation and charts) rendered from cached engine results, so a report never
+regenerates the workbook. Static charts render in parallel and a whole
+portfolio's reports build in one batch.
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from string import Template
+
+import numpy as np
+
+from hostel_cell_values import display_value
+from hostel_charts import StaticChartWorker, static_figure
+from hostel_fx import DEFAULT_SPOT_RATES
+from hostel_portfolio import COLUMN_KINDS, build_site_model, compute_site, demo_portfolio
+from hostel_run_context import RunContext
+from hostel_tax import period_totals
+
+
+REPORT_FORMATS = ('html', 'pdf')
+
+# Base-case headline figures: (label, KPI name, format kind)
+SUMMARY_KPIS = [
+    ('Revenue', 'Total_Revenue', 'currency'),
+    ('Net Income', 'Total_Net_Income', 'currency'),
+    ('Profit Margin', 'Average_Profit_Margin', 'percent_1'),
+    ('Occupancy', 'Average_Occupancy', 'percent_1'),
+    ('ADR', 'Average_Daily_Rate', 'currency_cents'),
+    ('RevPAB', 'RevPAB', 'currency_cents')
+]
+
+SCENARIO_KPIS = [('Revenue', 'Total_Revenue'), ('Expenses', 'Total_Expenses'), ('Net_Income', 'Total_Net_Income'),
+                 ('Profit_Margin', 'Average_Profit_Margin'), ('Occupancy', 'Average_Occupancy')]
+
+CASH_FLOW_LINES = ['Operating_Cash_Flow', 'Capex', 'Financing_Cash_Flow', 'Net_Cash_Flow']
+
+# Format kinds of report columns; anything else is currency
+REPORT_KINDS = {**COLUMN_KINDS, 'Occupancy': 'percent_1'}
+
+REPORT_STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; color: #222; margin: 2em auto; max-width: 60em; }
+h1 { color: #366092; margin-bottom: 0; }
+h2 { color: #366092; border-bottom: 2px solid #366092; padding-bottom: 0.2em; margin-top: 1.6em; }
+.subtitle, .footer { color: #666; }
+.cards { display: flex; flex-wrap: wrap; gap: 0.8em; }
+.card { border: 1px solid #ccd6e6; border-radius: 4px; padding: 0.6em 1em; min-width: 8em; }
+.card .label { color: #666; font-size: 0.85em; }
+.card .value { font-size: 1.4em; font-weight: bold; }
+table { border-collapse: collapse; width: 100%; margin: 0.6em 0; }
+th { background: #366092; color: #fff; text-align: left; padding: 0.3em 0.6em; }
+td { border-bottom: 1px solid #e3e3e3; padding: 0.3em 0.6em; }
+td.number { text-align: right; }
+img { max-width: 100%; margin: 0.6em 0; }
+"""
+
+SITE_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>$name - Investor Report</title>
+<style>$style</style>
+</head>
+<body>
+<h1>$name</h1>
+<p class="subtitle">Investor report, $horizon projection from $start (reported in $currency)</p>
+<h2>Executive Summary</h2>
+<div class="cards">$cards</div>
+<h2>Scenarios</h2>
+$scenarios
+<h2>Charts</h2>
+$charts
+<h2>Annual Cash Flow (Base Case)</h2>
+$cash_flow
+<h2>Valuation</h2>
+$valuation
+<p class="footer">Seed $seed, as of $as_of, code version $code_version, results $signature</p>
+</body>
+</html>
+""")
+
+INDEX_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Portfolio Investor Reports</title>
+<style>$style</style>
+</head>
+<body>
+<h1>Portfolio Investor Reports</h1>
+<p class="subtitle">$count sites, base case over each site's horizon (reported in $currency)</p>
+$sites
+<p class="footer">Seed $seed, as of $as_of, code version $code_version</p>
+</body>
+</html>
+""")
+
+
+def results_signature(site, context, reporting_currency, months):
+    """Content hash of everything a site's results depend on"""
+    return hashlib.sha1(json.dumps({
+        'site': site, 'context': context.to_dict(), 'reporting_currency': reporting_currency, 'months': months
+    }, sort_keys=True).encode()).hexdigest()
+
+
+def results_from_payload(payload, signature='', context=None):
+    """Plain report results (metadata plus named arrays) from a portfolio site payload"""
+    return {
+        'name': payload['name'],
+        'currency': payload['currency'],
+        'reporting_currency': payload['reporting_currency'],
+        'beds': int(payload['beds']),
+        'scenarios': dict(payload['scenarios']),
+        'kpis': {key: {name: float(value) for name, value in kpis.items()} for key, kpis in payload['kpis'].items()},
+        'context': context.to_dict() if context else {},
+        'signature': signature,
+        'periods': {name: np.asarray(values, dtype=str if name == 'Month_Name' else None)
+                    for name, values in payload['periods'].items()},
+        'projections': {
+            key: {column: df[column].to_numpy() for column in df.columns if df[column].dtype.kind in 'biuf'}
+            for key, df in payload['projections'].items()
+        },
+        'statements': {part: {line: np.asarray(values) for line, values in lines.items()}
+                       for part, lines in payload['statements'].items()},
+        'valuation': {column: payload['valuation'][column].to_numpy()
+                      for column in payload['valuation'].columns if column != 'Scenario'}
+    }
+
+
+ARRAY_GROUPS = ('periods', 'projections', 'statements', 'valuation')
+
+
+def save_results(results, path):
+    """Cache report results as one .npz: metadata as JSON plus every array"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    meta = {key: value for key, value in results.items() if key not in ARRAY_GROUPS}
+    arrays = {'meta': np.array(json.dumps(meta))}
+    for group in ARRAY_GROUPS:
+        for name, values in results[group].items():
+            if isinstance(values, dict):
+                arrays.update({f'{group}/{name}/{column}': column_values for column, column_values in values.items()})
+            else:
+                arrays[f'{group}/{name}'] = values
+    np.savez(path, **arrays)
+
+
+def load_results(path, signature=None):
+    """Cached report results, or None if missing or computed from other inputs"""
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as cached:
+        results = json.loads(str(cached['meta']))
+        if signature is not None and results['signature'] != signature:
+            return None
+        results.update({group: {} for group in ARRAY_GROUPS})
+        for key in cached.files:
+            if key == 'meta':
+                continue
+            group, *names = key.split('/')
+            target = results[group]
+            for name in names[:-1]:
+                target = target.setdefault(name, {})
+            target[names[-1]] = cached[key]
+    return results
+
+
+def _site_stem(name):
+    return ''.join(char if char.isalnum() else '_' for char in name.lower()).strip('_')
+
+
+def cached_site_results(site, cache_dir, context, reporting_currency='USD', months=36):
+    """A site's report results from the cache, computing and caching them on a miss
+
+    Returns the results and whether they came from the cache.
+    """
+    signature = results_signature(site, context, reporting_currency, months)
+    path = os.path.join(cache_dir, f"{_site_stem(site['name'])}.results.npz")
+    results = load_results(path, signature)
+    if results is not None:
+        return results, True
+    payload = compute_site(build_site_model(site, context, reporting_currency, months))
+    results = results_from_payload(payload, signature, context)
+    save_results(results, path)
+    return results, False
+
+
+def _year_ends(years):
+    """Index of each year's last projection month"""
+    return np.append(np.flatnonzero(np.diff(years) != 0), len(years) - 1)
+
+
+def annual_cash_flow(results):
+    """{line: (year,) values} of the base-case cash flow, closing cash at each year end"""
+    years = results['periods']['Year']
+    cash_flow = results['statements']['cash_flow']
+    annual = {'Year': [str(year) for year in years[_year_ends(years)]]}
+    annual.update({line: period_totals(cash_flow[line], years) for line in CASH_FLOW_LINES})
+    annual['Cash_Balance'] = np.asarray(cash_flow['Cash_Balance'])[_year_ends(years)]
+    return annual
+
+
+def scenario_table(results):
+    """{column: per-scenario values} of headline KPIs and valuation"""
+    keys = list(results['scenarios'])
+    table = {'Scenario': list(results['scenarios'].values())}
+    table.update({column: [results['kpis'][key][kpi] for key in keys] for column, kpi in SCENARIO_KPIS})
+    table['Enterprise_Value'] = results['valuation']['Enterprise_Value']
+    table['NPV'] = results['valuation']['NPV']
+    return table
+
+
+def report_chart_jobs(results):
+    """Static chart jobs (template, categories, series, filename stem, title, y_title) from results"""
+    currency = results['reporting_currency']
+    months = [str(month) for month in results['periods']['Month_Name']]
+    base = results['projections']['base']
+    annual = annual_cash_flow(results)
+    return [
+        ('line', months, {results['scenarios'][key]: columns['Revenue']
+                          for key, columns in results['projections'].items()},
+         'scenario_revenue', 'Monthly Revenue by Scenario', f'Revenue ({currency})'),
+        ('trend', months, {'Revenue': base['Revenue'], 'Expenses': base['Expenses'], 'Net Income': base['Net_Income']},
+         'base_trend', 'Revenue & Expense Trends (Base Case)', f'Amount ({currency})'),
+        ('column', annual['Year'], {'Operating Cash Flow': annual['Operating_Cash_Flow'],
+                                    'Net Cash Flow': annual['Net_Cash_Flow']},
+         'annual_cash_flow', 'Annual Cash Flow (Base Case)', f'Amount ({currency})')
+    ]
+
+
+def _table_text(columns, currency, transpose=False):
+    """Header labels and rows of display text for {header: values}
+
+    `transpose` puts each column on its own row, headed by the first column's values.
+    """
+    headers = list(columns)
+    cells = [[display_value(value, REPORT_KINDS.get(header, 'currency'), currency) for value in columns[header]]
+             for header in headers]
+    if transpose:
+        return [''] + cells[0], [[header.replace('_', ' ')] + values for header, values in zip(headers[1:], cells[1:])]
+    return [header.replace('_', ' ') for header in headers], [list(row) for row in zip(*cells)]
+
+
+def html_table(columns, currency, transpose=False, links=None):
+    """HTML table of {header: values}, formatted with the workbook's number format kinds
+
+    `links` optionally gives an href for each row's label.
+    """
+    head, rows = _table_text(columns, currency, transpose)
+
+    def label(index, value):
+        text = html.escape(value)
+        return f'<td><a href="{html.escape(links[index])}">{text}</a></td>' if links else f'<td>{text}</td>'
+
+    return ('<table>\n<tr>' + ''.join(f'<th>{html.escape(header)}</th>' for header in head) + '</tr>\n'
+            + ''.join('<tr>' + label(index, row[0])
+                      + ''.join(f'<td class="number">{html.escape(value)}</td>' for value in row[1:]) + '</tr>\n'
+                      for index, row in enumerate(rows))
+            + '</table>')
+
+
+def _horizon(results):
+    months = len(results['periods']['Month'])
+    return f'{months // 12}-year' if months % 12 == 0 else f'{months}-month'
+
+
+def summary_cards(results):
+    """(label, text) base-case headline figures for the executive summary"""
+    currency = results['reporting_currency']
+    base = results['kpis']['base']
+    base_index = list(results['scenarios']).index('base')
+    return [(label, display_value(base[kpi], kind, currency)) for label, kpi, kind in SUMMARY_KPIS] + [
+        (label, display_value(results['valuation'][column][base_index], 'currency', currency))
+        for label, column in [('Enterprise Value', 'Enterprise_Value'), ('NPV', 'NPV')]
+    ]
+
+
+def write_html_report(results, path, chart_files):
+    """Fill the site template from results; `chart_files` are (image path relative to the report, title)"""
+    currency = results['reporting_currency']
+    context = results['context']
+
+    document = SITE_TEMPLATE.substitute(
+        name=html.escape(results['name']),
+        style=REPORT_STYLE,
+        horizon=_horizon(results),
+        start=f"{results['periods']['Month_Name'][0]} {results['periods']['Year'][0]}",
+        currency=currency,
+        cards=''.join(f'<div class="card"><div class="label">{html.escape(label)}</div>'
+                      f'<div class="value">{html.escape(value)}</div></div>' for label, value in summary_cards(results)),
+        scenarios=html_table(scenario_table(results), currency),
+        charts='\n'.join(f'<img src="{html.escape(chart)}" alt="{html.escape(title)}">'
+                         for chart, title in chart_files),
+        cash_flow=html_table(annual_cash_flow(results), currency, transpose=True),
+        valuation=html_table({'Scenario': list(results['scenarios'].values()), **results['valuation']}, currency),
+        seed=context.get('seed', ''), as_of=context.get('as_of', ''), code_version=context.get('code_version', ''),
+        signature=results['signature'][:12]
+    )
+    with open(path, 'w', encoding='utf-8') as handle:
+        handle.write(document)
+    return path
+
+
+def _pdf_table(figure, rect, title, columns, currency, transpose=False):
+    """Draw a titled {header: values} table in `rect` of a PDF page"""
+    labels, rows = _table_text(columns, currency, transpose)
+    ax = figure.add_axes(rect)
+    ax.axis('off')
+    ax.set_title(title, loc='left', fontsize=12, color='#366092', fontweight='bold')
+    table = ax.table(cellText=rows, colLabels=labels, loc='upper center', cellLoc='right')
+    table.auto_set_font_size(False)
+    table.set_fontsize(8)
+    for (row, _), cell in table.get_celld().items():
+        if row == 0:
+            cell.set_facecolor('#366092')
+            cell.get_text().set_color('white')
+
+
+def write_pdf_report(results, path):
+    """Multi-page PDF pack: summary tables, then one page per chart"""
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+
+    currency = results['reporting_currency']
+    page_size = (11.69, 8.27)
+    with PdfPages(path) as pdf:
+        figure = Figure(figsize=page_size)
+        figure.text(0.05, 0.94, results['name'], fontsize=20, color='#366092', fontweight='bold')
+        figure.text(0.05, 0.905, f"Investor report, {_horizon(results)} projection (reported in {currency})",
+                    fontsize=10, color='#666666')
+        figure.text(0.05, 0.87, '   '.join(f'{label}: {value}' for label, value in summary_cards(results)),
+                    fontsize=10, fontweight='bold')
+        _pdf_table(figure, [0.05, 0.6, 0.9, 0.25], 'Scenarios', scenario_table(results), currency)
+        _pdf_table(figure, [0.05, 0.3, 0.9, 0.25], 'Annual Cash Flow (Base Case)', annual_cash_flow(results),
+                   currency, transpose=True)
+        _pdf_table(figure, [0.05, 0.03, 0.9, 0.22], 'Valuation',
+                   {'Scenario': list(results['scenarios'].values()), **results['valuation']}, currency)
+        pdf.savefig(figure)
+
+        for template, categories, series, _, title, y_title in report_chart_jobs(results):
+            pdf.savefig(static_figure(template, categories, series, title, y_title, figure=Figure(figsize=page_size)))
+    return path
+
+
+def write_index(site_reports, path, context, currency):
+    """Portfolio index linking every site report with its base-case headline figures"""
+    rows = {'Site': [], 'Revenue': [], 'Net_Income': [], 'Profit_Margin': [], 'Enterprise_Value': []}
+    links = []
+    for results, report in site_reports:
+        base_index = list(results['scenarios']).index('base')
+        rows['Site'].append(results['name'])
+        rows['Revenue'].append(results['kpis']['base']['Total_Revenue'])
+        rows['Net_Income'].append(results['kpis']['base']['Total_Net_Income'])
+        rows['Profit_Margin'].append(results['kpis']['base']['Average_Profit_Margin'])
+        rows['Enterprise_Value'].append(results['valuation']['Enterprise_Value'][base_index])
+        links.append(os.path.relpath(report, os.path.dirname(os.path.abspath(path))))
+
+    with open(path, 'w', encoding='utf-8') as handle:
+        handle.write(INDEX_TEMPLATE.substitute(
+            style=REPORT_STYLE, count=len(site_reports), currency=currency, sites=html_table(rows, currency, links=links),
+            seed=context.seed, as_of=context.as_of.isoformat(), code_version=context.code_version
+        ))
+    return path
+
+
+def build_reports(sites, output_dir, cache_dir, formats=('html',), image_format='svg', workers=None,
+                  reporting_currency='USD', months=36, context=None):
+    """Reports for every site from cached results, charts rendered in parallel
+
+    HTML reports reference chart images that a background worker pool
+    renders for all sites at once; PDF packs are drawn in the same number of
+    processes. Returns report paths, cache hits and stage timings.
+    """
+    context = context or RunContext.from_environment()
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    timings = {}
+
+    start = time.perf_counter()
+    loaded = [cached_site_results(site, cache_dir, context, reporting_currency, months) for site in sites]
+    site_results = [results for results, _ in loaded]
+    timings['results'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reports, chart_futures = [], []
+    if 'html' in formats:
+        with StaticChartWorker(workers) as worker:
+            for results in site_results:
+                stem = _site_stem(results['name'])
+                chart_dir = os.path.join(output_dir, f'{stem}_charts')
+                os.makedirs(chart_dir, exist_ok=True)
+                chart_files = []
+                for template, categories, series, chart_stem, title, y_title in report_chart_jobs(results):
+                    chart_path = os.path.join(chart_dir, f'{chart_stem}.{image_format}')
+                    chart_futures.append(worker.submit(template, categories, series, chart_path, title, y_title))
+                    chart_files.append((os.path.relpath(chart_path, output_dir), title))
+                reports.append(write_html_report(results, os.path.join(output_dir, f'{stem}.html'), chart_files))
+        # Surface a failed render rather than link an image that was never written
+        for future in chart_futures:
+            future.result()
+        index = write_index(list(zip(site_results, reports)), os.path.join(output_dir, 'index.html'),
+                            context, reporting_currency)
+        reports.append(index)
+    timings['html'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if 'pdf' in formats:
+        paths = [os.path.join(output_dir, f"{_site_stem(results['name'])}.pdf") for results in site_results]
+        if workers == 1:
+            reports += [write_pdf_report(results, path) for results, path in zip(site_results, paths)]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                reports += list(pool.map(write_pdf_report, site_results, paths))
+    timings['pdf'] = time.perf_counter() - start
+
+    return {'reports': reports, 'cache_hits': sum(hit for _, hit in loaded), 'timings': timings}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build HTML/PDF investor reports from cached model results')
+    parser.add_argument('portfolio', nargs='?', help='JSON list of sites (as for hostel_portfolio.py)')
+    parser.add_argument('--demo-sites', type=int, help='generate this many synthetic sites instead')
+    parser.add_argument('--output-dir', default='reports/investor')
+    parser.add_argument('--cache-dir', default='data/cache/results')
+    parser.add_argument('--format', nargs='+', default=['html'], choices=REPORT_FORMATS)
+    parser.add_argument('--image-format', default='svg', choices=('png', 'svg'))
+    parser.add_argument('--workers', type=int, help='chart/PDF processes (default: all cores)')
+    parser.add_argument('--reporting-currency', default='USD', choices=sorted(DEFAULT_SPOT_RATES))
+    parser.add_argument('--months', type=int, default=36)
+    args = parser.parse_args()
+
+    if args.portfolio:
+        with open(args.portfolio) as handle:
+            sites = json.load(handle)
+    elif args.demo_sites:
+        sites = demo_portfolio(args.demo_sites)
+    else:
+        sites = [{'name': 'Hostel Diary'}]
+
+    result = build_reports(sites, args.output_dir, args.cache_dir, args.format, args.image_format, args.workers,
+                           args.reporting_currency, args.months)
+    print(f"{len(result['reports'])} reports for {len(sites)} sites "
+          f"({result['cache_hits']} from cached results) in {sum(result['timings'].values()):.1f} s")
+    for stage, seconds in result['timings'].items():
+        print(f"    {stage:<8} {seconds:6.2f} s")
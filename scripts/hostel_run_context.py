@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Hostel Run Context
+Seed, as-of date and code version threaded through every generator, plus a
+content fingerprint of each run's outputs and byte-stable workbook files so
+identical inputs can be cached and deduplicated
+"""
+
+import hashlib
+import json
+import os
+import re
+import struct
+import zipfile
+import zlib
+from datetime import date, datetime
+
+import numpy as np
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SEED_ENV = 'HOSTEL_SEED'
+AS_OF_ENV = 'HOSTEL_AS_OF'
+
+
+def source_version(directory=SCRIPTS_DIR):
+    """Short content hash of the model scripts, used as the code version"""
+    digest = hashlib.sha1()
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.py'):
+            digest.update(name.encode())
+            with open(os.path.join(directory, name), 'rb') as source:
+                digest.update(source.read())
+    return digest.hexdigest()[:12]
+
+
+class RunContext:
+    """Seed, as-of date and code version for one reproducible model run
+
+    `rng` is the single seeded generator for the run; `stream(name)` gives
+    an independent generator per named consumer, so results do not depend
+    on call order or on which process draws them.
+    """
+
+    def __init__(self, seed=0, as_of=None, code_version=None):
+        self.seed = int(seed)
+        self.as_of = as_of or date.today()
+        if isinstance(self.as_of, str):
+            self.as_of = date.fromisoformat(self.as_of)
+        if isinstance(self.as_of, datetime):
+            self.as_of = self.as_of.date()
+        self.code_version = code_version or source_version()
+        self.rng = np.random.default_rng(self.seed)
+
+    @classmethod
+    def from_environment(cls):
+        """Context from HOSTEL_SEED / HOSTEL_AS_OF, defaulting to seed 0 and today"""
+        return cls(seed=os.environ.get(SEED_ENV, 0), as_of=os.environ.get(AS_OF_ENV) or None)
+
+    @property
+    def as_of_datetime(self):
+        """As-of date as a midnight datetime, the models' default start date"""
+        return datetime(self.as_of.year, self.as_of.month, self.as_of.day)
+
+    def stream(self, name):
+        """Independent generator for a named consumer (sheet, site, simulation)"""
+        return np.random.default_rng([self.seed, zlib.crc32(name.encode())])
+
+    def to_dict(self):
+        return {
+            'seed': self.seed,
+            'as_of': self.as_of.isoformat(),
+            'code_version': self.code_version
+        }
+
+
+def _update_value(digest, value):
+    """Feed one value into a digest with a type tag"""
+    if isinstance(value, (bool, np.bool_)):
+        digest.update(b'b' + bytes([bool(value)]))
+    elif isinstance(value, (int, np.integer)):
+        digest.update(b'i' + str(int(value)).encode())
+    elif isinstance(value, (float, np.floating)):
+        digest.update(b'f' + struct.pack('<d', float(value)))
+    elif isinstance(value, (datetime, date)):
+        digest.update(b'd' + value.isoformat().encode())
+    else:
+        digest.update(b's' + str(value).encode())
+
+
+def flatten_arrays(arrays):
+    """Numeric arrays keyed 'name' or 'name/column' for DataFrame inputs"""
+    flat = {}
+    for name, value in arrays.items():
+        if hasattr(value, 'columns'):
+            for column in value.columns:
+                values = value[column].to_numpy()
+                if values.dtype.kind in 'biuf':
+                    flat[f'{name}/{column}'] = values
+        else:
+            flat[name] = np.asarray(value)
+    return flat
+
+
+def fingerprint_arrays(arrays):
+    """SHA-256 over named arrays (or DataFrame columns), independent of dict order"""
+    digest = hashlib.sha256()
+    for name in sorted(arrays):
+        value = arrays[name]
+        if hasattr(value, 'columns'):
+            for column in value.columns:
+                values = value[column].to_numpy()
+                digest.update(f'{name}/{column}'.encode())
+                if values.dtype.kind in 'biuf':
+                    digest.update(np.ascontiguousarray(values, dtype=float).tobytes())
+                else:
+                    for item in values:
+                        _update_value(digest, item)
+            continue
+        values = np.ascontiguousarray(value)
+        digest.update(f'{name}:{values.dtype.str}:{values.shape}'.encode())
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+def workbook_fingerprint(workbook):
+    """SHA-256 over every sheet's cell values, ignoring styles and file metadata"""
+    digest = hashlib.sha256()
+    for ws in workbook.worksheets:
+        digest.update(b'sheet' + ws.title.encode())
+        for row in ws.iter_rows():
+            for cell in row:
+                if cell.value is not None:
+                    digest.update(cell.coordinate.encode())
+                    _update_value(digest, cell.value)
+    return digest.hexdigest()
+
+
+def stabilize_workbook_file(path, context):
+    """Pin the timestamps in a zip container so identical content is byte-identical
+
+    openpyxl stamps docProps with the save time and zip entries (xlsx and
+    npz alike) carry the wall clock; both are replaced by the run's as-of
+    date.
+    """
+    stamp = context.as_of_datetime.strftime('%Y-%m-%dT%H:%M:%SZ')
+    zip_time = (max(context.as_of.year, 1980), context.as_of.month, context.as_of.day, 0, 0, 0)
+
+    with zipfile.ZipFile(path) as source:
+        entries = [(info, source.read(info.filename)) for info in source.infolist()]
+
+    with zipfile.ZipFile(path, 'w') as target:
+        for info, data in entries:
+            if info.filename == 'docProps/core.xml':
+                data = re.sub(rb'(<dcterms:(?:created|modified)[^>]*>)[^<]*', rb'\g<1>' + stamp.encode(), data)
+            stable = zipfile.ZipInfo(info.filename, date_time=zip_time)
+            stable.compress_type = info.compress_type
+            stable.external_attr = info.external_attr
+            target.writestr(stable, data)
+
+
+def manifest_path(workbook_path):
+    """Run manifest written next to a workbook"""
+    return os.path.splitext(workbook_path)[0] + '.run.json'
+
+
+def arrays_path(workbook_path):
+    """Numeric array sidecar written next to a workbook"""
+    return os.path.splitext(workbook_path)[0] + '.arrays.npz'
+
+
+def file_digest(path):
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def finalize_run(workbook_path, workbook, context, arrays=None):
+    """Fingerprint a saved workbook, stabilize its bytes and write its run manifest
+
+    `arrays` (named arrays or DataFrames behind the workbook) are also
+    fingerprinted and saved as an .npz sidecar for fast diffing.
+
+    Returns the content fingerprint; runs with equal fingerprints produced
+    the same numbers and can share one cached file.
+    """
+    fingerprint = workbook_fingerprint(workbook)
+    stabilize_workbook_file(workbook_path, context)
+
+    manifest = {
+        'workbook': os.path.basename(workbook_path),
+        **context.to_dict(),
+        'fingerprint': fingerprint,
+        'file_sha256': file_digest(workbook_path)
+    }
+    if arrays is not None:
+        manifest['array_fingerprint'] = fingerprint_arrays(arrays)
+        np.savez(arrays_path(workbook_path), **flatten_arrays(arrays))
+        stabilize_workbook_file(arrays_path(workbook_path), context)
+    with open(manifest_path(workbook_path), 'w') as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    return fingerprint
+
+
+def refinalize_run(workbook_path, workbook, context):
+    """Finalize a saved workbook again after sheets were replaced in place
+
+    The fingerprint, file hash and context are refreshed; the array
+    sidecar is kept, since the projections it holds did not change.
+    """
+    previous = load_manifest(workbook_path) or {}
+    fingerprint = finalize_run(workbook_path, workbook, context)
+    if 'array_fingerprint' in previous and os.path.exists(arrays_path(workbook_path)):
+        manifest = load_manifest(workbook_path)
+        manifest['array_fingerprint'] = previous['array_fingerprint']
+        with open(manifest_path(workbook_path), 'w') as handle:
+            json.dump(manifest, handle, indent=2, sort_keys=True)
+    return fingerprint
+
+
+def load_manifest(workbook_path):
+    """Run manifest of a workbook, or None if it was not finalized"""
+    path = manifest_path(workbook_path)
+    if not os.path.exists(path):
+        return None
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def current_manifest(workbook_path):
+    """Run manifest of a workbook, or None if missing or the file changed since it was written"""
+    manifest = load_manifest(workbook_path)
+    if manifest is None or manifest.get('file_sha256') != file_digest(workbook_path):
+        return None
+    return manifest
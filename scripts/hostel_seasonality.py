@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Hostel Seasonality Fitting
+Fits daily occupancy curves (week-of-year, day-of-week and holiday effects)
+from historical bed-night data and turns them into monthly occupancy arrays
+for the projection engines
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+
+WEEKS = 53
+DAYS_OF_WEEK = 7
+
+
+def _holiday_mask(dates, holidays):
+    """Flag dates matching exact 'YYYY-MM-DD' or recurring 'MM-DD' holidays"""
+    holidays = [str(holiday) for holiday in (holidays if holidays is not None else [])]
+    exact = np.array([h for h in holidays if len(h) == 10], dtype='datetime64[D]')
+    recurring = [int(h.replace('-', '')) for h in holidays if len(h) == 5]
+
+    months = dates.astype('datetime64[M]')
+    month_day = (months.astype(int) % 12 + 1) * 100 + (dates - months.astype('datetime64[D]')).astype(int) + 1
+    return np.isin(dates, exact) | np.isin(month_day, recurring)
+
+
+def _design_matrix(dates, holidays=None):
+    """One-hot week-of-year, day-of-week and holiday columns for each date"""
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    day_of_year = (dates - dates.astype('datetime64[Y]')).astype(int)
+    week = np.minimum(day_of_year // 7, WEEKS - 1)
+    # 1970-01-01 was a Thursday; shift so Monday is 0
+    day_of_week = (dates.astype(int) + 3) % 7
+
+    design = np.zeros((len(dates), WEEKS + DAYS_OF_WEEK + 1))
+    rows = np.arange(len(dates))
+    design[rows, week] = 1
+    design[rows, WEEKS + day_of_week] = 1
+    design[:, -1] = _holiday_mask(dates, holidays)
+    return design
+
+
+def fit_seasonality(dates, occupancy, holidays=None, ridge=1e-3):
+    """Fit week, day-of-week and holiday effects for every series at once
+
+    `occupancy` is (day, series) - one column per room type, hostel or both
+    flattened - so a whole portfolio is one least-squares solve. A small
+    ridge penalty keeps the collinear week/day blocks well conditioned.
+    Holidays are 'YYYY-MM-DD' dates or recurring 'MM-DD' strings.
+    """
+    occupancy = np.asarray(occupancy, dtype=float)
+    if occupancy.ndim == 1:
+        occupancy = occupancy[:, None]
+    design = _design_matrix(dates, holidays)
+
+    # Ridge normal equations, shared across all series
+    gram = design.T @ design + ridge * np.eye(design.shape[1])
+    coefficients = np.linalg.solve(gram, design.T @ occupancy)
+
+    return {
+        'week_effect': coefficients[:WEEKS],
+        'day_of_week_effect': coefficients[WEEKS:WEEKS + DAYS_OF_WEEK],
+        'holiday_effect': coefficients[-1],
+        'holidays': np.array([str(holiday) for holiday in (holidays if holidays is not None else [])], dtype=str)
+    }
+
+
+def fit_from_store(store, holidays=None, ridge=1e-3):
+    """Fit per-room-type seasonality from a hostel_booking_ingest daily store"""
+    available = store['available_bed_nights']
+    occupancy = np.divide(store['sold_bed_nights'], available,
+                          out=np.zeros_like(available, dtype=float), where=available > 0)
+    profile = fit_seasonality(store['dates'], occupancy, holidays, ridge)
+    profile['room_types'] = np.asarray(store['room_types'])
+    return profile
+
+
+def daily_occupancy(profile, dates, holidays=None):
+    """Occupancy curve (day, series) for any dates, clipped to [0, 1]"""
+    holidays = profile['holidays'] if holidays is None else holidays
+    design = _design_matrix(dates, holidays)
+    coefficients = np.vstack([
+        profile['week_effect'],
+        profile['day_of_week_effect'],
+        np.atleast_2d(profile['holiday_effect'])
+    ])
+    return np.clip(design @ coefficients, 0, 1)
+
+
+def monthly_occupancy(profile, start_date, months, holidays=None):
+    """Average fitted occupancy per month (month, series) for a projection horizon"""
+    first = np.datetime64(f'{start_date.year:04d}-{start_date.month:02d}', 'M')
+    month_starts = (first + np.arange(months + 1)).astype('datetime64[D]')
+    dates = np.arange(month_starts[0], month_starts[-1])
+
+    daily = daily_occupancy(profile, dates, holidays)
+    boundaries = (month_starts[:-1] - month_starts[0]).astype(int)
+    days = np.diff(month_starts).astype(int)
+    return np.add.reduceat(daily, boundaries, axis=0) / days[:, None]
+
+
+def store_signature(store, holidays=None):
+    """Content hash of the inputs to a fit, used to skip unchanged refits"""
+    digest = hashlib.sha1()
+    for key in ('dates', 'available_bed_nights', 'sold_bed_nights'):
+        digest.update(np.ascontiguousarray(store[key]).tobytes())
+    digest.update(repr(sorted(str(holiday) for holiday in (holidays or []))).encode())
+    return digest.hexdigest()
+
+
+def save_profile(profile, path, signature=''):
+    """Cache a fitted profile as .npz"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    np.savez(path, signature=np.array(signature), **profile)
+
+
+def load_profile(path, signature=None):
+    """Load a cached profile, or None if missing or fitted from other data"""
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as cached:
+        if signature is not None and str(cached['signature']) != signature:
+            return None
+        return {key: cached[key] for key in cached.files if key != 'signature'}
+
+
+def fitted_profile(store, cache_path=None, holidays=None, ridge=1e-3):
+    """Return the cached profile for `store`, refitting only when the data changed"""
+    signature = store_signature(store, holidays)
+    if cache_path:
+        profile = load_profile(cache_path, signature)
+        if profile is not None:
+            return profile
+
+    profile = fit_from_store(store, holidays, ridge)
+    if cache_path:
+        save_profile(profile, cache_path, signature)
+    return profile
+
+
+def profile_for_room_types(profile, room_types):
+    """Reorder a profile's series to match a model's room types
+
+    Room types missing from the fitted data fall back to the mean of the
+    fitted series.
+    """
+    fitted = list(profile['room_types'])
+    columns = [fitted.index(name) if name in fitted else None for name in room_types]
+
+    def pick(effects):
+        effects = np.atleast_2d(effects)
+        mean = effects.mean(axis=-1)
+        return np.stack([effects[..., c] if c is not None else mean for c in columns], axis=-1)
+
+    return {
+        'week_effect': pick(profile['week_effect']),
+        'day_of_week_effect': pick(profile['day_of_week_effect']),
+        'holiday_effect': pick(profile['holiday_effect'])[0],
+        'holidays': profile['holidays'],
+        'room_types': np.asarray(list(room_types))
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    from datetime import datetime
+
+    from hostel_booking_ingest import load_store
+    from hostel_run_context import RunContext
+
+    parser = argparse.ArgumentParser(description='Fit seasonality from a cached daily booking store')
+    parser.add_argument('store', help='daily store written by hostel_booking_ingest.py')
+    parser.add_argument('--holidays', nargs='*', default=[], help="'YYYY-MM-DD' or recurring 'MM-DD'")
+    parser.add_argument('--cache', default='data/cache/seasonality.npz', help='profile cache file')
+    parser.add_argument('--year', type=int, default=RunContext.from_environment().as_of.year,
+                        help='year to print monthly occupancy for (default: the HOSTEL_AS_OF year)')
+    args = parser.parse_args()
+
+    profile = fitted_profile(load_store(args.store), args.cache, args.holidays)
+    curve = monthly_occupancy(profile, datetime(args.year, 1, 1), 12)
+    print('Month  ' + '  '.join(f'{name:>14}' for name in profile['room_types']))
+    for month, row in enumerate(curve, 1):
+        print(f'{month:>5}  ' + '  '.join(f'{value:>14.1%}' for value in row))
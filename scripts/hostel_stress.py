@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Hostel Stress Testing
+Library of named shock paths (pandemic closure, tourism slump, energy-price
+spike, currency shock) with month-by-month shapes and recovery curves,
+applied as overlays to projection drivers, and liquidity runway and
+covenant-breach metrics over any leading (stress, scenario, site) axes
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from openpyxl.formatting.rule import CellIsRule
+from openpyxl.styles import Font, PatternFill
+
+from hostel_cell_values import number_format
+
+
+# Each shock multiplies a driver by (1 + depth) from `start` for `duration`
+# months, then recovers linearly to no effect over `recovery` months; `fx`
+# scales the reporting-currency value of the functional currency, so it only
+# moves sites that report in another currency
+STRESS_LIBRARY = {
+    'pandemic_closure': {
+        'name': 'Pandemic Closure',
+        'start': 2,
+        'shocks': {
+            'occupancy': {'depth': -0.85, 'duration': 3, 'recovery': 18},
+            'rate': {'depth': -0.20, 'duration': 6, 'recovery': 12}
+        }
+    },
+    'tourism_slump': {
+        'name': 'Regional Tourism Slump',
+        'start': 4,
+        'shocks': {
+            'occupancy': {'depth': -0.25, 'duration': 9, 'recovery': 12},
+            'rate': {'depth': -0.10, 'duration': 9, 'recovery': 12}
+        }
+    },
+    'energy_spike': {
+        'name': 'Energy Price Spike',
+        'start': 9,
+        'shocks': {
+            'energy': {'depth': 0.80, 'duration': 6, 'recovery': 12}
+        }
+    },
+    'currency_shock': {
+        'name': 'Currency Shock',
+        'start': 6,
+        'shocks': {
+            'fx': {'depth': -0.20, 'duration': 6, 'recovery': 12},
+            'occupancy': {'depth': -0.10, 'duration': 6, 'recovery': 12},
+            'rate': {'depth': -0.05, 'duration': 6, 'recovery': 6},
+            'costs': {'depth': 0.08, 'duration': 12, 'recovery': 12}
+        }
+    }
+}
+
+STRESS_DRIVERS = ('occupancy', 'rate', 'costs', 'energy', 'fx')
+
+# Trailing-twelve-month DSCR floor and minimum cash balance
+DEFAULT_COVENANTS = {'min_dscr': 1.25, 'min_cash': 0.0}
+
+
+def shock_path(months, start, depth, duration, recovery):
+    """(month,) multiplier: 1 + depth through the trough, then a linear recovery"""
+    elapsed = np.arange(months) - start
+    trough = (elapsed >= 0) & (elapsed < duration)
+    recovering = elapsed - duration + 1
+    weight = np.where(trough, 1.0, 0.0)
+    if recovery > 0:
+        fading = (recovering >= 1) & (recovering <= recovery)
+        weight = np.where(fading, 1 - recovering / (recovery + 1), weight)
+    return 1 + depth * weight
+
+
+def build_stress_paths(stresses, months, baseline=True):
+    """Names and (stress, month) multiplier paths per driver
+
+    `stresses` maps keys to library entries; with `baseline` an unshocked
+    row comes first so every metric has its own reference.
+    """
+    names = (['Baseline'] if baseline else []) + [stress['name'] for stress in stresses.values()]
+    paths = {driver: np.ones((len(names), months)) for driver in STRESS_DRIVERS}
+    for row, stress in enumerate(stresses.values(), int(baseline)):
+        for driver, shock in stress['shocks'].items():
+            paths[driver][row] *= shock_path(months, stress.get('start', 0), **shock)
+    return names, paths
+
+
+def energy_overlay(costs, cost_drivers, energy_factor, energy_drivers=('utilities',)):
+    """Extra cost from scaling the energy-linked drivers by `energy_factor`
+
+    Variable and fixed cost lines named in `energy_drivers` are energy
+    costs; `energy_factor` broadcasts to (..., month).
+    """
+    variable_names = list(cost_drivers['variable'])
+    energy = sum(costs['variable_costs'][..., variable_names.index(name)]
+                 for name in energy_drivers if name in variable_names)
+    fixed_total = sum(cost_drivers['fixed'].values())
+    if fixed_total:
+        fixed_share = sum(cost_drivers['fixed'].get(name, 0) for name in energy_drivers) / fixed_total
+        energy = energy + costs['fixed_costs'] * fixed_share
+    return energy * (np.asarray(energy_factor, dtype=float) - 1)
+
+
+def trailing_sum(values, window=12):
+    """Trailing `window`-month sum along the month axis (to date before a full window)"""
+    cumulative = np.cumsum(values, axis=-1)
+    lagged = np.zeros_like(cumulative)
+    lagged[..., window:] = cumulative[..., :-window]
+    return cumulative - lagged
+
+
+def _first_month(flags):
+    """Index of the first True month, or -1 where there is none"""
+    return np.where(flags.any(axis=-1), np.argmax(flags, axis=-1), -1)
+
+
+def stress_metrics(cash, cash_available, debt_service, covenants=DEFAULT_COVENANTS):
+    """Liquidity runway and covenant flags for (..., month) stressed arrays
+
+    Runway is the number of months before cash first falls below zero (the
+    full horizon if it never does). DSCR is tested on trailing-twelve-month
+    cash available for debt service against debt service.
+    """
+    months = cash.shape[-1]
+    short = cash < 0
+    runway = np.where(short.any(axis=-1), np.argmax(short, axis=-1), months)
+
+    available, service = np.broadcast_arrays(trailing_sum(cash_available), trailing_sum(debt_service))
+    dscr = np.divide(available, service, out=np.full(service.shape, np.inf), where=service > 0)
+    dscr_breach = dscr < covenants['min_dscr']
+    cash_breach = cash < covenants['min_cash']
+
+    return {
+        'Runway_Months': runway,
+        'Min_Cash': cash.min(axis=-1),
+        'Min_Cash_Month': cash.argmin(axis=-1),
+        'Min_DSCR_T12': dscr.min(axis=-1),
+        'DSCR_Breach': dscr_breach.any(axis=-1),
+        'First_DSCR_Breach_Month': _first_month(dscr_breach),
+        'Cash_Breach': cash_breach.any(axis=-1),
+        'First_Cash_Breach_Month': _first_month(cash_breach)
+    }
+
+
+def write_stress_sheet(ws, results, currency='USD'):
+    """Write stress results with breach flags highlighted by one rule per column"""
+    ws['A1'] = 'Stress Tests - Liquidity Runway and Covenants'
+    ws['A1'].font = Font(size=14, bold=True)
+
+    header_row = 3
+    for col, header in enumerate(results.columns, 1):
+        cell = ws.cell(row=header_row, column=col, value=header)
+        cell.fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+        cell.font = Font(color='FFFFFF', bold=True)
+
+    number_formats = {'Revenue': number_format('currency', currency), 'Net_Income': number_format('currency', currency),
+                      'Min_Cash': number_format('currency_signed', currency), 'Min_DSCR_T12': '0.00'}
+    for row, values in enumerate(results.itertuples(index=False), header_row + 1):
+        for col, (header, value) in enumerate(zip(results.columns, values), 1):
+            value = value.item() if hasattr(value, 'item') else value
+            if isinstance(value, float) and not np.isfinite(value):
+                value = None
+            cell = ws.cell(row=row, column=col, value=value)
+            if header in number_formats:
+                cell.number_format = number_formats[header]
+
+    last_row = header_row + len(results)
+    breach_fill = PatternFill(start_color='F8696B', end_color='F8696B', fill_type='solid')
+    for col, header in enumerate(results.columns, 1):
+        if header.endswith('_Breach'):
+            letter = ws.cell(row=header_row, column=col).column_letter
+            ws.conditional_formatting.add(f'{letter}{header_row + 1}:{letter}{last_row}',
+                                          CellIsRule(operator='equal', formula=['TRUE'], fill=breach_fill))
+    for letter, width in zip('ABCDEFGHIJKL', [24, 14] + [16] * 10):
+        ws.column_dimensions[letter].width = width
+
+
+if __name__ == "__main__":
+    from hostel_financial_model_enhanced import EnhancedHostelFinancialModel
+
+    parser = argparse.ArgumentParser(description='Run the stress library against every scenario')
+    parser.add_argument('--stress', action='append', choices=sorted(STRESS_LIBRARY), help='default: all')
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--opening-cash', type=float, default=50000, help='liquidity reserve at the start')
+    parser.add_argument('--min-dscr', type=float, default=DEFAULT_COVENANTS['min_dscr'])
+    parser.add_argument('--currency', default='USD', help='functional currency of the site (reported in USD)')
+    parser.add_argument('--output', help='CSV file for the results')
+    args = parser.parse_args()
+
+    model = EnhancedHostelFinancialModel(hostel_name="Hostel Diary")
+    model.set_currency(args.currency)
+    stresses = {key: STRESS_LIBRARY[key] for key in (args.stress or STRESS_LIBRARY)}
+    covenants = dict(DEFAULT_COVENANTS, min_dscr=args.min_dscr)
+    results = model.run_stress_tests(stresses, years=args.years, opening_cash=args.opening_cash, covenants=covenants)
+    with pd.option_context('display.width', 200):
+        print(results.to_string(index=False))
+    if args.output:
+        results.to_csv(args.output, index=False)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Hostel Tax and Depreciation
+Depreciation of capex by asset class and method, annual income tax with
+loss carry-forward, and VAT on room revenue, all computed with cumulative
+array operations over (..., month) arrays so scenarios and simulation paths
+run in one pass
+"""
+
+import argparse
+
+import numpy as np
+
+
+# Shares of capex by asset class; `factor` is the declining-balance multiple
+DEFAULT_ASSET_CLASSES = {
+    'building_improvements': {'share': 0.55, 'method': 'straight_line', 'life_years': 25},
+    'furniture_fixtures': {'share': 0.30, 'method': 'declining_balance', 'life_years': 7, 'factor': 2.0},
+    'equipment_it': {'share': 0.15, 'method': 'straight_line', 'life_years': 3}
+}
+
+DEPRECIATION_METHODS = ('straight_line', 'declining_balance', 'sum_of_years_digits')
+
+# Output VAT on room revenue, remitted the month after each quarter
+DEFAULT_VAT = {'rate': 0.10, 'remittance_months': 3}
+
+
+def depreciation_kernel(method, life_months, months, factor=2.0):
+    """(month,) share of an asset's cost depreciated at each month of age
+
+    Declining balance switches to straight-line over the remaining life
+    once that charges more, so every method depreciates the full cost.
+    """
+    age = np.arange(months)
+    alive = age < life_months
+    if method == 'straight_line':
+        kernel = np.full(months, 1.0 / life_months)
+    elif method == 'declining_balance':
+        rate = min(factor / life_months, 1.0)
+        switch = max(int(np.ceil(life_months - 1 / rate)), 0)
+        book_value = (1 - rate) ** np.minimum(age, switch)
+        kernel = np.where(age < switch, rate * book_value, book_value / (life_months - switch))
+    elif method == 'sum_of_years_digits':
+        kernel = (life_months - age) / (life_months * (life_months + 1) / 2)
+    else:
+        raise ValueError(f"Unknown depreciation method {method!r}; expected one of {DEPRECIATION_METHODS}")
+    return np.where(alive, kernel, 0.0)
+
+
+def depreciate(capex, kernel):
+    """Monthly depreciation of (..., month) capex, each spend aged by `kernel`
+
+    The convolution runs through an FFT along the month axis, so long
+    horizons cost O(n log n) rather than a month-by-month schedule.
+    """
+    capex = np.asarray(capex, dtype=float)
+    months = capex.shape[-1]
+    size = 2 * months
+    spectrum = np.fft.rfft(capex, size, axis=-1) * np.fft.rfft(kernel[:months], size)
+    return np.fft.irfft(spectrum, size, axis=-1)[..., :months]
+
+
+def build_depreciation(capex, asset_classes=DEFAULT_ASSET_CLASSES):
+    """Depreciation of (..., month) capex split across asset classes
+
+    Returns each class's depreciation and the total; class shares should
+    sum to one.
+    """
+    capex = np.asarray(capex, dtype=float)
+    months = capex.shape[-1]
+    by_class = {
+        name: depreciate(capex * asset['share'],
+                         depreciation_kernel(asset['method'], asset['life_years'] * 12, months,
+                                             asset.get('factor', 2.0)))
+        for name, asset in asset_classes.items()
+    }
+    return {'by_class': by_class, 'total': sum(by_class.values(), np.zeros(capex.shape))}
+
+
+def _tax_periods(periods, months):
+    """Index of the last month of each tax period and each month's period number"""
+    periods = np.arange(months) // 12 if periods is None else np.asarray(periods)
+    new_period = np.diff(periods) != 0
+    ends = np.append(np.flatnonzero(new_period), months - 1)
+    number = np.concatenate([[0], np.cumsum(new_period)])
+    return ends, number
+
+
+def tax_with_loss_carryforward(pre_tax_income, tax_rate, periods=None):
+    """Monthly tax on annual taxable income with unlimited loss carry-forward
+
+    `periods` labels each month's tax period (e.g. the fiscal year) and
+    defaults to twelve-month periods from the first month. Income is taxed
+    only above the highest cumulative income already taxed at an earlier
+    period end (a running maximum), which is loss carry-forward. Within a
+    period, tax accrues on the year-to-date position, so a later loss
+    month reverses earlier accruals and each period totals its annual tax.
+    """
+    income = np.asarray(pre_tax_income, dtype=float)
+    months = income.shape[-1]
+    ends, number = _tax_periods(periods, months)
+
+    cumulative = np.cumsum(income, axis=-1)
+    taxed_at_end = np.maximum.accumulate(np.maximum(cumulative[..., ends], 0), axis=-1)
+    prior = np.concatenate([np.zeros(taxed_at_end.shape[:-1] + (1,)), taxed_at_end[..., :-1]], axis=-1)
+    taxed_to_date = np.maximum(prior[..., number], cumulative)
+
+    return {
+        'tax': np.diff(taxed_to_date * tax_rate, axis=-1, prepend=0),
+        'taxable_income': np.diff(taxed_to_date, axis=-1, prepend=0),
+        'loss_carryforward': taxed_to_date - cumulative
+    }
+
+
+def period_totals(values, periods=None):
+    """(..., period) sums of (..., month) values over the tax periods"""
+    values = np.asarray(values, dtype=float)
+    ends, _ = _tax_periods(periods, values.shape[-1])
+    cumulative = np.cumsum(values, axis=-1)[..., ends]
+    return np.diff(cumulative, axis=-1, prepend=0)
+
+
+def vat_schedule(net_revenue, rate=DEFAULT_VAT['rate'], remittance_months=DEFAULT_VAT['remittance_months']):
+    """Output VAT collected on (..., month) net revenue, its remittances and payable balance
+
+    VAT collected in each remittance period is paid in the first month of
+    the next period.
+    """
+    collected = np.asarray(net_revenue, dtype=float) * rate
+    months = collected.shape[-1]
+    cumulative = np.cumsum(collected, axis=-1)
+    last_period_end = (np.arange(months) // remittance_months) * remittance_months - 1
+    remitted_to_date = np.where(last_period_end >= 0, cumulative[..., np.clip(last_period_end, 0, None)], 0.0)
+    return {
+        'collected': collected,
+        'remitted': np.diff(remitted_to_date, axis=-1, prepend=0),
+        'payable': cumulative - remitted_to_date
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Show depreciation by asset class for a capex amount')
+    parser.add_argument('capex', type=float)
+    parser.add_argument('--years', type=int, default=10)
+    args = parser.parse_args()
+
+    months = args.years * 12
+    capex = np.zeros(months)
+    capex[0] = args.capex
+    depreciation = build_depreciation(capex)
+    annual = {name: period_totals(values) for name, values in depreciation['by_class'].items()}
+    print(f"{'Year':<6}" + ''.join(f"{name:>24}" for name in annual) + f"{'Total':>14}")
+    for year in range(args.years):
+        print(f"{year + 1:<6}" + ''.join(f"{values[year]:>24,.0f}" for values in annual.values())
+              + f"{sum(values[year] for values in annual.values()):>14,.0f}")
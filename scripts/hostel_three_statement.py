@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Hostel Three-Statement Engine
+Linked income statement, cash flow statement and balance sheet computed with
+cumulative array operations over monthly projection arrays
+"""
+
+import numpy as np
+
+from hostel_tax import tax_with_loss_carryforward
+
+
+def _lag(values, periods=1):
+    """Shift values right along the month axis, filling with zeros"""
+    if periods >= values.shape[-1]:
+        return np.zeros_like(values)
+    pad = np.zeros_like(values[..., :periods])
+    return np.concatenate([pad, values[..., :-periods]], axis=-1)
+
+
+def straight_line_depreciation(capex, useful_life_months):
+    """Monthly straight-line depreciation of a capex array, starting in the month spent"""
+    cumulative_capex = np.cumsum(capex, axis=-1)
+    return (cumulative_capex - _lag(cumulative_capex, useful_life_months)) / useful_life_months
+
+
+def build_three_statements(revenue, operating_expenses, capex=0.0, debt=None,
+                           equity_contributions=0.0, tax_rate=0.25, depreciation_months=120,
+                           receivable_days=0.0, payable_days=0.0, opening_cash=0.0,
+                           days_in_month=30.0, depreciation=None, tax_periods=None, vat=None):
+    """Build linked monthly statements from (..., month) driver arrays
+
+    `debt` is a schedule total from hostel_financing.build_debt_schedule.
+    Leading axes (scenario, simulation path) broadcast through every line.
+    Opening cash is treated as contributed equity. `depreciation` replaces
+    straight-line depreciation (e.g. hostel_tax.build_depreciation by asset
+    class), tax is assessed over `tax_periods` with loss carry-forward, and
+    `vat` is a hostel_tax.vat_schedule whose payable balance is a liability.
+    """
+    revenue, operating_expenses, capex, equity_contributions = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in
+          (revenue, operating_expenses, capex, equity_contributions))
+    )
+    shape = revenue.shape
+    zeros = np.zeros(shape)
+    debt = debt or {}
+    draws = np.broadcast_to(debt.get('draws', zeros), shape)
+    interest = np.broadcast_to(debt.get('interest', zeros) + debt.get('fees', zeros), shape)
+    principal = np.broadcast_to(debt.get('principal', zeros), shape)
+    debt_balance = np.broadcast_to(debt.get('closing_balance', zeros), shape)
+
+    # Income statement
+    ebitda = revenue - operating_expenses
+    if depreciation is None:
+        depreciation = straight_line_depreciation(capex, depreciation_months)
+    depreciation = np.broadcast_to(depreciation, shape)
+    ebit = ebitda - depreciation
+    pre_tax_income = ebit - interest
+    tax = tax_with_loss_carryforward(pre_tax_income, tax_rate, tax_periods)
+    net_income = pre_tax_income - tax['tax']
+
+    # Working capital balances
+    receivables = revenue * receivable_days / days_in_month
+    payables = operating_expenses * payable_days / days_in_month
+    vat_payable = np.broadcast_to(vat['payable'], shape) if vat is not None else zeros
+    working_capital_change = ((receivables - _lag(receivables)) - (payables - _lag(payables))
+                              - (vat_payable - _lag(vat_payable)))
+
+    # Cash flow statement
+    operating_cash_flow = net_income + depreciation - working_capital_change
+    investing_cash_flow = -capex
+    financing_cash_flow = draws - principal + equity_contributions
+    net_cash_flow = operating_cash_flow + investing_cash_flow + financing_cash_flow
+    cash = opening_cash + np.cumsum(net_cash_flow, axis=-1)
+
+    # Balance sheet
+    fixed_assets = np.cumsum(capex - depreciation, axis=-1)
+    total_assets = cash + receivables + fixed_assets
+    contributed_equity = opening_cash + np.cumsum(equity_contributions, axis=-1)
+    retained_earnings = np.cumsum(net_income, axis=-1)
+    total_liabilities = payables + vat_payable + debt_balance
+    total_equity = contributed_equity + retained_earnings
+
+    return {
+        'income_statement': {
+            'Revenue': revenue,
+            'Operating_Expenses': operating_expenses,
+            'EBITDA': ebitda,
+            'Depreciation': depreciation,
+            'EBIT': ebit,
+            'Interest': interest,
+            'Pre_Tax_Income': pre_tax_income,
+            'Tax': tax['tax'],
+            'Net_Income': net_income,
+            'Loss_Carryforward': tax['loss_carryforward']
+        },
+        'cash_flow': {
+            'Net_Income': net_income,
+            'Depreciation': depreciation,
+            'Working_Capital_Change': -working_capital_change,
+            'Operating_Cash_Flow': operating_cash_flow,
+            'Capex': investing_cash_flow,
+            'Debt_Drawdown': draws,
+            'Debt_Repayment': -principal,
+            'Equity_Contribution': equity_contributions,
+            'Financing_Cash_Flow': financing_cash_flow,
+            'Net_Cash_Flow': net_cash_flow,
+            'Cash_Balance': cash
+        },
+        'balance_sheet': {
+            'Cash': cash,
+            'Receivables': receivables,
+            'Fixed_Assets': fixed_assets,
+            'Total_Assets': total_assets,
+            'Payables': payables,
+            'VAT_Payable': vat_payable,
+            'Debt': debt_balance,
+            'Total_Liabilities': total_liabilities,
+            'Contributed_Equity': contributed_equity,
+            'Retained_Earnings': retained_earnings,
+            'Total_Equity': total_equity
+        },
+        'balance_check': total_assets - total_liabilities - total_equity
+    }
+
+
+def check_statements(statements, tolerance=0.01):
+    """Raise ValueError if the balance sheet or cash roll-forward does not tie out"""
+    imbalance = np.abs(statements['balance_check'])
+    if imbalance.max(initial=0) > tolerance:
+        raise ValueError(f"Balance sheet does not balance: max difference {imbalance.max():,.2f}")
+
+    cash_flow = statements['cash_flow']
+    closing = cash_flow['Cash_Balance']
+    rolled = closing[..., :1] + np.cumsum(cash_flow['Net_Cash_Flow'][..., 1:], axis=-1)
+    if np.abs(rolled - closing[..., 1:]).max(initial=0) > tolerance:
+        raise ValueError("Cash balance does not roll forward from net cash flow")
+
+    if np.abs(statements['balance_sheet']['Cash'] - closing).max(initial=0) > tolerance:
+        raise ValueError("Balance sheet cash does not match the cash flow statement")
+    return True
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Hostel Valuation
+Discounted cash flow over any monthly horizon with a Gordon-growth terminal
+value, vectorized over leading (scenario, site, simulation path) axes
+"""
+
+import numpy as np
+
+from hostel_capacity import npv
+
+
+DEFAULT_DISCOUNT_RATE = 0.10
+DEFAULT_TERMINAL_GROWTH = 0.02
+
+
+def gordon_terminal_value(cash_flows, discount_rate=DEFAULT_DISCOUNT_RATE,
+                          growth_rate=DEFAULT_TERMINAL_GROWTH, window=12):
+    """Horizon-end value of the final `window` months' cash flow growing forever
+
+    The last twelve months are the run-rate year; the next year's cash flow
+    is that run rate grown by `growth_rate`, capitalized at
+    `discount_rate - growth_rate`.
+    """
+    if np.any(np.asarray(discount_rate) <= np.asarray(growth_rate)):
+        raise ValueError("Terminal growth must be below the discount rate")
+    run_rate = np.asarray(cash_flows, dtype=float)[..., -window:].sum(axis=-1) * 12 / min(window, np.shape(cash_flows)[-1])
+    return run_rate * (1 + growth_rate) / (discount_rate - growth_rate)
+
+
+def discounted_cash_flow(cash_flows, discount_rate=DEFAULT_DISCOUNT_RATE,
+                         growth_rate=DEFAULT_TERMINAL_GROWTH, initial_investment=0.0):
+    """PV of (..., month) cash flows plus the discounted Gordon terminal value
+
+    Monthly discounting follows hostel_capacity.npv; the terminal value is
+    discounted from the end of the last month.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    months = cash_flows.shape[-1]
+    pv_cash_flows = npv(cash_flows, discount_rate)
+    terminal_value = gordon_terminal_value(cash_flows, discount_rate, growth_rate)
+    pv_terminal_value = terminal_value * (1 + discount_rate) ** (-months / 12)
+    enterprise_value = pv_cash_flows + pv_terminal_value
+    return {
+        'pv_cash_flows': pv_cash_flows,
+        'terminal_value': terminal_value,
+        'pv_terminal_value': pv_terminal_value,
+        'enterprise_value': enterprise_value,
+        'terminal_share': np.divide(pv_terminal_value, enterprise_value,
+                                    out=np.zeros(np.shape(enterprise_value)), where=enterprise_value != 0),
+        'npv': enterprise_value - initial_investment
+    }
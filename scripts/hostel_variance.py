@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Hostel Budget vs Actual Variance Engine
+Appends monthly actuals to a stored projection, decomposes room revenue
+variance into price, volume and mix per room type, re-forecasts the open
+months and rewrites only the variance sheet of an existing workbook
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.styles import Font, PatternFill
+
+from hostel_cell_values import number_format
+from hostel_kpi_engine import month_calendar
+from hostel_run_context import RunContext, refinalize_run
+
+
+VARIANCE_SHEET = 'Budget vs Actual'
+RUN_RATE_MONTHS = 3
+
+
+class VarianceTracker:
+    """Budget, actuals, variance and re-forecast arrays for one hostel"""
+
+    def __init__(self, start_year, start_month, room_types, budget_sold, budget_revenue, budget_expenses):
+        """Store the budget as (month, room_type) volume/revenue and (month,) expenses"""
+        self.start_year = start_year
+        self.start_month = start_month
+        self.room_types = list(room_types)
+        self.budget_sold = np.asarray(budget_sold, dtype=float)
+        self.budget_revenue = np.asarray(budget_revenue, dtype=float)
+        self.budget_expenses = np.asarray(budget_expenses, dtype=float)
+
+        shape = self.budget_sold.shape
+        self.actual_sold = np.full(shape, np.nan)
+        self.actual_revenue = np.full(shape, np.nan)
+        self.actual_expenses = np.full(shape[0], np.nan)
+        self.price_variance = np.full(shape, np.nan)
+        self.volume_variance = np.full(shape, np.nan)
+        self.mix_variance = np.full(shape, np.nan)
+        self.forecast_sold = self.budget_sold.copy()
+        self.forecast_revenue = self.budget_revenue.copy()
+        self.forecast_expenses = self.budget_expenses.copy()
+        self.closed_months = 0
+
+    @classmethod
+    def from_bed_nights(cls, start_date, room_types, bed_nights, expenses):
+        """Create a tracker from hostel_kpi_engine bed-night arrays"""
+        return cls(start_date.year, start_date.month, room_types,
+                   bed_nights['sold_bed_nights'], bed_nights['room_revenue'], expenses)
+
+    @property
+    def months(self):
+        return len(self.budget_expenses)
+
+    def position(self, year, month):
+        """Horizon position of a calendar month"""
+        return (year * 12 + month - 1) - (self.start_year * 12 + self.start_month - 1)
+
+    def append_actuals(self, year, month, sold, revenue, expenses):
+        """Record one closed month and refresh its variance and the forecast tail"""
+        position = self.position(year, month)
+        if not 0 <= position < self.months:
+            raise ValueError(f"{year}-{month:02d} is outside the projection horizon")
+
+        self.actual_sold[position] = sold
+        self.actual_revenue[position] = revenue
+        self.actual_expenses[position] = expenses
+        self._update_variance(slice(position, position + 1))
+
+        # Closed months carry actuals in the forecast
+        self.forecast_sold[position] = sold
+        self.forecast_revenue[position] = revenue
+        self.forecast_expenses[position] = expenses
+
+        self.closed_months = max(self.closed_months, position + 1)
+        self._reforecast_tail()
+
+    def _update_variance(self, months):
+        """Price, volume and mix variance per room type for the given months"""
+        budget_sold = self.budget_sold[months]
+        actual_sold = self.actual_sold[months]
+        budget_rate = np.divide(self.budget_revenue[months], budget_sold,
+                                out=np.zeros_like(budget_sold), where=budget_sold > 0)
+        actual_rate = np.divide(self.actual_revenue[months], actual_sold,
+                                out=np.zeros_like(actual_sold), where=actual_sold > 0)
+
+        budget_total = budget_sold.sum(axis=-1, keepdims=True)
+        actual_total = actual_sold.sum(axis=-1, keepdims=True)
+        budget_mix = np.divide(budget_sold, budget_total, out=np.zeros_like(budget_sold), where=budget_total > 0)
+        actual_mix = np.divide(actual_sold, actual_total, out=np.zeros_like(actual_sold), where=actual_total > 0)
+
+        # Components sum to actual revenue minus budget revenue per room type
+        self.price_variance[months] = (actual_rate - budget_rate) * actual_sold
+        self.mix_variance[months] = (actual_mix - budget_mix) * actual_total * budget_rate
+        self.volume_variance[months] = (actual_total - budget_total) * budget_mix * budget_rate
+
+    def _reforecast_tail(self):
+        """Scale open months by the trailing actual/budget run-rate"""
+        closed = self.closed_months
+        window = slice(max(0, closed - RUN_RATE_MONTHS), closed)
+        observed = ~np.isnan(self.actual_expenses[window])
+        if not observed.any():
+            return
+
+        def ratio(actual, budget):
+            actual_total = np.nansum(actual[window][observed], axis=0)
+            budget_total = budget[window][observed].sum(axis=0)
+            return np.divide(actual_total, budget_total, out=np.ones_like(budget_total, dtype=float),
+                             where=budget_total > 0)
+
+        volume_ratio = ratio(self.actual_sold, self.budget_sold)
+        revenue_ratio = ratio(self.actual_revenue, self.budget_revenue)
+        expense_ratio = ratio(self.actual_expenses, self.budget_expenses)
+
+        self.forecast_sold[closed:] = self.budget_sold[closed:] * volume_ratio
+        self.forecast_revenue[closed:] = self.budget_revenue[closed:] * revenue_ratio
+        self.forecast_expenses[closed:] = self.budget_expenses[closed:] * expense_ratio
+
+    def variance_frame(self):
+        """Month x room type variance table for the closed months"""
+        closed = self.closed_months
+        calendar = month_calendar(pd.Timestamp(self.start_year, self.start_month, 1), closed)
+        room_count = len(self.room_types)
+
+        def flat(values):
+            return values[:closed].ravel()
+
+        return pd.DataFrame({
+            'Year': np.repeat(calendar['year'], room_count),
+            'Month': np.repeat(calendar['month'], room_count),
+            'Room_Type': np.tile(self.room_types, closed),
+            'Budget_Revenue': flat(self.budget_revenue),
+            'Actual_Revenue': flat(self.actual_revenue),
+            'Revenue_Variance': flat(self.actual_revenue - self.budget_revenue),
+            'Price_Variance': flat(self.price_variance),
+            'Volume_Variance': flat(self.volume_variance),
+            'Mix_Variance': flat(self.mix_variance),
+            'Budget_Bed_Nights': flat(self.budget_sold),
+            'Actual_Bed_Nights': flat(self.actual_sold)
+        })
+
+    def forecast_frame(self):
+        """Budget vs latest forecast per month (actuals for closed months)"""
+        calendar = month_calendar(pd.Timestamp(self.start_year, self.start_month, 1), self.months)
+        return pd.DataFrame({
+            'Year': calendar['year'],
+            'Month': calendar['month'],
+            'Status': np.where(np.arange(self.months) < self.closed_months, 'Actual', 'Forecast'),
+            'Budget_Revenue': self.budget_revenue.sum(axis=-1),
+            'Forecast_Revenue': self.forecast_revenue.sum(axis=-1),
+            'Budget_Expenses': self.budget_expenses,
+            'Forecast_Expenses': self.forecast_expenses,
+            'Forecast_Net_Income': self.forecast_revenue.sum(axis=-1) - self.forecast_expenses
+        })
+
+    def write_variance_sheet(self, workbook_path, currency='USD', context=None):
+        """Replace only the variance sheet of an existing workbook (amounts in `currency`)
+
+        The workbook is finalized again so its run manifest matches the file.
+        """
+        workbook = load_workbook(workbook_path)
+        if VARIANCE_SHEET in workbook.sheetnames:
+            del workbook[VARIANCE_SHEET]
+        ws = workbook.create_sheet(VARIANCE_SHEET)
+
+        ws['A1'] = 'Budget vs Actual - Room Revenue Variance'
+        ws['A1'].font = Font(size=14, bold=True)
+
+        money = number_format('currency_signed', currency)
+        row = 3
+        for title, frame in [('Variance by Room Type', self.variance_frame()),
+                             ('Re-forecast', self.forecast_frame())]:
+            ws.cell(row=row, column=1, value=title).font = Font(bold=True, size=12)
+            row += 1
+            for col, header in enumerate(frame.columns, 1):
+                cell = ws.cell(row=row, column=col, value=header)
+                cell.fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+                cell.font = Font(color='FFFFFF', bold=True)
+            for values in frame.itertuples(index=False):
+                row += 1
+                for col, value in enumerate(values, 1):
+                    value = value.item() if hasattr(value, 'item') else value
+                    if isinstance(value, float) and np.isnan(value):
+                        value = None
+                    cell = ws.cell(row=row, column=col, value=value)
+                    if isinstance(value, float):
+                        cell.number_format = money
+            row += 3
+
+        workbook.save(workbook_path)
+        refinalize_run(workbook_path, workbook, context or RunContext.from_environment())
+
+    def save(self, path):
+        """Persist all arrays so the next month only appends"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez_compressed(path, **{
+            name: np.asarray(value) for name, value in vars(self).items()
+        })
+
+    @classmethod
+    def load(cls, path):
+        """Restore a tracker saved with save()"""
+        with np.load(path, allow_pickle=False) as stored:
+            tracker = cls.__new__(cls)
+            for name in stored.files:
+                value = stored[name]
+                setattr(tracker, name, value.item() if value.ndim == 0 else value)
+            tracker.room_types = [str(name) for name in tracker.room_types]
+        return tracker
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Append a month of actuals and refresh the variance sheet')
+    parser.add_argument('actuals', help='CSV with room_type, bed_nights and room_revenue columns for one month')
+    parser.add_argument('--month', required=True, help='closed month as YYYY-MM')
+    parser.add_argument('--expenses', type=float, required=True, help='actual operating expenses for the month')
+    parser.add_argument('--store', default='data/cache/variance.npz', help='variance tracker store')
+    parser.add_argument('--workbook', default='hostel_diary_financial_model_enhanced.xlsx')
+    parser.add_argument('--currency', default='USD', help='currency of the actuals and budget')
+    args = parser.parse_args()
+
+    if os.path.exists(args.store):
+        tracker = VarianceTracker.load(args.store)
+    else:
+        from datetime import datetime
+        from hostel_financial_model_enhanced import EnhancedHostelFinancialModel
+
+        # Budget from the enhanced model's base case, commissions counted as costs
+        model = EnhancedHostelFinancialModel(hostel_name="Hostel Diary")
+        projections = model.generate_scenario_projections()
+        tracker = VarianceTracker.from_bed_nights(
+            datetime(model.start_date.year, 1, 1), model.room_types,
+            model.scenario_bed_nights['base'],
+            (projections['base']['Expenses'] + projections['base']['Commission']).to_numpy()
+        )
+
+    actuals = pd.read_csv(args.actuals).set_index('room_type').reindex(tracker.room_types).fillna(0)
+    year, month = (int(part) for part in args.month.split('-'))
+    tracker.append_actuals(year, month, actuals['bed_nights'].to_numpy(),
+                           actuals['room_revenue'].to_numpy(), args.expenses)
+    tracker.save(args.store)
+    tracker.write_variance_sheet(args.workbook, args.currency)
+    print(f"Variance sheet updated for {args.month}: {args.workbook}")
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Hostel Workbook Diff
+Reports which figures moved between two generated workbooks: compares the
+projection array sidecars when both runs wrote them, and otherwise streams
+both xlsx files through read-only openpyxl, sheet by sheet and row by row
+"""
+
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import zip_longest
+
+import numpy as np
+from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
+
+from hostel_run_context import arrays_path, current_manifest
+
+
+DEFAULT_RTOL = 1e-6
+DEFAULT_ATOL = 0.005
+MAX_CHANGES = 1000
+
+CHANGE_FIELDS = ['location', 'left', 'right', 'difference']
+
+
+def _load_arrays(workbook_path):
+    """Array sidecar of a finalized workbook, or None"""
+    path = arrays_path(workbook_path)
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as stored:
+        return {name: stored[name] for name in stored.files}
+
+
+def diff_arrays(left, right, rtol=DEFAULT_RTOL, atol=DEFAULT_ATOL, max_changes=MAX_CHANGES):
+    """Element-wise changes and per-array totals between two named array sets
+
+    Arrays present on one side only, or with different shapes, are reported
+    as wholly changed.
+    """
+    changes, summary = [], []
+    for name in sorted(set(left) | set(right)):
+        a = left.get(name)
+        b = right.get(name)
+        if a is None or b is None or a.shape != b.shape:
+            summary.append({
+                'name': name, 'changed': 'shape' if a is not None and b is not None else 'missing',
+                'left_total': float(np.sum(a)) if a is not None else None,
+                'right_total': float(np.sum(b)) if b is not None else None,
+                'max_abs_difference': None
+            })
+            continue
+
+        a = a.astype(float)
+        b = b.astype(float)
+        moved = ~np.isclose(a, b, rtol=rtol, atol=atol, equal_nan=True)
+        count = int(moved.sum())
+        difference = np.abs(b - a)
+        summary.append({
+            'name': name, 'changed': count,
+            'left_total': float(np.nansum(a)), 'right_total': float(np.nansum(b)),
+            'max_abs_difference': float(np.nanmax(difference, initial=0))
+        })
+        for index in zip(*np.nonzero(moved)):
+            if len(changes) >= max_changes:
+                break
+            changes.append({
+                'location': f"{name}[{','.join(str(i) for i in index)}]",
+                'left': float(a[index]), 'right': float(b[index]),
+                'difference': float(b[index] - a[index])
+            })
+    return changes, summary
+
+
+def _values_differ(a, b, rtol, atol):
+    """Compare two cell values, numbers within tolerance"""
+    numeric = (int, float)
+    if isinstance(a, numeric) and isinstance(b, numeric) and not isinstance(a, bool) and not isinstance(b, bool):
+        # Scalar form of np.isclose, which is slow per cell
+        return abs(a - b) > atol + rtol * abs(b)
+    return a != b
+
+
+def diff_cells(left_path, right_path, rtol=DEFAULT_RTOL, atol=DEFAULT_ATOL, max_changes=MAX_CHANGES):
+    """Cell-level changes between two xlsx files in one streaming pass
+
+    Both workbooks are opened read-only and walked in lockstep, so memory
+    stays at one row per side regardless of workbook size.
+    """
+    left_book = load_workbook(left_path, read_only=True, data_only=True)
+    right_book = load_workbook(right_path, read_only=True, data_only=True)
+    changes, summary = [], []
+    try:
+        for sheet in list(dict.fromkeys(left_book.sheetnames + right_book.sheetnames)):
+            if sheet not in left_book.sheetnames or sheet not in right_book.sheetnames:
+                summary.append({'name': sheet, 'changed': 'missing', 'left_total': None,
+                                'right_total': None, 'max_abs_difference': None})
+                continue
+
+            count, left_total, right_total, max_difference = 0, 0.0, 0.0, 0.0
+            rows = zip_longest(left_book[sheet].iter_rows(values_only=True),
+                               right_book[sheet].iter_rows(values_only=True), fillvalue=())
+            for row_number, (left_row, right_row) in enumerate(rows, 1):
+                for col, (a, b) in enumerate(zip_longest(left_row, right_row), 1):
+                    if isinstance(a, (int, float)) and not isinstance(a, bool):
+                        left_total += a
+                    if isinstance(b, (int, float)) and not isinstance(b, bool):
+                        right_total += b
+                    if not _values_differ(a, b, rtol, atol):
+                        continue
+                    count += 1
+                    difference = None
+                    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+                        difference = b - a
+                        max_difference = max(max_difference, abs(difference))
+                    if len(changes) < max_changes:
+                        changes.append({
+                            'location': f'{sheet}!{get_column_letter(col)}{row_number}',
+                            'left': a, 'right': b, 'difference': difference
+                        })
+            summary.append({'name': sheet, 'changed': count, 'left_total': left_total,
+                            'right_total': right_total, 'max_abs_difference': max_difference})
+    finally:
+        left_book.close()
+        right_book.close()
+    return changes, summary
+
+
+def diff_workbooks(left_path, right_path, rtol=DEFAULT_RTOL, atol=DEFAULT_ATOL,
+                   max_changes=MAX_CHANGES, cells=False):
+    """Diff two generated workbooks using the cheapest available evidence
+
+    Equal run fingerprints mean identical content; array sidecars are
+    compared next; the streaming cell pass is the fallback (or forced with
+    `cells=True`). The sidecars only hold the projection frames, so when
+    they match but the fingerprints differ the change is on another sheet
+    and the cell pass finds it. Manifests and sidecars are only trusted
+    while the file still has the bytes its manifest recorded; a workbook
+    edited after it was finalized always gets the cell pass.
+    """
+    left_manifest = current_manifest(left_path)
+    right_manifest = current_manifest(right_path)
+    trusted = not cells and left_manifest is not None and right_manifest is not None
+    if trusted and left_manifest['fingerprint'] == right_manifest['fingerprint']:
+        return {'left': left_path, 'right': right_path, 'mode': 'fingerprint',
+                'identical': True, 'changes': [], 'summary': []}
+
+    left_arrays = _load_arrays(left_path) if trusted else None
+    right_arrays = _load_arrays(right_path) if trusted else None
+    mode = 'cells'
+    if left_arrays is not None and right_arrays is not None:
+        changes, summary = diff_arrays(left_arrays, right_arrays, rtol, atol, max_changes)
+        if any(entry['changed'] != 0 for entry in summary):
+            mode = 'arrays'
+    if mode == 'cells':
+        changes, summary = diff_cells(left_path, right_path, rtol, atol, max_changes)
+
+    identical = all(entry['changed'] == 0 for entry in summary)
+    return {'left': left_path, 'right': right_path, 'mode': mode,
+            'identical': identical, 'changes': changes, 'summary': summary}
+
+
+def _diff_pair(arguments):
+    left_path, right_path, options = arguments
+    return diff_workbooks(left_path, right_path, **options)
+
+
+def diff_many(pairs, workers=None, **options):
+    """Diff many (left, right) workbook pairs across a process pool"""
+    tasks = [(left, right, options) for left, right in pairs]
+    if workers == 1 or len(tasks) <= 1:
+        return [_diff_pair(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_diff_pair, tasks, chunksize=max(1, len(tasks) // 32)))
+
+
+def write_report(results, path):
+    """Write every pair's changes to one CSV"""
+    with open(path, 'w', newline='') as handle:
+        writer = csv.DictWriter(handle, fieldnames=['left', 'right', 'mode'] + CHANGE_FIELDS)
+        writer.writeheader()
+        for result in results:
+            for change in result['changes']:
+                writer.writerow({'left': result['left'], 'right': result['right'],
+                                 'mode': result['mode'], **change})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Report figures that moved between generated workbooks')
+    parser.add_argument('workbooks', nargs='*', help='left and right workbook')
+    parser.add_argument('--pairs', help='CSV of left,right workbook paths (no header)')
+    parser.add_argument('--rtol', type=float, default=DEFAULT_RTOL, help='relative tolerance')
+    parser.add_argument('--atol', type=float, default=DEFAULT_ATOL, help='absolute tolerance')
+    parser.add_argument('--cells', action='store_true', help='always compare cell values')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', help='CSV file for the changed cells or array elements')
+    args = parser.parse_args()
+
+    if args.pairs:
+        with open(args.pairs, newline='') as handle:
+            pairs = [tuple(row[:2]) for row in csv.reader(handle) if row]
+    elif len(args.workbooks) == 2:
+        pairs = [tuple(args.workbooks)]
+    else:
+        parser.error('pass two workbooks or --pairs')
+
+    results = diff_many(pairs, workers=args.workers, rtol=args.rtol, atol=args.atol, cells=args.cells)
+    for result in results:
+        status = 'identical' if result['identical'] else 'changed'
+        print(f"{result['left']} -> {result['right']}: {status} ({result['mode']})")
+        for entry in result['summary']:
+            if entry['changed']:
+                print(f"  {entry['name']}: {entry['changed']} changed, "
+                      f"total {entry['left_total']} -> {entry['right_total']}")
+        if len(pairs) == 1:
+            for change in result['changes'][:20]:
+                print(f"    {change['location']}: {change['left']} -> {change['right']}")
+    if args.output:
+        write_report(results, args.output)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hostel_booking_ingest import ingest_exports, parse_room_type_map
+
+
+COLUMN_MAP = {'available_beds': 'available_beds'}
+
+
+def _export(path, rows):
+    pd.DataFrame(rows, columns=['stay_date', 'room_type', 'bed_nights', 'room_revenue', 'available_beds']).to_csv(
+        path, index=False)
+    return str(path)
+
+
+def _rows():
+    """Three nights of stays over two room types, one row per booking night"""
+    rows = []
+    for day, date in enumerate(['2025-03-01', '2025-03-02', '2025-03-03']):
+        for booking in range(6 + day):
+            rows.append([date, 'dorm', 2, 50.0, 20])
+        for booking in range(3):
+            rows.append([date, 'private', 1, 60.0, 4])
+    return rows
+
+
+def test_capacity_independent_of_chunk_size(tmp_path):
+    path = _export(tmp_path / 'export.csv', _rows())
+    whole = ingest_exports([path], column_map=COLUMN_MAP, chunksize=1000)
+    chunked = ingest_exports([path], column_map=COLUMN_MAP, chunksize=7)
+
+    assert whole['available_bed_nights'].tolist() == [[20, 4], [20, 4], [20, 4]]
+    for name in ('available_bed_nights', 'sold_bed_nights', 'room_revenue'):
+        np.testing.assert_allclose(chunked[name], whole[name])
+
+
+def test_capacity_not_double_counted_across_files(tmp_path):
+    rows = _rows()
+    whole = ingest_exports([_export(tmp_path / 'export.csv', rows)], column_map=COLUMN_MAP)
+    split = ingest_exports([_export(tmp_path / 'first.csv', rows[:10]), _export(tmp_path / 'second.csv', rows[10:])],
+                           column_map=COLUMN_MAP, workers=1)
+
+    for name in ('available_bed_nights', 'sold_bed_nights', 'room_revenue'):
+        np.testing.assert_allclose(split[name], whole[name])
+
+
+def test_mapped_room_types_add_capacity(tmp_path):
+    path = _export(tmp_path / 'export.csv', _rows())
+    store = ingest_exports([path], column_map=COLUMN_MAP, chunksize=5,
+                           room_type_map={'dorm': 'all_beds', 'private': 'all_beds'})
+
+    assert store['available_bed_nights'].ravel().tolist() == [24, 24, 24]
+    assert store['sold_bed_nights'].ravel().tolist() == [15, 17, 19]
+
+
+def test_cache_rebuilt_when_bed_counts_change(tmp_path):
+    rows = [row[:4] for row in _rows()]
+    path = tmp_path / 'export.csv'
+    pd.DataFrame(rows, columns=['stay_date', 'room_type', 'bed_nights', 'room_revenue']).to_csv(path, index=False)
+    cache = str(tmp_path / 'cache' / 'bookings.npz')
+
+    first = ingest_exports([str(path)], cache, room_types={'dorm': {'beds': 20}, 'private': {'beds': 4}})
+    resized = ingest_exports([str(path)], cache, room_types={'dorm': {'beds': 24}, 'private': {'beds': 4}})
+
+    assert first['available_bed_nights'][0].tolist() == [20, 4]
+    assert resized['available_bed_nights'][0].tolist() == [24, 4]
+
+
+def test_unmatched_room_types_rejected(tmp_path):
+    path = _export(tmp_path / 'export.csv', _rows())
+
+    with pytest.raises(ValueError, match="'private'"):
+        ingest_exports([path], column_map=COLUMN_MAP, room_types={'dorm': {'beds': 20}})
+
+
+def test_room_types_missing_from_export_omitted(tmp_path):
+    path = _export(tmp_path / 'export.csv', _rows())
+    store = ingest_exports([path], column_map=COLUMN_MAP,
+                           room_types={'dorm': {'beds': 20}, 'suite': {'beds': 2}, 'private': {'beds': 4}})
+
+    assert store['room_types'].tolist() == ['dorm', 'private']
+    assert store['sold_bed_nights'][0].tolist() == [12, 3]
+
+
+def test_room_type_map_from_pairs_or_file(tmp_path):
+    path = tmp_path / 'room_types.json'
+    path.write_text('{"Dorm 6": "dorm_6bed"}')
+
+    assert parse_room_type_map(['Dorm 6=dorm_6bed', 'Private=private_room']) == {
+        'Dorm 6': 'dorm_6bed', 'Private': 'private_room'}
+    assert parse_room_type_map([str(path)]) == {'Dorm 6': 'dorm_6bed'}
+    with pytest.raises(ValueError):
+        parse_room_type_map(['dorm_6bed'])
@@ -0,0 +1,23 @@
+from hostel_cell_values import read_sheet_tables
+
+
+def test_text_label_value_rows_are_not_a_header():
+    rows = [
+        ('Growth Assumptions',),
+        ('Annual Inflation Rate', 0.025),
+        (None,),
+        ('Currency',),
+        ('Functional Currency (rates and costs)', 'THB'),
+        ('Reporting Currency (results and financing)', 'USD'),
+        ('USD per THB (month 1)', 0.028),
+        (None,),
+        ('Channel', 'Share of Bookings', 'Commission Rate'),
+        ('Direct', 0.4, 0.0),
+    ]
+    tables = read_sheet_tables(rows, 'Assumptions')
+
+    assert tables['Currency']['Label'].tolist() == [
+        'Functional Currency (rates and costs)', 'Reporting Currency (results and financing)', 'USD per THB (month 1)']
+    assert tables['Currency']['Value'].tolist() == ['THB', 'USD', 0.028]
+    assert tables['Growth Assumptions']['Value'].tolist() == [0.025]
+    assert tables['Assumptions']['Commission Rate'].tolist() == [0.0]
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from hostel_tax import (build_depreciation, depreciation_kernel, period_totals, tax_with_loss_carryforward,
+                        vat_schedule)
+
+
+def test_loss_carried_forward_into_next_year():
+    # Year one loses 120, year two earns 200: only 80 is taxable
+    income = np.concatenate([np.full(12, -10.0), np.full(12, 200 / 12)])
+    tax = tax_with_loss_carryforward(income, 0.25)
+
+    np.testing.assert_allclose(period_totals(tax['tax']), [0.0, 20.0])
+    np.testing.assert_allclose(period_totals(tax['taxable_income']), [0.0, 80.0])
+    assert tax['loss_carryforward'][11] == pytest.approx(120.0)
+    assert tax['loss_carryforward'][-1] == pytest.approx(0.0)
+
+
+def test_loss_month_reverses_accrual_within_a_year():
+    income = np.array([100.0, 100.0, -150.0] + [0.0] * 9)
+    tax = tax_with_loss_carryforward(income, 0.25)
+
+    np.testing.assert_allclose(tax['tax'][:3], [25.0, 25.0, -37.5])
+    assert tax['tax'].sum() == pytest.approx(12.5)
+
+
+def test_tax_periods_follow_labels():
+    # A fiscal year ending in June: the first period is six months
+    income = np.array([-10.0] * 6 + [20.0] * 12)
+    periods = np.repeat([0, 1], [6, 12])
+    tax = tax_with_loss_carryforward(income, 0.5, periods)
+
+    np.testing.assert_allclose(period_totals(tax['tax'], periods), [0.0, 90.0])
+
+
+def test_batched_paths_match_one_at_a_time():
+    rng = np.random.default_rng(0)
+    income = rng.normal(0, 100, size=(3, 4, 36))
+    batched = tax_with_loss_carryforward(income, 0.25)['tax']
+    for index in np.ndindex(income.shape[:-1]):
+        np.testing.assert_allclose(batched[index], tax_with_loss_carryforward(income[index], 0.25)['tax'])
+
+
+@pytest.mark.parametrize('method', ['straight_line', 'declining_balance', 'sum_of_years_digits'])
+def test_every_method_depreciates_full_cost(method):
+    kernel = depreciation_kernel(method, 84, 120)
+    assert kernel.sum() == pytest.approx(1.0)
+    assert (kernel >= 0).all()
+
+
+def test_depreciation_by_class_totals_capex():
+    capex = np.zeros(400)
+    capex[[0, 30]] = [500000.0, 50000.0]
+    depreciation = build_depreciation(capex)
+    assert depreciation['total'].sum() == pytest.approx(550000.0)
+
+
+def test_vat_remitted_after_each_quarter():
+    vat = vat_schedule(np.full(6, 1000.0), rate=0.1, remittance_months=3)
+    np.testing.assert_allclose(vat['remitted'], [0, 0, 0, 300, 0, 0])
+    np.testing.assert_allclose(vat['payable'], [100, 200, 300, 100, 200, 300])
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from hostel_financial_model_enhanced import EnhancedHostelFinancialModel
+from hostel_financing import build_debt_schedule, default_loan_tranches
+from hostel_run_context import RunContext
+from hostel_tax import build_depreciation, vat_schedule
+from hostel_three_statement import build_three_statements, check_statements
+
+
+def _statements(months=36, paths=4):
+    """Statements for a batch of revenue paths with debt, capex, working capital and VAT"""
+    rng = np.random.default_rng(0)
+    revenue = rng.uniform(20000, 60000, size=(paths, months))
+    expenses = np.full(months, 30000.0)
+    capex = np.zeros(months)
+    capex[[0, 18]] = [400000.0, 60000.0]
+    debt = build_debt_schedule(default_loan_tranches(400000.0), months)['total']
+    equity = np.zeros(months)
+    equity[0] = 400000.0 - debt['draws'][0]
+    return build_three_statements(
+        revenue, expenses, capex=capex, debt=debt, equity_contributions=equity,
+        receivable_days=5, payable_days=20, depreciation=build_depreciation(capex)['total'],
+        tax_periods=np.arange(months) // 12, vat=vat_schedule(revenue / 1.1)
+    )
+
+
+def test_statements_balance_for_every_path():
+    statements = _statements()
+    assert statements['balance_check'].shape == (4, 36)
+    np.testing.assert_allclose(statements['balance_check'], 0, atol=1e-6)
+    assert check_statements(statements)
+
+
+def test_check_statements_rejects_an_imbalance():
+    statements = _statements()
+    statements['balance_check'] = statements['balance_check'] + 5.0
+    with pytest.raises(ValueError, match='does not balance'):
+        check_statements(statements)
+
+
+def test_check_statements_rejects_a_broken_cash_roll_forward():
+    statements = _statements()
+    statements['cash_flow']['Net_Cash_Flow'][..., 10] += 100.0
+    with pytest.raises(ValueError, match='roll forward'):
+        check_statements(statements)
+
+
+def test_model_statements_balance_past_the_loan_term():
+    model = EnhancedHostelFinancialModel(hostel_name="Hostel Diary",
+                                         context=RunContext(seed=0, as_of='2025-01-01', code_version='test'))
+    model.set_horizon(120)
+    projections = model.generate_scenario_projections()
+    for df in projections.values():
+        assert check_statements(model.build_financial_statements(df))
+
+
+def test_model_statements_use_tax_engine():
+    model = EnhancedHostelFinancialModel(hostel_name="Hostel Diary",
+                                         context=RunContext(seed=0, as_of='2025-01-01', code_version='test'))
+    statements = model.build_financial_statements(model.generate_scenario_projections()['base'])
+
+    vat = statements['vat']
+    np.testing.assert_allclose(statements['balance_sheet']['VAT_Payable'], vat['payable'])
+    np.testing.assert_allclose(vat['collected'], statements['income_statement']['Revenue'] * 0.10)
+    assert vat['remitted'][:3].sum() == 0 and vat['remitted'][3] == pytest.approx(vat['collected'][:3].sum())
+
+    capex = np.zeros(len(vat['collected']))
+    capex[0] = model.initial_investment
+    np.testing.assert_allclose(statements['income_statement']['Depreciation'], build_depreciation(capex)['total'])
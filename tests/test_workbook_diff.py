@@ -0,0 +1,92 @@
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+from hostel_run_context import RunContext, current_manifest, finalize_run, refinalize_run
+from hostel_workbook_diff import diff_workbooks
+
+
+def _finalized_workbook(path, context, revenue, dscr):
+    """Workbook with a projection sheet backed by an array sidecar and a sheet that is not"""
+    projections = pd.DataFrame({'Month': [1, 2, 3], 'Revenue': revenue})
+    workbook = Workbook()
+    ws = workbook.active
+    ws.title = 'Base Case'
+    ws.append(list(projections.columns))
+    for row in projections.itertuples(index=False):
+        ws.append(list(row))
+    cash_flow = workbook.create_sheet('Cash Flow Analysis')
+    cash_flow.append(['Month', 'DSCR'])
+    for month, value in enumerate(dscr, 1):
+        cash_flow.append([month, value])
+    workbook.save(path)
+    return finalize_run(path, workbook, context, {'projections': projections})
+
+
+def test_identical_runs_match_on_fingerprint(tmp_path):
+    context = RunContext(seed=0, as_of='2025-01-01', code_version='test')
+    left, right = str(tmp_path / 'left.xlsx'), str(tmp_path / 'right.xlsx')
+    _finalized_workbook(left, context, [100.0, 110.0, 120.0], [1.5, 1.6, 1.7])
+    _finalized_workbook(right, context, [100.0, 110.0, 120.0], [1.5, 1.6, 1.7])
+
+    result = diff_workbooks(left, right)
+    assert result['mode'] == 'fingerprint'
+    assert result['identical']
+
+
+def test_projection_change_found_in_arrays(tmp_path):
+    context = RunContext(seed=0, as_of='2025-01-01', code_version='test')
+    left, right = str(tmp_path / 'left.xlsx'), str(tmp_path / 'right.xlsx')
+    _finalized_workbook(left, context, [100.0, 110.0, 120.0], [1.5, 1.6, 1.7])
+    _finalized_workbook(right, context, [100.0, 115.0, 120.0], [1.5, 1.6, 1.7])
+
+    result = diff_workbooks(left, right)
+    assert result['mode'] == 'arrays'
+    assert not result['identical']
+    assert [change['location'] for change in result['changes']] == ['projections/Revenue[1]']
+
+
+def test_change_outside_the_sidecar_is_not_identical(tmp_path):
+    context = RunContext(seed=0, as_of='2025-01-01', code_version='test')
+    left, right = str(tmp_path / 'left.xlsx'), str(tmp_path / 'right.xlsx')
+    _finalized_workbook(left, context, [100.0, 110.0, 120.0], [1.5, 1.6, 1.7])
+    _finalized_workbook(right, context, [100.0, 110.0, 120.0], [1.5, 1.2, 1.7])
+
+    result = diff_workbooks(left, right)
+    assert result['mode'] == 'cells'
+    assert not result['identical']
+    assert [change['location'] for change in result['changes']] == ['Cash Flow Analysis!B3']
+
+
+def test_workbook_edited_after_finalizing_is_not_identical(tmp_path):
+    context = RunContext(seed=0, as_of='2025-01-01', code_version='test')
+    left, right = str(tmp_path / 'left.xlsx'), str(tmp_path / 'right.xlsx')
+    _finalized_workbook(left, context, [100.0, 110.0, 120.0], [1.5, 1.6, 1.7])
+    _finalized_workbook(right, context, [100.0, 110.0, 120.0], [1.5, 1.6, 1.7])
+
+    # Add a sheet without re-finalizing, so the manifest no longer describes the file
+    workbook = load_workbook(right)
+    workbook.create_sheet('Budget vs Actual').append(['Variance', 250.0])
+    workbook.save(right)
+
+    result = diff_workbooks(left, right)
+    assert result['mode'] == 'cells'
+    assert not result['identical']
+    assert any(entry['name'] == 'Budget vs Actual' for entry in result['summary'])
+
+
+def test_refinalized_workbook_keeps_its_sidecar(tmp_path):
+    context = RunContext(seed=0, as_of='2025-01-01', code_version='test')
+    left, right = str(tmp_path / 'left.xlsx'), str(tmp_path / 'right.xlsx')
+    _finalized_workbook(left, context, [100.0, 110.0, 120.0], [1.5, 1.6, 1.7])
+    _finalized_workbook(right, context, [100.0, 110.0, 120.0], [1.5, 1.6, 1.7])
+
+    workbook = load_workbook(right)
+    workbook.create_sheet('Budget vs Actual').append(['Variance', 250.0])
+    workbook.save(right)
+    refinalize_run(right, workbook, context)
+
+    assert current_manifest(right)['array_fingerprint'] == current_manifest(left)['array_fingerprint']
+    result = diff_workbooks(left, right)
+    assert result['mode'] == 'cells'
+    assert not result['identical']
+    assert any(entry['name'] == 'Budget vs Actual' for entry in result['summary'])